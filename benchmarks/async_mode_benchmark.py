@@ -0,0 +1,67 @@
+"""
+Measure latency of log calls in the thread that logs,
+with synchronous file writes and with async mode.
+
+Run from the repository root:
+    python -m benchmarks.async_mode_benchmark
+"""
+
+import os
+import tempfile
+from time import perf_counter_ns
+
+from benchmarks.benchmark_base import print_result
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileStreamHandler, LogStyleEnum
+
+RECORDS_AMOUNT = 20000
+
+
+def benchmark(name: str, file_path: str, async_mode: bool):
+    sh = FileStreamHandler(file_path)
+    sh.style = LogStyleEnum.LINE
+    sh.async_mode = async_mode
+    logger = NrtLogger(LogLevelEnum.INFO)
+    logger.add_stream_handler(sh)
+    latency_list = []
+
+    try:
+        for _ in range(RECORDS_AMOUNT):
+            start = perf_counter_ns()
+            logger.info('benchmark')
+            latency_list.append(perf_counter_ns() - start)
+
+        start = perf_counter_ns()
+        logger.flush()
+        flush_ns = perf_counter_ns() - start
+    finally:
+        logger.close_stream_handlers()
+        sh.async_mode = False
+
+    latency_list.sort()
+
+    print_result(
+        f'{name}, p50',
+        latency_list[len(latency_list) // 2],
+        'ns/record')
+    print_result(
+        f'{name}, p99',
+        latency_list[len(latency_list) * 99 // 100],
+        'ns/record')
+    print_result(
+        f'{name}, total',
+        sum(latency_list) + flush_ns,
+        'ns')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        benchmark(
+            'Synchronous writes', os.path.join(temp_path, 'sync.log'), False)
+        benchmark('Async mode', os.path.join(temp_path, 'async.log'), True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure records/sec and raw IO calls per 10k records of async mode,
+for console and file stream handlers.
+
+Write per record writes each log record of a batch with its own write,
+as it was before batches were written with a single write.
+
+Console stream handler writes to line buffered null device,
+as stdout of a terminal.
+
+Run from the repository root:
+    python -m benchmarks.batch_write_benchmark
+"""
+
+import builtins
+import os
+import tempfile
+from time import perf_counter
+
+from benchmarks.benchmark_base import \
+    counting_open, io_call_counter, print_result
+from nrt_logging.async_writer import LogRecord
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    ConsoleStreamHandler, FileStreamHandler, LoggerStreamHandlerBase, \
+    LogStyleEnum
+
+RECORDS_AMOUNT = 10000
+
+
+def write_batch_per_record(
+        sh: LoggerStreamHandlerBase, log_record_list: list[LogRecord]):
+
+    for log_str, log_level in log_record_list:
+        # skipcq: PYL-W0212
+        sh._write(log_str, log_level)
+
+
+def create_console_stream_handler(_) -> ConsoleStreamHandler:
+    sh = ConsoleStreamHandler()
+    # skipcq: PYL-W0212
+    sh._stream = counting_open(os.devnull, 'w', 1)
+    return sh
+
+
+def benchmark(name: str, create_stream_handler, file_path: str):
+    original_open = builtins.open
+    builtins.open = counting_open
+    io_call_counter.clear()
+
+    try:
+        sh = create_stream_handler(file_path)
+        sh.style = LogStyleEnum.LINE
+        sh.async_mode = True
+        logger = NrtLogger(LogLevelEnum.INFO)
+        logger.add_stream_handler(sh)
+
+        start = perf_counter()
+
+        for _ in range(RECORDS_AMOUNT):
+            logger.info('benchmark')
+
+        logger.flush()
+        per_sec = RECORDS_AMOUNT / (perf_counter() - start)
+        sh.async_mode = False
+        logger.close_stream_handlers()
+    finally:
+        builtins.open = original_open
+
+    print_result(name, per_sec)
+    print_result(
+        f'{name}, raw writes',
+        io_call_counter['write'] * 10000 / RECORDS_AMOUNT,
+        'writes/10k records')
+
+
+def benchmark_stream_handlers(name: str, temp_path: str):
+    benchmark(
+        f'Console, {name}',
+        create_console_stream_handler,
+        os.devnull)
+    benchmark(
+        f'File, {name}',
+        FileStreamHandler,
+        os.path.join(temp_path, f'{name.replace(" ", "_")}.log'))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        write_batch = LoggerStreamHandlerBase._write_batch
+        LoggerStreamHandlerBase._write_batch = write_batch_per_record
+
+        try:
+            benchmark_stream_handlers('write per record', temp_path)
+        finally:
+            LoggerStreamHandlerBase._write_batch = write_batch
+
+        benchmark_stream_handlers('write per batch', temp_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import io
+from collections import Counter
+from io import StringIO
+from time import perf_counter
+from typing import Callable
+
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    ConsoleStreamHandler, LogStyleEnum
+
+
+# Raw IO calls by name, counted by CountingFileIO
+io_call_counter = Counter()
+
+
+class CountingFileIO(io.FileIO):
+
+    def __init__(self, *args, **kwargs):
+        io_call_counter['open'] += 1
+        super().__init__(*args, **kwargs)
+
+    def write(self, b):
+        io_call_counter['write'] += 1
+        return super().write(b)
+
+    def seek(self, *args):
+        io_call_counter['seek'] += 1
+        return super().seek(*args)
+
+    def tell(self):
+        io_call_counter['tell'] += 1
+        return super().tell()
+
+    def close(self):
+        if not self.closed:
+            io_call_counter['close'] += 1
+
+        super().close()
+
+
+def counting_open(file_path: str, mode: str = 'r', buffering: int = -1):
+    """
+    Open text file for writing with CountingFileIO as raw file object.
+    """
+
+    raw = CountingFileIO(file_path, mode)
+
+    if buffering > 1:
+        return io.TextIOWrapper(io.BufferedWriter(raw, buffering))
+
+    return \
+        io.TextIOWrapper(
+            io.BufferedWriter(raw), line_buffering=buffering == 1)
+
+
+class NullStream(StringIO):
+    encoding = 'utf-8'
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+def create_logger(
+        sh_amount: int = 1,
+        style: LogStyleEnum = LogStyleEnum.LINE,
+        log_level: LogLevelEnum = LogLevelEnum.INFO) -> NrtLogger:
+    """
+    Create logger with console stream handlers that write to null stream.
+    """
+
+    logger = NrtLogger(log_level)
+
+    for _ in range(sh_amount):
+        sh = ConsoleStreamHandler()
+        # skipcq: PYL-W0212
+        sh._stream = NullStream()
+        sh.style = style
+        sh.log_level = log_level
+        logger.add_stream_handler(sh)
+
+    return logger
+
+
+def call_in_depth(depth: int, func: Callable, *args):
+    """
+    Call func with depth extra frames in the stack.
+    """
+
+    if depth <= 0:
+        return func(*args)
+
+    return call_in_depth(depth - 1, func, *args)
+
+
+def measure_per_sec(func: Callable, amount: int) -> float:
+    start = perf_counter()
+
+    for _ in range(amount):
+        func()
+
+    return amount / (perf_counter() - start)
+
+
+def print_result(name: str, per_sec: float, unit: str = 'records/sec'):
+    print(f'{name:<60} {per_sec:>14,.0f} {unit}')
@@ -0,0 +1,95 @@
+"""
+Compare the stack walk on each record with call_tree_monitor backends:
+sys.monitoring (Python 3.12+) and sys.setprofile.
+
+Records: logger.info() per second in a deep stack.
+Program: runs per second of a synthetic deep call workload,
+that logs in part of its functions,
+so the cost of tracking calls that do not log is included.
+
+Run from the repository root:
+    python -m benchmarks.call_tree_benchmark
+"""
+
+import sys
+from typing import Optional
+
+from benchmarks.benchmark_base import \
+    call_in_depth, create_logger, measure_per_sec, print_result
+from nrt_logging.logger import NrtLogger
+from nrt_logging.stack_capture import CallTreeBackendEnum, call_tree_monitor
+
+DEPTH_LIST = (5, 20, 60)
+RECORDS_AMOUNT = 5000
+WORKLOAD_DEPTH = 30
+WORKLOAD_CALLS = 200
+WORKLOAD_RUNS = 20
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def compute(calls: int) -> int:
+    total = 0
+
+    for i in range(calls):
+        total = add(total, i)
+
+    return total
+
+
+def workload(logger: NrtLogger, depth: int):
+    logger.info(f'workload {depth}')
+    compute(WORKLOAD_CALLS)
+
+    if depth > 0:
+        workload(logger, depth - 1)
+
+    logger.info(f'workload {depth} done')
+
+
+def benchmark(name: str, backend: Optional[CallTreeBackendEnum]):
+    logger = create_logger()
+
+    if backend is not None:
+        call_tree_monitor.start(backend)
+
+    try:
+        for depth in DEPTH_LIST:
+            print_result(
+                f'logger.info() with {name}, depth {depth}',
+                call_in_depth(
+                    depth,
+                    measure_per_sec,
+                    lambda: logger.info('benchmark'),
+                    RECORDS_AMOUNT))
+
+        print_result(
+            f'Workload with {name}, depth {WORKLOAD_DEPTH}',
+            measure_per_sec(
+                lambda: workload(logger, WORKLOAD_DEPTH), WORKLOAD_RUNS),
+            'runs/sec')
+    finally:
+        if backend is not None:
+            call_tree_monitor.stop()
+
+
+def main():
+    logger = create_logger()
+    logger.log_level = logger.log_level.CRITICAL
+    print_result(
+        f'Workload without records, depth {WORKLOAD_DEPTH}',
+        measure_per_sec(
+            lambda: workload(logger, WORKLOAD_DEPTH), WORKLOAD_RUNS),
+        'runs/sec')
+
+    benchmark('stack walk', None)
+    benchmark('setprofile', CallTreeBackendEnum.PROFILE)
+
+    if hasattr(sys, 'monitoring'):
+        benchmark('sys.monitoring', CallTreeBackendEnum.MONITORING)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure date formatting cost per record,
+for records that are written by 3 stream handlers with the same date format.
+
+strftime formats the date in each stream handler,
+as it was before the date formatters were shared.
+
+Run from the repository root:
+    python -m benchmarks.date_format_benchmark
+"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from benchmarks.benchmark_base import print_result
+from nrt_logging.log_format import LogDateFormat
+
+RECORDS_AMOUNT = 100000
+SH_AMOUNT = 3
+# Records in the same second
+RECORDS_PER_SECOND = 1000
+
+DATE_FORMAT_DICT = {
+    'default': LogDateFormat.DEFAULT_DATE_FORMAT,
+    'custom': '%d/%m/%Y %H:%M:%S,%f',
+    'epoch': '%s.%f'
+}
+
+START_DATE = datetime(2022, 1, 1)
+DATE_LIST = [
+    START_DATE + timedelta(microseconds=i * 10 ** 6 // RECORDS_PER_SECOND)
+    for i in range(RECORDS_AMOUNT)
+]
+
+
+def measure_nsec_per_record(format_date) -> float:
+    start = perf_counter()
+
+    for date in DATE_LIST:
+        for _ in range(SH_AMOUNT):
+            format_date(date)
+
+    return (perf_counter() - start) / RECORDS_AMOUNT * 10 ** 9
+
+
+def main():
+    for name, date_format in DATE_FORMAT_DICT.items():
+        log_date_format = LogDateFormat(date_format)
+
+        print_result(
+            f'strftime, {name} format',
+            measure_nsec_per_record(
+                lambda date: date.strftime(log_date_format.date_format)),
+            'nsec/record')
+        print_result(
+            f'Shared date formatter, {name} format',
+            measure_nsec_per_record(
+                lambda date: log_date_format.formatter.format(date)),
+            'nsec/record')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Measure memory of depth states with tracemalloc.
+
+DepthData list is the representation of the log tree path
+before DepthState kept the path in parallel lists:
+dataclass per log in the path, and dataclass position per log.
+
+Run from the repository root:
+    python -m benchmarks.depth_memory_benchmark
+"""
+
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from benchmarks.benchmark_base import print_result
+from nrt_logging.depth_tracker import DepthState, ThreadDepthTracker
+
+STATES_AMOUNT = 1000
+TREE_DEPTH = 50
+RECORDS_AMOUNT = 10000
+
+
+@dataclass
+class DataclassDepthData:
+    name: str
+    manual_depth_change: int = 0
+    total_manual_depth: int = 0
+
+
+@dataclass
+class DataclassDepthPosition:
+    depth: int
+    is_child: bool = False
+    is_new_tree: bool = False
+
+
+class DataclassDepthState:
+    depth: int
+    depth_list: list[DataclassDepthData]
+    name_index_dict: dict[str, list[int]]
+
+    def __init__(self):
+        self.depth = 0
+        self.depth_list = []
+        self.name_index_dict = {}
+
+    def append(self, name: str) -> DataclassDepthPosition:
+        self.name_index_dict.setdefault(name, []).append(len(self.depth_list))
+        self.depth_list.append(DataclassDepthData(name))
+        self.depth += 1
+        return DataclassDepthPosition(self.depth, True)
+
+    def pop(self) -> DataclassDepthPosition:
+        depth_data = self.depth_list.pop()
+        self.name_index_dict[depth_data.name].pop()
+        self.depth -= 1
+        return DataclassDepthPosition(self.depth)
+
+
+STACK_LIST = [f'benchmark.py.method_{i}' for i in range(TREE_DEPTH)]
+
+
+def build_dataclass_state() -> DataclassDepthState:
+    state = DataclassDepthState()
+
+    for name in STACK_LIST:
+        state.append(name)
+
+    return state
+
+
+def build_state() -> DepthState:
+    state = DepthState()
+    state.start(STACK_LIST[-1])
+
+    for i in range(len(STACK_LIST) - 2, -1, -1):
+        state.update_depth(STACK_LIST[i:], 0)
+
+    return state
+
+
+def measure_bytes_per_state(build: Callable) -> float:
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    state_list = [build() for _ in range(STATES_AMOUNT)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    del state_list
+
+    return size / STATES_AMOUNT
+
+
+def measure_bytes_per_record(log_record: Callable) -> float:
+    """
+    Average of the peak memory that each record allocates.
+    """
+
+    tracemalloc.start()
+    total = 0
+
+    for _ in range(RECORDS_AMOUNT):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        log_record()
+        total += tracemalloc.get_traced_memory()[1] - current
+
+    tracemalloc.stop()
+
+    return total / RECORDS_AMOUNT
+
+
+def main():
+    print_result(
+        f'DepthData list, depth {TREE_DEPTH}',
+        measure_bytes_per_state(build_dataclass_state),
+        'bytes/thread')
+    print_result(
+        f'DepthState, depth {TREE_DEPTH}',
+        measure_bytes_per_state(build_state),
+        'bytes/thread')
+
+    dataclass_state = build_dataclass_state()
+    dataclass_state.pop()
+
+    def log_dataclass_record():
+        dataclass_state.append(STACK_LIST[0])
+        dataclass_state.pop()
+
+    tracker = ThreadDepthTracker()
+    parent_stack_list = STACK_LIST[1:]
+    child_stack_list = STACK_LIST
+
+    for i in range(len(parent_stack_list) - 1, -1, -1):
+        tracker.update(parent_stack_list[i:], 0)
+
+    def log_record():
+        tracker.update(child_stack_list, 0)
+        tracker.update(parent_stack_list, 0)
+
+    print_result(
+        'DepthData list, child and parent records',
+        measure_bytes_per_record(log_dataclass_record),
+        'bytes/record')
+    print_result(
+        'DepthState, child and parent records',
+        measure_bytes_per_record(log_record),
+        'bytes/record')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure calls of log levels that are not written,
+compared to a call of a method that does nothing.
+
+Level check compares the log levels in each call,
+as it was before log methods were dispatched by log level.
+
+Run from the repository root:
+    python -m benchmarks.disabled_level_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    create_logger, measure_per_sec, print_result
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+
+CALLS_AMOUNT = 1000000
+SH_AMOUNT = 3
+
+
+class BareObject:
+
+    def trace(self, msg: str):
+        pass
+
+
+def trace_with_level_check(logger: NrtLogger, msg: str):
+    if logger.log_level <= LogLevelEnum.TRACE:
+        if not logger.stream_handler_list:
+            raise RuntimeError('No stream handler')
+
+        handler_list = [
+            handler for handler in logger.stream_handler_list
+            if LogLevelEnum.TRACE >= handler.log_level
+        ]
+
+        if not handler_list:
+            return
+
+
+def benchmark(name: str, logger: NrtLogger):
+    print_result(
+        f'Level check, {name}',
+        measure_per_sec(
+            lambda: trace_with_level_check(logger, 'benchmark'),
+            CALLS_AMOUNT),
+        'calls/sec')
+    print_result(
+        f'Dispatch by log level, {name}',
+        measure_per_sec(lambda: logger.trace('benchmark'), CALLS_AMOUNT),
+        'calls/sec')
+
+
+def main():
+    bare_object = BareObject()
+
+    print_result(
+        'Bare method call',
+        measure_per_sec(
+            lambda: bare_object.trace('benchmark'), CALLS_AMOUNT),
+        'calls/sec')
+
+    benchmark(
+        'disabled in logger', create_logger(SH_AMOUNT, LogLevelEnum.INFO))
+
+    logger = create_logger(SH_AMOUNT, LogLevelEnum.INFO)
+    logger.log_level = LogLevelEnum.TRACE
+    benchmark('disabled in stream handlers', logger)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Measure records/sec and raw IO calls/record of FileStreamHandler.
+
+Raw IO calls are counted by wrapping the raw file object
+(open, write, seek, tell, close) and os.stat / os.fstat,
+so no strace is needed.
+Calls done inside the raw file constructor (fstat, lseek)
+are counted as a single open.
+
+Open per record opens and closes the log file for each record,
+as it was before the log file was kept open across records.
+
+Run from the repository root:
+    python -m benchmarks.file_handle_benchmark
+"""
+
+import builtins
+import os
+import tempfile
+
+from benchmarks.benchmark_base import \
+    counting_open, io_call_counter, measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileStreamHandler, LoggerStreamHandlerBase, LogStyleEnum
+
+RECORDS_AMOUNT = 20000
+
+
+def counting_os_func(name: str, func):
+    def wrapper(*args, **kwargs):
+        io_call_counter[name] += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def write_with_open_per_record(
+        sh: FileStreamHandler, log_str: str, log_level: LogLevelEnum):
+
+    # skipcq: PYL-W0212
+    sh._stream = open(sh_file_path(sh), 'a')
+
+    try:
+        # skipcq: PYL-W0212
+        LoggerStreamHandlerBase._write(sh, log_str, log_level)
+    finally:
+        # skipcq: PYL-W0212
+        sh._stream.close()
+        # skipcq: PYL-W0212
+        sh._stream = None
+
+
+def sh_file_path(sh: FileStreamHandler) -> str:
+    return getattr(sh, '_FileStreamHandler__file_path')
+
+
+def benchmark(name: str, file_path: str):
+    sh = FileStreamHandler(file_path)
+    sh.style = LogStyleEnum.LINE
+    sh.log_line_template = LogElementEnum.MESSAGE.line_format
+    logger = NrtLogger(LogLevelEnum.INFO)
+    logger.add_stream_handler(sh)
+
+    try:
+        print_result(
+            name,
+            measure_per_sec(lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+
+        # Reopen log file with counting raw file object
+        sh.close()
+        io_call_counter.clear()
+        original_open = builtins.open
+        original_stat = os.stat
+        original_fstat = os.fstat
+        builtins.open = counting_open
+        os.stat = counting_os_func('stat', original_stat)
+        os.fstat = counting_os_func('fstat', original_fstat)
+
+        try:
+            for _ in range(RECORDS_AMOUNT):
+                logger.info('benchmark')
+        finally:
+            builtins.open = original_open
+            os.stat = original_stat
+            os.fstat = original_fstat
+
+        print_result(
+            f'{name}, raw IO calls',
+            sum(io_call_counter.values()) / RECORDS_AMOUNT,
+            'calls/record')
+
+        for call_name, calls in sorted(io_call_counter.items()):
+            print(f'    {call_name}: {calls / RECORDS_AMOUNT:.2f}/record')
+    finally:
+        logger.close_stream_handlers()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        write = FileStreamHandler._write
+        FileStreamHandler._write = write_with_open_per_record
+
+        try:
+            benchmark(
+                'Open per record', os.path.join(temp_path, 'open.log'))
+        finally:
+            FileStreamHandler._write = write
+
+        benchmark(
+            'Persistent file handle', os.path.join(temp_path, 'keep.log'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure records/sec and stat calls/record of FileStreamHandler
+with file size limit.
+
+File check before each write stats the log file before each record,
+as it was before the written size was counted in memory.
+
+Run from the repository root:
+    python -m benchmarks.file_size_benchmark
+"""
+
+import os
+import tempfile
+
+from benchmarks.benchmark_base import measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileSizeEnum, FileStreamHandler, LogStyleEnum
+
+RECORDS_AMOUNT = 50000
+
+
+def benchmark(name: str, file_path: str, file_check_interval: int):
+    sh = FileStreamHandler(file_path)
+    sh.style = LogStyleEnum.LINE
+    sh.log_line_template = LogElementEnum.MESSAGE.line_format
+    sh.is_limit_file_size = True
+    sh.max_file_size = 100 * FileSizeEnum.KB.bytes
+    sh.files_amount = 2
+    sh.file_check_interval = file_check_interval
+    logger = NrtLogger(LogLevelEnum.INFO)
+    logger.add_stream_handler(sh)
+    stat = os.stat
+    stat_calls = [0]
+
+    def count_stat(*args, **kwargs):
+        stat_calls[0] += 1
+        return stat(*args, **kwargs)
+
+    os.stat = count_stat
+
+    try:
+        print_result(
+            name,
+            measure_per_sec(lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+    finally:
+        os.stat = stat
+        logger.close_stream_handlers()
+
+    print(f'    stat: {stat_calls[0] / RECORDS_AMOUNT:.4f}/record')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        benchmark(
+            'File check before each write',
+            os.path.join(temp_path, 'check.log'),
+            0)
+        benchmark(
+            'Written size',
+            os.path.join(temp_path, 'size.log'),
+            1000)
+
+
+if __name__ == '__main__':
+    main()
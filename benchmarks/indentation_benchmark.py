@@ -0,0 +1,74 @@
+"""
+Measure records in shallow and deep log trees.
+
+Indentation per record joins the indentation strings of the depth
+for each record, as it was before the indentation tables.
+
+Run from the repository root:
+    python -m benchmarks.indentation_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    create_logger, measure_per_sec, print_result
+from nrt_logging.logger_stream_handlers import \
+    DepthIndentation, IndentationTable, LoggerStreamHandlerBase, \
+    LogStyleEnum
+
+RECORDS_AMOUNT = 20000
+TREE_DEPTH_LIST = (1, 10, 50)
+
+
+def join_depth_indentation(self, depth: int) -> DepthIndentation:
+    spaces_separator = LoggerStreamHandlerBase.YAML_SPACES_SEPARATOR
+    children_spaces_separator = \
+        LoggerStreamHandlerBase.YAML_CHILDREN_SPACES_SEPARATOR
+    spaces = ''.join([f'{spaces_separator}  ' for _ in range(depth)])
+    children_spaces = \
+        ''.join([children_spaces_separator for _ in range(depth - 1)])
+
+    if self.style == LogStyleEnum.YAML:
+        return \
+            DepthIndentation(
+                spaces,
+                f'{children_spaces}children:',
+                f'\n{spaces}{spaces_separator}',
+                f'{spaces}- log: ')
+
+    return \
+        DepthIndentation(
+            spaces,
+            f'{spaces_separator}{children_spaces}children:',
+            f'\n{spaces}{children_spaces_separator}',
+            f'{spaces}- log: ')
+
+
+def benchmark(name: str):
+    for style in LogStyleEnum:
+        for tree_depth in TREE_DEPTH_LIST:
+            logger = create_logger(style=style)
+
+            for _ in range(tree_depth):
+                logger.info('parent')
+                logger.increase_depth()
+
+            print_result(
+                f'{name}, {style.name} style, tree depth {tree_depth}',
+                measure_per_sec(
+                    lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+
+
+def main():
+    get = IndentationTable.get
+
+    IndentationTable.get = join_depth_indentation
+
+    try:
+        benchmark('Indentation per record')
+    finally:
+        IndentationTable.get = get
+
+    benchmark('Indentation table')
+
+
+if __name__ == '__main__':
+    main()
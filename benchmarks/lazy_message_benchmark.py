@@ -0,0 +1,53 @@
+"""
+Measure DEBUG logs with an expensive message,
+when DEBUG is off and when DEBUG is on.
+
+Eager message is formatted by the caller with f-string,
+as it was before messages could be formatted lazily.
+
+Run from the repository root:
+    python -m benchmarks.lazy_message_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    create_logger, measure_per_sec, print_result
+from nrt_logging.log_level import LogLevelEnum
+
+RECORDS_AMOUNT = 20000
+SH_AMOUNT = 3
+
+STATE_DICT = {f'key_{i}': list(range(i % 10)) for i in range(50)}
+
+
+def benchmark(
+        name: str,
+        sh_log_level: LogLevelEnum,
+        logger_log_level: LogLevelEnum):
+
+    logger = create_logger(SH_AMOUNT, log_level=sh_log_level)
+    logger.log_level = logger_log_level
+
+    print_result(
+        f'Eager message, {name}',
+        measure_per_sec(
+            lambda: logger.debug(f'state={STATE_DICT}'), RECORDS_AMOUNT))
+    print_result(
+        f'printf-style arguments, {name}',
+        measure_per_sec(
+            lambda: logger.debug('state=%s', STATE_DICT), RECORDS_AMOUNT))
+    print_result(
+        f'Callable message, {name}',
+        measure_per_sec(
+            lambda: logger.debug(lambda: f'state={STATE_DICT}'),
+            RECORDS_AMOUNT))
+
+
+def main():
+    benchmark('DEBUG off', LogLevelEnum.INFO, LogLevelEnum.INFO)
+    benchmark(
+        'DEBUG off in stream handlers', LogLevelEnum.INFO, LogLevelEnum.DEBUG)
+    benchmark('DEBUG on', LogLevelEnum.DEBUG, LogLevelEnum.DEBUG)
+
+
+if __name__ == '__main__':
+    main()
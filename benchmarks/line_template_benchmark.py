@@ -0,0 +1,110 @@
+"""
+Measure LINE style records with the default and a minimal log line template.
+
+Replace chain renders the log line with str.replace per log element,
+as it was before log_line_template was compiled.
+
+Run from the repository root:
+    python -m benchmarks.line_template_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    create_logger, measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger_stream_handlers import \
+    ConsoleStreamHandler, IndentationTable, LoggerStreamHandlerBase, \
+    LogStyleEnum
+from nrt_logging.stack_capture import StackCapture
+
+RECORDS_AMOUNT = 20000
+RENDERS_AMOUNT = 200000
+
+TEMPLATE_DICT = {
+    'default template': LoggerStreamHandlerBase.LOG_LINE_DEFAULT_TEMPLATE,
+    'minimal template': LogElementEnum.MESSAGE.line_format
+}
+
+
+def create_line_element_with_replace_chain(
+        sh, depth_indentation, log_level, stack_capture, msg, is_child):
+
+    call_site = stack_capture.call_site
+
+    log_line = sh.log_line_template\
+        .replace(
+            LogElementEnum.DATE.line_format,
+            stack_capture.date.strftime(sh.log_date_format.date_format))\
+        .replace(LogElementEnum.LOG_LEVEL.line_format, log_level.name)\
+        .replace(LogElementEnum.PATH.line_format, call_site.path)\
+        .replace(LogElementEnum.METHOD.line_format, call_site.method)\
+        .replace(
+            LogElementEnum.LINE_NUMBER.line_format, call_site.line_number)\
+        .replace(LogElementEnum.MESSAGE.line_format, msg)
+
+    line_log = f'{depth_indentation.line_prefix}{log_line}'
+
+    if is_child:
+        line_log = f'\n{line_log}'
+
+    return line_log
+
+
+def benchmark(name: str):
+    stack_capture = StackCapture.build(0)
+    depth_indentation = \
+        IndentationTable(
+            LogStyleEnum.LINE,
+            LoggerStreamHandlerBase.YAML_SPACES_SEPARATOR,
+            LoggerStreamHandlerBase.YAML_CHILDREN_SPACES_SEPARATOR).get(0)
+
+    for template_name, template in TEMPLATE_DICT.items():
+        sh = ConsoleStreamHandler()
+        sh.log_line_template = template
+        # skipcq: PYL-W0212
+        create_line_element = sh._LoggerStreamHandlerBase__create_line_element
+
+        print_result(
+            f'{name}, {template_name}, render only',
+            measure_per_sec(
+                lambda: create_line_element(
+                    depth_indentation,
+                    LogLevelEnum.INFO,
+                    stack_capture,
+                    'benchmark',
+                    False),
+                RENDERS_AMOUNT),
+            'renders/sec')
+
+        logger = create_logger()
+
+        for sh in logger.stream_handler_list:
+            sh.log_line_template = template
+
+        print_result(
+            f'{name}, {template_name}',
+            measure_per_sec(lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+
+
+def main():
+    # skipcq: PYL-W0212
+    create_line_element = \
+        LoggerStreamHandlerBase._LoggerStreamHandlerBase__create_line_element
+
+    # skipcq: PYL-W0212
+    LoggerStreamHandlerBase._LoggerStreamHandlerBase__create_line_element = \
+        create_line_element_with_replace_chain
+
+    try:
+        benchmark('Replace chain')
+    finally:
+        # skipcq: PYL-W0212
+        LoggerStreamHandlerBase\
+            ._LoggerStreamHandlerBase__create_line_element = \
+            create_line_element
+
+    benchmark('Compiled template')
+
+
+if __name__ == '__main__':
+    main()
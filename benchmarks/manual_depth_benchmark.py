@@ -0,0 +1,67 @@
+"""
+Measure loops that bracket records with manual depth changes.
+
+Full stack capture resolves the caller frame name
+with StackCapture.build, as it was before
+increase_depth and decrease_depth resolved only the caller frame.
+
+Run from the repository root:
+    python -m benchmarks.manual_depth_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    call_in_depth, create_logger, measure_per_sec, print_result
+from nrt_logging.stack_capture import StackCapture
+
+DEPTH_LIST = (5, 20, 60)
+ITERATIONS_AMOUNT = 3000
+
+
+def benchmark(name: str):
+    logger = create_logger()
+
+    def increase_and_decrease():
+        logger.increase_depth()
+        logger.info('benchmark')
+        logger.decrease_depth()
+
+    def depth_context_manager():
+        with logger.depth():
+            logger.info('benchmark')
+
+    for depth in DEPTH_LIST:
+        print_result(
+            f'increase_depth/decrease_depth with {name}, depth {depth}',
+            call_in_depth(
+                depth,
+                measure_per_sec,
+                increase_and_decrease,
+                ITERATIONS_AMOUNT),
+            'iterations/sec')
+        print_result(
+            f'logger.depth() with {name}, depth {depth}',
+            call_in_depth(
+                depth,
+                measure_per_sec,
+                depth_context_manager,
+                ITERATIONS_AMOUNT),
+            'iterations/sec')
+
+
+def main():
+    get_frame_name = StackCapture.get_frame_name
+
+    StackCapture.get_frame_name = \
+        lambda start_depth: \
+        StackCapture.build(start_depth + 1).frame_name_list[0]
+
+    try:
+        benchmark('full stack capture')
+    finally:
+        StackCapture.get_frame_name = get_frame_name
+
+    benchmark('caller frame')
+
+
+if __name__ == '__main__':
+    main()
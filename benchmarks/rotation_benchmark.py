@@ -0,0 +1,63 @@
+"""
+Measure FileStreamHandler records/sec without rotation,
+with file size limit, and with file size limit and hourly rotation.
+
+Run from the repository root:
+    python -m benchmarks.rotation_benchmark
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+from benchmarks.benchmark_base import measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileStreamHandler, LogStyleEnum, RotationIntervalEnum
+
+RECORDS_AMOUNT = 50000
+
+
+def benchmark(
+        name: str,
+        file_path: str,
+        is_limit_file_size: bool,
+        rotation_interval: Optional[RotationIntervalEnum]):
+
+    sh = FileStreamHandler(file_path)
+    sh.style = LogStyleEnum.LINE
+    sh.log_line_template = LogElementEnum.MESSAGE.line_format
+    sh.is_limit_file_size = is_limit_file_size
+    sh.rotation_interval = rotation_interval
+    sh.archive_partition_format = os.path.join('%Y', '%m', '%d', '%H')
+    logger = NrtLogger(LogLevelEnum.INFO)
+    logger.add_stream_handler(sh)
+
+    try:
+        print_result(
+            name,
+            measure_per_sec(lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+    finally:
+        logger.close_stream_handlers()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        benchmark(
+            'No rotation', os.path.join(temp_path, 'none.log'), False, None)
+        benchmark(
+            'File size limit',
+            os.path.join(temp_path, 'size.log'),
+            True,
+            None)
+        benchmark(
+            'File size limit and hourly rotation',
+            os.path.join(temp_path, 'size_time.log'),
+            True,
+            RotationIntervalEnum.HOURLY)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Compare records that get their depth by stack inspection
+with records that get their depth from logger spans (span mode).
+
+Run from the repository root:
+    python -m benchmarks.span_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    call_in_depth, create_logger, measure_per_sec, print_result
+
+DEPTH_LIST = (5, 20, 60)
+RECORDS_AMOUNT = 5000
+
+
+def benchmark_records(is_span_mode: bool):
+    logger = create_logger()
+    logger.is_span_mode = is_span_mode
+    name = 'span mode' if is_span_mode else 'stack inspection'
+
+    def log():
+        return measure_per_sec(
+            lambda: logger.info('benchmark'), RECORDS_AMOUNT)
+
+    def log_in_span():
+        with logger.span('span'):
+            return log()
+
+    for depth in DEPTH_LIST:
+        print_result(
+            f'logger.info() with {name}, depth {depth}',
+            call_in_depth(depth, log_in_span if is_span_mode else log))
+
+
+def main():
+    benchmark_records(False)
+    benchmark_records(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare caller stack capture based on inspect.stack()
+with StackCapture that walks frames with sys._getframe.
+
+Run from the repository root:
+    python -m benchmarks.stack_capture_benchmark
+"""
+
+import ntpath
+from datetime import datetime
+from inspect import stack
+
+from benchmarks.benchmark_base import \
+    call_in_depth, create_logger, measure_per_sec, print_result
+from nrt_logging.stack_capture import CallSite, StackCapture
+
+DEPTH_LIST = (5, 20, 60)
+CAPTURE_AMOUNT = 2000
+RECORDS_AMOUNT = 2000
+
+
+def inspect_stack_capture(
+        start_index: int, f_locals_depth: int = 0) -> StackCapture:
+    """
+    StackCapture that is built in the same way as before StackCapture,
+    by inspect.stack().
+    """
+
+    frame_name_list = []
+    stack_list = stack()[start_index + 1:]
+
+    for sf in stack_list:
+        slf = sf.frame.f_locals.get('self')
+        path = ntpath.basename(sf.filename)
+
+        if slf:
+            path = f'{path}.{slf.__class__.__name__}'
+
+        frame_name_list.append(f'{path}.{sf.function}')
+
+    call_site = \
+        CallSite(
+            frame_name_list[0][:-len(stack_list[0].function) - 1],
+            stack_list[0].function,
+            str(stack_list[0].lineno))
+
+    return \
+        StackCapture(
+            frame_name_list,
+            call_site,
+            [dict(sf.frame.f_locals) for sf in stack_list[:f_locals_depth]],
+            datetime.now())
+
+
+def benchmark_capture():
+    for depth in DEPTH_LIST:
+        print_result(
+            f'inspect.stack() capture, depth {depth}',
+            call_in_depth(
+                depth,
+                measure_per_sec,
+                lambda: inspect_stack_capture(0),
+                CAPTURE_AMOUNT),
+            'captures/sec')
+        print_result(
+            f'StackCapture.build(), depth {depth}',
+            call_in_depth(
+                depth,
+                measure_per_sec,
+                lambda: StackCapture.build(0),
+                CAPTURE_AMOUNT),
+            'captures/sec')
+
+
+def benchmark_records(capture_name: str):
+    logger = create_logger()
+
+    for depth in DEPTH_LIST:
+        print_result(
+            f'logger.info() with {capture_name}, depth {depth}',
+            call_in_depth(
+                depth,
+                measure_per_sec,
+                lambda: logger.info('benchmark'),
+                RECORDS_AMOUNT))
+
+
+def main():
+    benchmark_capture()
+
+    build = StackCapture.build
+
+    StackCapture.build = \
+        lambda start_depth, f_locals_depth=0: \
+        inspect_stack_capture(start_depth + 1, f_locals_depth)
+
+    try:
+        benchmark_records('inspect.stack()')
+    finally:
+        StackCapture.build = build
+
+    benchmark_records('StackCapture')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Measure throughput and handler lock hold time
+of threads that log through one FileStreamHandler.
+
+The serialized handler holds the lock for the whole log,
+as it was before depth and formatting were moved out of the lock.
+
+Run from the repository root:
+    python -m benchmarks.threads_benchmark
+"""
+
+import os
+import tempfile
+from threading import Barrier, Lock, Thread
+from time import perf_counter
+from typing import Optional
+
+from benchmarks.benchmark_base import call_in_depth, print_result
+from nrt_logging.depth_tracker import DepthPosition
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileStreamHandler, LogStyleEnum, ManualDepthEnum
+from nrt_logging.stack_capture import StackCapture
+
+THREADS_AMOUNT = 32
+RECORDS_PER_THREAD = 300
+STACK_DEPTH = 20
+
+
+class TimedLock:
+    """
+    Lock that sums the time that it is held.
+    """
+
+    hold_time: float
+
+    __lock: Lock
+    __acquire_time: float
+
+    def __init__(self):
+        self.hold_time = 0
+        self.__lock = Lock()
+        self.__acquire_time = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        is_acquired = self.__lock.acquire(blocking, timeout)
+
+        if is_acquired:
+            self.__acquire_time = perf_counter()
+
+        return is_acquired
+
+    def release(self):
+        self.hold_time += perf_counter() - self.__acquire_time
+        self.__lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+class SerializedFileStreamHandler(FileStreamHandler):
+
+    def log(
+            self,
+            log_level: LogLevelEnum,
+            msg: str,
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+
+        with self.serialized_lock:
+            super().log(
+                log_level, msg, manual_depth, stack_capture, depth_position)
+
+
+def log_records(logger: NrtLogger, barrier: Barrier):
+    barrier.wait()
+
+    for i in range(RECORDS_PER_THREAD):
+        logger.info(f'record {i}')
+
+
+def benchmark(name: str, sh: FileStreamHandler, lock: TimedLock):
+    logger = NrtLogger()
+    sh.style = LogStyleEnum.LINE
+    logger.add_stream_handler(sh)
+
+    barrier = Barrier(THREADS_AMOUNT + 1)
+    thread_list = [
+        Thread(
+            target=call_in_depth,
+            args=(STACK_DEPTH, log_records, logger, barrier))
+        for _ in range(THREADS_AMOUNT)
+    ]
+
+    for t in thread_list:
+        t.start()
+
+    barrier.wait()
+    start = perf_counter()
+
+    for t in thread_list:
+        t.join()
+
+    duration = perf_counter() - start
+    records = THREADS_AMOUNT * RECORDS_PER_THREAD
+
+    print_result(f'{name} throughput', records / duration)
+    print_result(
+        f'{name} lock hold time',
+        lock.hold_time / records * 10 ** 6,
+        'usec/record')
+
+
+def main():
+    with tempfile.TemporaryDirectory() as dir_path:
+        sh = SerializedFileStreamHandler(
+            os.path.join(dir_path, 'serialized.log'))
+        sh.serialized_lock = TimedLock()
+        benchmark('Lock on whole log', sh, sh.serialized_lock)
+
+        sh = FileStreamHandler(os.path.join(dir_path, 'write_lock.log'))
+        # skipcq: PYL-W0212
+        sh._lock = TimedLock()
+        benchmark('Lock on write only', sh, sh._lock)
+
+
+if __name__ == '__main__':
+    main()
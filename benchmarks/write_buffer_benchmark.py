@@ -0,0 +1,50 @@
+"""
+Measure FileStreamHandler records/sec with and without write buffer.
+
+Run from the repository root:
+    python -m benchmarks.write_buffer_benchmark
+"""
+
+import os
+import tempfile
+
+from benchmarks.benchmark_base import measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import \
+    FileSizeEnum, FileStreamHandler, LogStyleEnum
+
+RECORDS_AMOUNT = 50000
+
+
+def benchmark(name: str, file_path: str, buffer_size: int):
+    sh = FileStreamHandler(file_path)
+    sh.style = LogStyleEnum.LINE
+    sh.log_line_template = LogElementEnum.MESSAGE.line_format
+    sh.buffer_size = buffer_size
+    logger = NrtLogger(LogLevelEnum.INFO)
+    logger.add_stream_handler(sh)
+
+    try:
+        print_result(
+            name,
+            measure_per_sec(lambda: logger.info('benchmark'), RECORDS_AMOUNT))
+    finally:
+        logger.close_stream_handlers()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_path:
+        benchmark(
+            'Flush after each record',
+            os.path.join(temp_path, 'no_buffer.log'),
+            0)
+        benchmark(
+            '64 KB write buffer',
+            os.path.join(temp_path, 'buffer.log'),
+            64 * FileSizeEnum.KB.bytes)
+
+
+if __name__ == '__main__':
+    main()
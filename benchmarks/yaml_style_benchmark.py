@@ -0,0 +1,116 @@
+"""
+Measure YAML style records compared to LINE style records.
+
+Element chain creates each YAML element with a branch per element type,
+and slices the prefix of the first element,
+as it was before YAML records were compiled to templates.
+
+Run from the repository root:
+    python -m benchmarks.yaml_style_benchmark
+"""
+
+from benchmarks.benchmark_base import \
+    call_in_depth, create_logger, measure_per_sec, print_result
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.logger_stream_handlers import \
+    LoggerStreamHandlerBase, LogStyleEnum
+
+RECORDS_AMOUNT = 20000
+STACK_DEPTH = 5
+
+CREATE_YAML_ELEMENTS_STR_ATTR = \
+    '_LoggerStreamHandlerBase__create_yaml_elements_str'
+
+
+def create_yaml_element(
+        sh, yaml_element, depth_spaces, log_level, stack_capture, msg):
+
+    call_site = stack_capture.call_site
+
+    if yaml_element == LogElementEnum.DATE:
+        return \
+            f'\n{depth_spaces}{LogElementEnum.DATE.value}:' \
+            f' {sh.log_date_format.formatter.format(stack_capture.date)}'
+
+    if yaml_element == LogElementEnum.LOG_LEVEL:
+        return f'\n{depth_spaces}{LogElementEnum.LOG_LEVEL}: {log_level}'
+
+    if yaml_element == LogElementEnum.PATH:
+        return f'\n{depth_spaces}{LogElementEnum.PATH.value}: {call_site.path}'
+
+    if yaml_element == LogElementEnum.METHOD:
+        return \
+            f'\n{depth_spaces}{LogElementEnum.METHOD.value}:' \
+            f' {call_site.method}'
+
+    if yaml_element == LogElementEnum.LINE_NUMBER:
+        return \
+            f'\n{depth_spaces}{LogElementEnum.LINE_NUMBER.value}:' \
+            f' {call_site.line_number}'
+
+    return f'\n{depth_spaces}{LogElementEnum.MESSAGE.value}: {msg}'
+
+
+def create_yaml_elements_str_with_element_chain(
+        sh, msg, log_level, is_child, stack_capture, depth):
+
+    depth_spaces = \
+        ''.join([f'{sh.YAML_SPACES_SEPARATOR}  ' for _ in range(depth)])
+
+    yaml_str = ''
+
+    if depth > 0:
+        if is_child:
+            yaml_str = f'\n{depth_spaces[:-2]}- '
+        else:
+            yaml_str = f'{depth_spaces[:-2]}- '
+
+    yaml_elements_str = \
+        ''.join([
+            create_yaml_element(
+                sh, yaml_element, depth_spaces, log_level, stack_capture, msg)
+            for yaml_element in sh.log_yaml_elements.yaml_elements
+        ])
+
+    if depth > 0:
+        yaml_elements_str = \
+            yaml_elements_str[len(f'\n{depth_spaces[:-2]}- '):]
+
+    return yaml_str + yaml_elements_str
+
+
+def benchmark(name: str, style: LogStyleEnum):
+    logger = create_logger(style=style)
+
+    print_result(
+        name,
+        call_in_depth(
+            STACK_DEPTH,
+            measure_per_sec,
+            lambda: logger.info('benchmark'),
+            RECORDS_AMOUNT))
+
+
+def main():
+    benchmark('LINE style', LogStyleEnum.LINE)
+
+    create_yaml_elements_str = \
+        getattr(LoggerStreamHandlerBase, CREATE_YAML_ELEMENTS_STR_ATTR)
+    setattr(
+        LoggerStreamHandlerBase,
+        CREATE_YAML_ELEMENTS_STR_ATTR,
+        create_yaml_elements_str_with_element_chain)
+
+    try:
+        benchmark('YAML style with element chain', LogStyleEnum.YAML)
+    finally:
+        setattr(
+            LoggerStreamHandlerBase,
+            CREATE_YAML_ELEMENTS_STR_ATTR,
+            create_yaml_elements_str)
+
+    benchmark('YAML style with compiled template', LogStyleEnum.YAML)
+
+
+if __name__ == '__main__':
+    main()
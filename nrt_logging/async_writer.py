@@ -0,0 +1,265 @@
+import atexit
+import traceback
+from enum import Enum
+from queue import Empty, Full, Queue
+from threading import Condition, Lock, Thread
+from typing import Callable, NamedTuple, Optional
+from weakref import WeakSet
+
+from nrt_logging.log_level import LogLevelEnum
+
+
+class QueueFullPolicyEnum(Enum):
+    """
+    Policy for log record when the queue of the async writer is full.
+
+    BLOCK: Wait until the writer thread frees space in the queue.
+    DROP_NEWEST: The new log record is dropped.
+    DROP_OLDEST: The oldest log record in the queue is dropped.
+    DROP_BELOW_LEVEL: The new log record is dropped if its log level
+        is below the drop log level, otherwise wait as in BLOCK.
+    """
+
+    BLOCK = 'block'
+    DROP_NEWEST = 'drop_newest'
+    DROP_OLDEST = 'drop_oldest'
+    DROP_BELOW_LEVEL = 'drop_below_level'
+
+    @classmethod
+    def build(cls, name: str):
+        name_u = name.upper()
+
+        for queue_full_policy_enum in cls:
+            if name_u == queue_full_policy_enum.name:
+                return queue_full_policy_enum
+
+        raise ValueError(f'[{name}] is not valid queue full policy name')
+
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_QUEUE_FULL_POLICY = QueueFullPolicyEnum.BLOCK
+DEFAULT_DROP_LOG_LEVEL = LogLevelEnum.WARN
+
+
+class LogRecord(NamedTuple):
+    log_str: str
+    log_level: LogLevelEnum
+
+
+class AsyncWriter:
+    """
+    Write log records in a writer thread,
+    so threads that log only create the log string and enqueue it.
+
+    Writer thread drains the queue in batches.
+    Queue is FIFO, so log records of each thread are written in order.
+    Log records are not enqueued after stop,
+    so each log record is written, dropped or returned to the caller.
+    """
+
+    __STOP = None
+
+    # Drained at exit
+    __async_writer_set: WeakSet = WeakSet()
+
+    __write_batch: Callable[[list[LogRecord]], None]
+    __queue: Queue
+    __batch_size: int
+    __queue_full_policy: QueueFullPolicyEnum
+    __drop_log_level: LogLevelEnum
+    __dropped_records_amount: int
+    __dropped_records_lock: Lock
+    # Closed flag is checked and log records are enqueued under its lock,
+    # and it is notified when the writer thread frees space in the queue
+    __put_condition: Condition
+    __is_closed: bool = False
+    __thread: Optional[Thread] = None
+
+    def __init__(
+            self,
+            write_batch: Callable[[list[LogRecord]], None],
+            queue_size: int = DEFAULT_QUEUE_SIZE,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            queue_full_policy: QueueFullPolicyEnum =
+            DEFAULT_QUEUE_FULL_POLICY,
+            drop_log_level: LogLevelEnum = DEFAULT_DROP_LOG_LEVEL):
+        """
+        @param write_batch: Write log records in the writer thread.
+        @param queue_size: Max amount of log records in the queue.
+        @param batch_size: Max amount of log records in a batch.
+        @param queue_full_policy: Policy for log record
+            when the queue is full.
+        @param drop_log_level: Log records below this log level
+            are dropped when the queue is full,
+            if queue_full_policy is DROP_BELOW_LEVEL.
+        """
+
+        if queue_size <= 0:
+            raise ValueError('Async writer queue size must be bigger from 0')
+
+        if batch_size <= 0:
+            raise ValueError('Async writer batch size must be bigger from 0')
+
+        self.__write_batch = write_batch
+        self.__queue = Queue(queue_size)
+        self.__batch_size = batch_size
+        self.__queue_full_policy = queue_full_policy
+        self.__drop_log_level = drop_log_level
+        self.__dropped_records_amount = 0
+        self.__dropped_records_lock = Lock()
+        self.__put_condition = Condition()
+
+    def start(self):
+        if self.__thread is None:
+            with self.__put_condition:
+                self.__is_closed = False
+
+            self.__thread = Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+            self.__async_writer_set.add(self)
+
+    def stop(self):
+        """
+        Write log records that are in the queue and stop the writer thread.
+        Log records that are put after stop are not enqueued,
+        and puts that wait for space in the queue return.
+        """
+
+        with self.__put_condition:
+            if self.__is_closed:
+                return
+
+            self.__is_closed = True
+            self.__put_condition.notify_all()
+
+        if self.__thread is not None:
+            self.__queue.put(self.__STOP)
+            self.__thread.join()
+            self.__thread = None
+            self.__async_writer_set.discard(self)
+
+    def put(self, log_record: LogRecord) -> bool:
+        """
+        @param log_record: Log record.
+        @return: False in case the writer is stopped,
+            so the log record is not enqueued
+            and should be written by the caller.
+        """
+
+        policy = self.__queue_full_policy
+        is_block = \
+            policy == QueueFullPolicyEnum.BLOCK \
+            or policy == QueueFullPolicyEnum.DROP_BELOW_LEVEL \
+            and log_record.log_level >= self.__drop_log_level
+
+        with self.__put_condition:
+            while True:
+                if self.__is_closed:
+                    return False
+
+                try:
+                    self.__queue.put_nowait(log_record)
+                    return True
+                except Full:
+                    pass
+
+                if is_block:
+                    self.__put_condition.wait()
+                elif policy == QueueFullPolicyEnum.DROP_OLDEST:
+                    self.__drop_oldest()
+                else:
+                    self.__count_dropped_record()
+                    return True
+
+    def join(self):
+        """
+        Wait until all log records in the queue are written.
+        """
+
+        if self.__thread is not None:
+            self.__queue.join()
+
+    @classmethod
+    def join_all(cls):
+        for async_writer in list(cls.__async_writer_set):
+            async_writer.join()
+
+    @property
+    def is_running(self) -> bool:
+        return self.__thread is not None
+
+    @property
+    def queue_full_policy(self) -> QueueFullPolicyEnum:
+        return self.__queue_full_policy
+
+    @queue_full_policy.setter
+    def queue_full_policy(self, queue_full_policy: QueueFullPolicyEnum):
+        self.__queue_full_policy = queue_full_policy
+
+    @property
+    def drop_log_level(self) -> LogLevelEnum:
+        return self.__drop_log_level
+
+    @drop_log_level.setter
+    def drop_log_level(self, drop_log_level: LogLevelEnum):
+        self.__drop_log_level = drop_log_level
+
+    @property
+    def dropped_records_amount(self) -> int:
+        return self.__dropped_records_amount
+
+    def __run(self):
+        while True:
+            log_record = self.__queue.get()
+            batch = []
+
+            while log_record is not self.__STOP:
+                batch.append(log_record)
+
+                if len(batch) >= self.__batch_size:
+                    break
+
+                try:
+                    log_record = self.__queue.get_nowait()
+                except Empty:
+                    break
+
+            with self.__put_condition:
+                self.__put_condition.notify_all()
+
+            try:
+                if batch:
+                    self.__write_batch(batch)
+            except Exception:
+                # Writer thread must keep draining the queue
+                traceback.print_exc()
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
+
+            if log_record is self.__STOP:
+                self.__queue.task_done()
+                return
+
+    def __drop_oldest(self):
+        try:
+            log_record = self.__queue.get_nowait()
+        except Empty:
+            return
+
+        self.__queue.task_done()
+
+        if log_record is self.__STOP:
+            # Stop is not dropped
+            self.__queue.put(log_record)
+            return
+
+        self.__count_dropped_record()
+
+    def __count_dropped_record(self):
+        with self.__dropped_records_lock:
+            self.__dropped_records_amount += 1
+
+
+atexit.register(AsyncWriter.join_all)
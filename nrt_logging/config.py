@@ -3,6 +3,7 @@ from typing import Optional
 import yaml
 import schema
 
+from nrt_logging.depth_tracker import DepthOverflowPolicyEnum
 from nrt_logging.exceptions import NotImplementedCodeException
 from nrt_logging.log_format import LogElementEnum
 from nrt_logging.log_level import LogLevelEnum
@@ -10,7 +11,7 @@ from nrt_logging.logger_stream_handlers import \
     LogStyleEnum, StreamHandlerEnum, ConsoleStreamHandler, \
     FileStreamHandler, LoggerStreamHandlerBase,\
     DEFAULT_MAX_FILE_SIZE, DEFAULT_FILES_AMOUNT, \
-    FileSizeEnum
+    FileSizeEnum, RotationIntervalEnum
 
 
 class ConfigBase:
@@ -24,6 +25,13 @@ class ConfigBase:
     MAX_FILE_SIZE = 'max_file_size'
     FILES_AMOUNT = 'files_amount'
     IS_ZIP = 'is_zip'
+    ROTATION_INTERVAL = 'rotation_interval'
+    ARCHIVE_PARTITION_FORMAT = 'archive_partition_format'
+    BUFFER_SIZE = 'buffer_size'
+    FLUSH_INTERVAL = 'flush_interval'
+    FLUSH_LOG_LEVEL = 'flush_log_level'
+    MAX_DEPTH = 'max_depth'
+    DEPTH_OVERFLOW_POLICY = 'depth_overflow_policy'
 
     _log_level: Optional[LogLevelEnum] = None
     _style: Optional[LogStyleEnum] = None
@@ -35,6 +43,15 @@ class ConfigBase:
     _max_file_size: int = DEFAULT_MAX_FILE_SIZE
     _files_amount: int = DEFAULT_FILES_AMOUNT
     _is_zip: bool = False
+    _rotation_interval: Optional[int] = None
+    _archive_partition_format: Optional[str] = None
+
+    _buffer_size: Optional[int] = None
+    _flush_interval: Optional[int] = None
+    _flush_log_level: Optional[LogLevelEnum] = None
+
+    _max_depth: Optional[int] = None
+    _depth_overflow_policy: Optional[DepthOverflowPolicyEnum] = None
 
     _config: Optional[dict] = None
 
@@ -51,6 +68,13 @@ class ConfigBase:
         self.__update_max_file_size()
         self.__update_files_amount()
         self.__update_is_zip()
+        self.__update_rotation_interval()
+        self.__update_archive_partition_format()
+        self.__update_buffer_size()
+        self.__update_flush_interval()
+        self.__update_flush_log_level()
+        self.__update_max_depth()
+        self.__update_depth_overflow_policy()
 
     @property
     def log_level(self) -> LogLevelEnum:
@@ -88,6 +112,34 @@ class ConfigBase:
     def is_zip(self) -> bool:
         return self._is_zip
 
+    @property
+    def rotation_interval(self) -> Optional[int]:
+        return self._rotation_interval
+
+    @property
+    def archive_partition_format(self) -> Optional[str]:
+        return self._archive_partition_format
+
+    @property
+    def buffer_size(self) -> Optional[int]:
+        return self._buffer_size
+
+    @property
+    def flush_interval(self) -> Optional[int]:
+        return self._flush_interval
+
+    @property
+    def flush_log_level(self) -> Optional[LogLevelEnum]:
+        return self._flush_log_level
+
+    @property
+    def max_depth(self) -> Optional[int]:
+        return self._max_depth
+
+    @property
+    def depth_overflow_policy(self) -> Optional[DepthOverflowPolicyEnum]:
+        return self._depth_overflow_policy
+
     @property
     def is_debug(self) -> bool:
         return self._is_debug
@@ -171,6 +223,81 @@ class ConfigBase:
         if is_zip is not None:
             self._is_zip = is_zip
 
+    def __update_rotation_interval(self):
+        rotation_interval = self._config.get(self.ROTATION_INTERVAL)
+
+        if rotation_interval is not None:
+            try:
+                self._rotation_interval = \
+                    RotationIntervalEnum.get_seconds(rotation_interval)
+            except ValueError:
+                raise ValueError(
+                    f'{self.ROTATION_INTERVAL} value [{rotation_interval}]'
+                    f' in log config is invalid')
+
+    def __update_archive_partition_format(self):
+        self._archive_partition_format = \
+            self._config.get(self.ARCHIVE_PARTITION_FORMAT)
+
+    def __update_buffer_size(self):
+        buffer_size = self._config.get(self.BUFFER_SIZE)
+
+        if buffer_size is None:
+            return
+
+        # Bytes amount, or size string as in max_file_size
+        if isinstance(buffer_size, int):
+            self._buffer_size = buffer_size
+
+            if self._buffer_size < 0:
+                raise ValueError(
+                    'Buffer size in log config cannot be negative')
+        else:
+            self._buffer_size = FileSizeEnum.get_bytes(buffer_size)
+
+    def __update_flush_interval(self):
+        flush_interval = self._config.get(self.FLUSH_INTERVAL)
+
+        if flush_interval is not None:
+            self._flush_interval = int(flush_interval)
+
+            if self._flush_interval < 0:
+                raise ValueError(
+                    'Flush interval in log config cannot be negative')
+
+    def __update_flush_log_level(self):
+        flush_log_level_str = self._config.get(self.FLUSH_LOG_LEVEL)
+
+        if flush_log_level_str:
+            try:
+                self._flush_log_level = \
+                    LogLevelEnum.build(flush_log_level_str)
+            except ValueError:
+                raise ValueError(
+                    f'{self.FLUSH_LOG_LEVEL} value [{flush_log_level_str}]'
+                    f' in log config is invalid')
+
+    def __update_max_depth(self):
+        max_depth = self._config.get(self.MAX_DEPTH)
+
+        if max_depth is not None:
+            self._max_depth = int(max_depth)
+
+            if self._max_depth < 0:
+                raise ValueError('Max depth in log config cannot be negative')
+
+    def __update_depth_overflow_policy(self):
+        overflow_policy_str = self._config.get(self.DEPTH_OVERFLOW_POLICY)
+
+        if overflow_policy_str:
+            try:
+                self._depth_overflow_policy = \
+                    DepthOverflowPolicyEnum.build(overflow_policy_str)
+            except ValueError:
+                raise ValueError(
+                    f'{self.DEPTH_OVERFLOW_POLICY} value'
+                    f' [{overflow_policy_str}] in log config is invalid')
+
 
 class StreamHandlerConfig(ConfigBase):
     STREAM_HANDLER_NAME = 'name'
@@ -349,6 +476,13 @@ class LoggerManagerConfig(ConfigBase):
                     StreamHandlerConfig.MAX_FILE_SIZE): str,
                 schema.Optional(StreamHandlerConfig.FILES_AMOUNT): int,
                 schema.Optional(StreamHandlerConfig.IS_ZIP): bool,
+                schema.Optional(cls.ROTATION_INTERVAL): schema.Or(str, int),
+                schema.Optional(cls.ARCHIVE_PARTITION_FORMAT): str,
+                schema.Optional(cls.BUFFER_SIZE): schema.Or(str, int),
+                schema.Optional(cls.FLUSH_INTERVAL): int,
+                schema.Optional(cls.FLUSH_LOG_LEVEL): str,
+                schema.Optional(cls.MAX_DEPTH): int,
+                schema.Optional(cls.DEPTH_OVERFLOW_POLICY): str,
                 cls.LOGGERS_CONFIG: [
                     {
                         LoggerConfig.LOGGER_NAME: str,
@@ -365,6 +499,15 @@ class LoggerManagerConfig(ConfigBase):
                         schema.Optional(
                             StreamHandlerConfig.FILES_AMOUNT): int,
                         schema.Optional(StreamHandlerConfig.IS_ZIP): bool,
+                        schema.Optional(cls.ROTATION_INTERVAL):
+                            schema.Or(str, int),
+                        schema.Optional(cls.ARCHIVE_PARTITION_FORMAT): str,
+                        schema.Optional(cls.BUFFER_SIZE):
+                            schema.Or(str, int),
+                        schema.Optional(cls.FLUSH_INTERVAL): int,
+                        schema.Optional(cls.FLUSH_LOG_LEVEL): str,
+                        schema.Optional(cls.MAX_DEPTH): int,
+                        schema.Optional(cls.DEPTH_OVERFLOW_POLICY): str,
                         LoggerConfig.STREAM_HANDLERS: [
                             {
                                 StreamHandlerConfig.TYPE: str,
@@ -383,6 +526,17 @@ class LoggerManagerConfig(ConfigBase):
                                     StreamHandlerConfig.FILES_AMOUNT): int,
                                 schema.Optional(
                                     StreamHandlerConfig.IS_ZIP): bool,
+                                schema.Optional(cls.ROTATION_INTERVAL):
+                                    schema.Or(str, int),
+                                schema.Optional(
+                                    cls.ARCHIVE_PARTITION_FORMAT): str,
+                                schema.Optional(cls.BUFFER_SIZE):
+                                    schema.Or(str, int),
+                                schema.Optional(cls.FLUSH_INTERVAL): int,
+                                schema.Optional(cls.FLUSH_LOG_LEVEL): str,
+                                schema.Optional(cls.MAX_DEPTH): int,
+                                schema.Optional(
+                                    cls.DEPTH_OVERFLOW_POLICY): str,
                                 schema.Optional(cls.DEBUG): bool,
                                 schema.Optional(cls.LOG_LEVEL): str,
                                 schema.Optional(cls.STYLE): str,
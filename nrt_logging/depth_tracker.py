@@ -0,0 +1,812 @@
+import asyncio
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from enum import Enum
+from threading import Lock
+from typing import Any, NamedTuple, Optional
+
+
+class DepthOverflowPolicyEnum(Enum):
+    """
+    Policy for log that is deeper than the max depth of its log tree.
+
+    CLAMP: The log is written in the max depth.
+    COLLAPSE_OLDEST: The log is written in the max depth,
+        and the oldest logs in the path are written
+        as if they were removed, so next logs are written
+        in depth relative to the latest log.
+    RESET_SUBTREE: The log is the root of a new log tree.
+
+    CLAMP and COLLAPSE_OLDEST keep the full path,
+    so logs after return from deeper methods are written
+    under their ancestors.
+    """
+
+    CLAMP = 'clamp'
+    COLLAPSE_OLDEST = 'collapse_oldest'
+    RESET_SUBTREE = 'reset_subtree'
+
+    @classmethod
+    def build(cls, name: str):
+        name_u = name.upper()
+
+        for overflow_policy_enum in cls:
+            if name_u == overflow_policy_enum.name:
+                return overflow_policy_enum
+
+        raise ValueError(f'[{name}] is not valid depth overflow policy name')
+
+
+DEFAULT_DEPTH_OVERFLOW_POLICY = DepthOverflowPolicyEnum.CLAMP
+
+
+class DepthData:
+    """
+    Depth data of one log in the path of log tree.
+    Created only on demand, DepthState keeps the fields in parallel lists.
+    """
+
+    __slots__ = ('name', 'manual_depth_change', 'total_manual_depth')
+
+    name: str
+    manual_depth_change: int
+    total_manual_depth: int
+
+    def __init__(
+            self,
+            name: str,
+            manual_depth_change: int = 0,
+            total_manual_depth: int = 0):
+
+        self.name = name
+        self.manual_depth_change = manual_depth_change
+        self.total_manual_depth = total_manual_depth
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DepthData):
+            return NotImplemented
+
+        return \
+            self.name == other.name \
+            and self.manual_depth_change == other.manual_depth_change \
+            and self.total_manual_depth == other.total_manual_depth
+
+    def __repr__(self) -> str:
+        return \
+            f'DepthData(name={self.name!r},' \
+            f' manual_depth_change={self.manual_depth_change},' \
+            f' total_manual_depth={self.total_manual_depth})'
+
+
+class DepthPosition(NamedTuple):
+    """
+    Position of a log in its log tree.
+
+    depth: Depth of the log.
+    is_child: True if the log is the first child of the previous log.
+    is_new_tree: True if the log is the root of new log tree.
+    is_overflow: True if the log was deeper than the max depth.
+
+    Positions are immutable, so use DepthPosition.get
+    to get cached instance instead of creating new one for each log.
+    """
+
+    depth: int
+    is_child: bool = False
+    is_new_tree: bool = False
+    is_overflow: bool = False
+
+    @classmethod
+    def get(
+            cls,
+            depth: int,
+            is_child: bool = False,
+            is_new_tree: bool = False,
+            is_overflow: bool = False) -> 'DepthPosition':
+
+        depth_position_tuple = _depth_position_dict.get(depth)
+
+        if depth_position_tuple is None:
+            depth_position_tuple = \
+                _depth_position_dict.setdefault(
+                    depth,
+                    tuple(
+                        cls(depth,
+                            bool(flags & 2),
+                            bool(flags & 1),
+                            bool(flags & 4))
+                        for flags in range(8)))
+
+        return depth_position_tuple[
+            is_overflow * 4 + is_child * 2 + is_new_tree]
+
+
+# {Depth: DepthPosition for each is_overflow, is_child and is_new_tree}
+_depth_position_dict: dict[int, tuple[DepthPosition, ...]] = {}
+
+
+class DepthState:
+    """
+    Depth state of one log tree.
+
+    The path of frame names from the root log to the latest log
+    is kept in parallel lists of frame names (interned by StackCapture)
+    and small ints, so no object is allocated per log.
+    Positions of each frame name in the path are indexed,
+    so finding the latest depth of a frame name and the parent of a log
+    do not scan the path.
+    """
+
+    __slots__ = (
+        'depth',
+        'depth_offset',
+        'owner',
+        '__name_list',
+        '__manual_depth_change_list',
+        '__total_manual_depth_list',
+        '__name_index_dict',
+        '__increase_depth_dict',
+        '__weakref__'
+    )
+
+    depth: int
+    # Depth of the oldest log that is written, in COLLAPSE_OLDEST
+    depth_offset: int
+    # Task or thread that the state belongs to
+    owner: Any
+
+    __name_list: list[str]
+    __manual_depth_change_list: list[int]
+    __total_manual_depth_list: list[int]
+    # {Frame name: positions in the path}
+    __name_index_dict: dict[str, list[int]]
+    # {Frame name: amount of increase_depth calls}
+    __increase_depth_dict: dict[str, int]
+
+    def __init__(self, owner: Any = None):
+        self.depth = 0
+        self.depth_offset = 0
+        self.owner = owner
+        self.__name_list = []
+        self.__manual_depth_change_list = []
+        self.__total_manual_depth_list = []
+        self.__name_index_dict = {}
+        self.__increase_depth_dict = {}
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.__name_list
+
+    @property
+    def depth_list(self) -> list[DepthData]:
+        """
+        @return: Copy of the path from the root log to the latest log.
+        """
+
+        return [
+            DepthData(name, manual_depth_change, total_manual_depth)
+            for name, manual_depth_change, total_manual_depth in zip(
+                self.__name_list,
+                self.__manual_depth_change_list,
+                self.__total_manual_depth_list)
+        ]
+
+    def increase_depth(self, fm_name: str):
+        self.__increase_depth_dict[fm_name] = \
+            self.__increase_depth_dict.get(fm_name, 0) + 1
+
+    def decrease_depth(self, fm_name: str):
+        position_list = self.__name_index_dict.get(fm_name)
+
+        if not position_list:
+            return
+
+        drop_set = \
+            {position for position in position_list
+             if self.__manual_depth_change_list[position] == 1}
+
+        if not drop_set:
+            return
+
+        for _ in drop_set:
+            if self.depth > 0:
+                self.depth -= 1
+
+        self.__reset_path([
+            depth_data for position, depth_data in enumerate(zip(
+                self.__name_list,
+                self.__manual_depth_change_list,
+                self.__total_manual_depth_list))
+            if position not in drop_set
+        ])
+
+    def pop_increase_depth(self, fm_name: str, manual_depth: int) -> int:
+        """
+        Apply pending increase_depth call of the frame.
+
+        @param fm_name: Frame name.
+        @param manual_depth: Manual depth change of the log.
+        @return: Manual depth change after increase_depth call is applied.
+        """
+
+        if manual_depth == 0:
+            amount = self.__increase_depth_dict.get(fm_name)
+
+            if amount:
+                if amount == 1:
+                    self.__increase_depth_dict.pop(fm_name)
+                else:
+                    self.__increase_depth_dict[fm_name] = amount - 1
+
+                return 1
+
+        return manual_depth
+
+    def start(self, fm_name: str):
+        self.__append(fm_name)
+
+    def update_depth(self, stack_list: list[str], manual_depth: int) -> bool:
+        """
+        Update log depth.
+
+        @param stack_list: Stack list.
+        @param manual_depth: Manual depth change.
+        @return: True in case increase depth, else False.
+        """
+
+        fm_name = stack_list[0]
+        expected_parent_fm_name = self.__name_list[-1]
+
+        # In case this is log in child method
+        # (expected parent in stack_list[1:], without copy of stack_list)
+        if stack_list.count(expected_parent_fm_name) \
+                > (expected_parent_fm_name == fm_name):
+            self.__append(fm_name)
+            self.depth += 1
+            return True
+
+        # In case the log is in the same method of previous log
+        if expected_parent_fm_name == fm_name:
+            return self.__update_depth_for_change_in_manual_depth(
+                fm_name, manual_depth)
+
+        # In case go up in the stack so search previous parent
+        self.__update_depth_for_go_up_in_stack(stack_list, manual_depth)
+        return False
+
+    def limit_depth(
+            self,
+            max_depth: int,
+            overflow_policy: DepthOverflowPolicyEnum) -> bool:
+        """
+        Apply overflow policy on the latest log,
+        in case it is deeper than max depth.
+
+        The path is kept, except increase depth of the latest log
+        in the same method, so increase_depth calls in loop
+        do not grow the path.
+        Other logs in the path are in the stack of the latest log.
+
+        @param max_depth: Max depth.
+        @param overflow_policy: Depth overflow policy.
+        @return: True in case the latest log is the root of new log tree.
+        """
+
+        if overflow_policy == DepthOverflowPolicyEnum.RESET_SUBTREE:
+            fm_name = self.__name_list[-1]
+            self.__clear()
+            self.__append(fm_name)
+            self.depth = 0
+            self.depth_offset = 0
+            return True
+
+        if len(self.__name_list) > 1 \
+                and self.__manual_depth_change_list[-1] == 1:
+            self.__pop()
+            self.depth -= 1
+
+        if overflow_policy == DepthOverflowPolicyEnum.COLLAPSE_OLDEST:
+            self.depth_offset = max(self.depth - max_depth, 0)
+
+        return False
+
+    def get_latest_fm_depth(self, fm_name: str) -> Optional[DepthData]:
+        position_list = self.__name_index_dict.get(fm_name)
+
+        if position_list:
+            position = position_list[-1]
+
+            return DepthData(
+                fm_name,
+                self.__manual_depth_change_list[position],
+                self.__total_manual_depth_list[position])
+
+        return None
+
+    def __update_depth_for_go_up_in_stack(
+            self, stack_list: list[str], manual_depth: int):
+
+        parent_position = -1
+
+        for fm_name in stack_list:
+            position_list = self.__name_index_dict.get(fm_name)
+
+            if position_list and position_list[-1] > parent_position:
+                parent_position = position_list[-1]
+
+        if parent_position >= 0:
+            reverse_depth = 0
+
+            while len(self.__name_list) - 1 > parent_position:
+                reverse_depth += self.__pop() + 1
+
+            self.depth -= reverse_depth
+
+            if self.depth < 0:
+                self.depth = 0
+
+            if manual_depth:
+                self.__update_depth_for_change_in_manual_depth(
+                    stack_list[0], manual_depth)
+            else:
+                self.__append(stack_list[0])
+
+            return
+
+        if manual_depth:
+            self.__update_depth_for_change_in_manual_depth(
+                stack_list[0], manual_depth)
+        else:
+            self.__clear()
+            self.__append(stack_list[0])
+            self.depth = 0
+
+    def __update_depth_for_change_in_manual_depth(
+            self, fm_name: str, manual_depth: int) -> bool:
+
+        position_list = self.__name_index_dict.get(fm_name)
+
+        if position_list:
+            total_manual_depth = \
+                self.__total_manual_depth_list[position_list[-1]]
+        else:
+            total_manual_depth = None
+
+        if manual_depth > 0:
+            if total_manual_depth is None:
+                # Scenario:
+                #   1. thread_1: Time: 0, logger.info('msg')
+                #   2. thread_1: Time: 1, logger.increase_depth()
+                #   3. thread_2: Time: 2, Same logger.info('msg') of thread_1
+                return False
+
+            self.__append(fm_name, 1, total_manual_depth + 1)
+            self.depth += 1
+            return True
+
+        if manual_depth < 0 \
+                and self.depth > 0 \
+                and total_manual_depth is not None \
+                and total_manual_depth > 0:
+            self.depth -= 1
+
+        return False
+
+    def __append(
+            self,
+            fm_name: str,
+            manual_depth_change: int = 0,
+            total_manual_depth: int = 0):
+
+        position_list = self.__name_index_dict.get(fm_name)
+
+        if position_list is None:
+            self.__name_index_dict[fm_name] = [len(self.__name_list)]
+        else:
+            position_list.append(len(self.__name_list))
+
+        self.__name_list.append(fm_name)
+        self.__manual_depth_change_list.append(manual_depth_change)
+        self.__total_manual_depth_list.append(total_manual_depth)
+
+    def __pop(self) -> int:
+        """
+        Remove the latest log from the path.
+
+        @return: Manual depth change of the removed log.
+        """
+
+        fm_name = self.__name_list.pop()
+        self.__total_manual_depth_list.pop()
+        # Empty position list is kept to be reused by the next log
+        # of the same frame
+        self.__name_index_dict[fm_name].pop()
+
+        return self.__manual_depth_change_list.pop()
+
+    def __reset_path(self, path: list[tuple[str, int, int]]):
+        self.__clear()
+
+        for name, manual_depth_change, total_manual_depth in path:
+            self.__append(name, manual_depth_change, total_manual_depth)
+
+    def __clear(self):
+        self.__name_list = []
+        self.__manual_depth_change_list = []
+        self.__total_manual_depth_list = []
+        self.__name_index_dict = {}
+
+
+class StatesCounter:
+    """
+    Thread safe counter of live depth states.
+    """
+
+    __amount: int
+    __lock: Lock
+
+    def __init__(self):
+        self.__amount = 0
+        self.__lock = Lock()
+
+    def increase(self):
+        with self.__lock:
+            self.__amount += 1
+
+    def decrease(self):
+        with self.__lock:
+            self.__amount -= 1
+
+    @property
+    def amount(self) -> int:
+        return self.__amount
+
+
+class DepthTrackerBase(ABC):
+    """
+    Depth states of the log trees that are written to the same stream handler.
+    """
+
+    __states_counter: StatesCounter
+    __max_depth: Optional[int]
+    __overflow_policy: DepthOverflowPolicyEnum
+
+    def __init__(
+            self,
+            max_depth: Optional[int] = None,
+            overflow_policy: DepthOverflowPolicyEnum =
+            DEFAULT_DEPTH_OVERFLOW_POLICY):
+
+        self.__states_counter = StatesCounter()
+        self.max_depth = max_depth
+        self.__overflow_policy = overflow_policy
+
+    @abstractmethod
+    def get_state(self) -> DepthState:
+        """
+        @return: Depth state of the current log tree.
+        """
+
+    def update(
+            self, stack_list: list[str], manual_depth: int) -> DepthPosition:
+        """
+        Update log depth of the current log tree.
+
+        @param stack_list: Stack list.
+        @param manual_depth: Manual depth change.
+        @return: Position of the log.
+        """
+
+        state = self.get_state()
+        manual_depth = state.pop_increase_depth(stack_list[0], manual_depth)
+
+        if state.is_empty:
+            state.start(stack_list[0])
+            return DepthPosition.get(state.depth, is_new_tree=True)
+
+        is_child = state.update_depth(stack_list, manual_depth)
+        depth = state.depth - state.depth_offset
+
+        if depth < 0:
+            # Go up above the oldest log that is written
+            state.depth_offset = state.depth
+            depth = 0
+
+        if self.__max_depth is not None and depth > self.__max_depth:
+            is_new_tree = \
+                state.limit_depth(self.__max_depth, self.__overflow_policy)
+            depth = \
+                min(state.depth - state.depth_offset, self.__max_depth)
+            return DepthPosition.get(
+                depth, is_new_tree=is_new_tree, is_overflow=True)
+
+        return DepthPosition.get(depth, is_child)
+
+    def increase_depth(self, fm_name: str):
+        self.get_state().increase_depth(fm_name)
+
+    def decrease_depth(self, fm_name: str):
+        self.get_state().decrease_depth(fm_name)
+
+    @property
+    def max_depth(self) -> Optional[int]:
+        return self.__max_depth
+
+    @max_depth.setter
+    def max_depth(self, max_depth: Optional[int]):
+        """
+        @param max_depth:
+            Max depth of the log trees. None for unlimited depth.
+        """
+
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(f'Max depth [{max_depth}] cannot be negative')
+
+        self.__max_depth = max_depth
+
+    @property
+    def overflow_policy(self) -> DepthOverflowPolicyEnum:
+        return self.__overflow_policy
+
+    @overflow_policy.setter
+    def overflow_policy(self, overflow_policy: DepthOverflowPolicyEnum):
+        self.__overflow_policy = overflow_policy
+
+    @property
+    def states_amount(self) -> int:
+        """
+        @return: Amount of states that are not released yet.
+        """
+
+        return self.__states_counter.amount
+
+    def _create_state(self, owner: Any = None) -> DepthState:
+        state = DepthState(owner)
+        self.__states_counter.increase()
+        # The finalizer does not reference the tracker,
+        # so states do not keep the tracker alive.
+        weakref.finalize(state, self.__states_counter.decrease)
+        return state
+
+
+class ThreadDepthTracker(DepthTrackerBase):
+    """
+    Depth state per thread.
+
+    All coroutines that run in the same thread share the same state.
+    The state is kept in threading.local,
+    so it is released when its thread ends,
+    and each thread reads and changes only its own state without lock.
+    """
+
+    __local: threading.local
+
+    def __init__(
+            self,
+            max_depth: Optional[int] = None,
+            overflow_policy: DepthOverflowPolicyEnum =
+            DEFAULT_DEPTH_OVERFLOW_POLICY):
+
+        super().__init__(max_depth, overflow_policy)
+        self.__local = threading.local()
+
+    def get_state(self) -> DepthState:
+        state = getattr(self.__local, 'state', None)
+
+        if state is None:
+            state = self._create_state()
+            self.__local.state = state
+
+        return state
+
+
+class ContextDepthTracker(DepthTrackerBase):
+    """
+    Depth state per context (contextvars).
+
+    Each thread and each asyncio task has its own state,
+    so concurrent tasks in the same event loop do not share a log tree.
+    asyncio task is created with a copy of the context of its creator,
+    so state that was created by another task or thread is replaced
+    with new state on first use.
+
+    States are released with their context.
+    """
+
+    __state_var: ContextVar
+
+    def __init__(
+            self,
+            max_depth: Optional[int] = None,
+            overflow_policy: DepthOverflowPolicyEnum =
+            DEFAULT_DEPTH_OVERFLOW_POLICY):
+
+        super().__init__(max_depth, overflow_policy)
+        self.__state_var = ContextVar(f'nrt_logging_depth_{id(self)}')
+
+    def get_state(self) -> DepthState:
+        owner = self.__get_owner()
+        state = self.__state_var.get(None)
+
+        if state is None or state.owner is not owner:
+            state = self._create_state(owner)
+            self.__state_var.set(state)
+
+        return state
+
+    @classmethod
+    def __get_owner(cls) -> Any:
+        # skipcq: PYL-W0212
+        loop = asyncio._get_running_loop()
+
+        if loop is not None:
+            task = asyncio.current_task(loop)
+
+            if task is not None:
+                return task
+
+        return threading.current_thread()
+
+
+class Span:
+    """
+    Span of SpanDepthTracker.
+
+    The span log is written only by stream handlers
+    with log level that is not above the span log level,
+    so depth of logs in the span is computed per stream handler
+    log level. Stream handlers that did not write the span log
+    write logs in the span under the nearest span that they wrote.
+    """
+
+    __slots__ = ('parent', 'log_level_value', '__depth_dict')
+
+    parent: Optional['Span']
+    # Stream handlers with log level value up to it wrote the span log.
+    # None if the span has no log, so logs in the span
+    # are children of the latest log.
+    log_level_value: Optional[int]
+    # {Stream handler log level value: Depth of logs in the span}
+    __depth_dict: dict[int, int]
+
+    def __init__(
+            self,
+            parent: Optional['Span'],
+            log_level_value: Optional[int] = None):
+
+        self.parent = parent
+        self.log_level_value = log_level_value
+        self.__depth_dict = {}
+
+    def get_depth(self, log_level_value: int) -> int:
+        """
+        @param log_level_value: Stream handler log level value.
+        @return: Depth of logs in the span for the stream handler.
+        """
+
+        depth = self.__depth_dict.get(log_level_value)
+
+        if depth is None:
+            depth = \
+                0 if self.parent is None \
+                else self.parent.get_depth(log_level_value)
+
+            if self.log_level_value is None \
+                    or log_level_value <= self.log_level_value:
+                depth += 1
+
+            self.__depth_dict[log_level_value] = depth
+
+        return depth
+
+
+class SpanDepthTracker:
+    """
+    Depth of logs by explicit spans, without stack inspection.
+
+    Each span pushes a depth level, and logs in the span are its children.
+    The current span is kept in ContextVar,
+    so each thread and each asyncio task has its own spans.
+    A task that is created in a span starts in the span of its creator,
+    and spans of the task do not change the spans of its creator.
+
+    Position of logs is computed per stream handler log level,
+    since stream handlers write different logs of the span.
+    Depth of the latest log of each log level is kept in ContextVar
+    as the span, so logs of other threads and tasks
+    do not change the position of the next log in the span.
+    A log is the first child only if the latest log of its context
+    was written one depth above it, and the depth of a log
+    is at most one below the latest log of its context,
+    as when a generator is resumed after logs of its consumer.
+    """
+
+    __span_var: ContextVar
+    # {Stream handler log level value: Depth of the latest log},
+    # replaced on change, so contexts that copied it are not changed
+    __latest_depth_var: ContextVar
+
+    def __init__(self):
+        self.__span_var = \
+            ContextVar(f'nrt_logging_span_{id(self)}', default=None)
+        self.__latest_depth_var = \
+            ContextVar(f'nrt_logging_span_depth_{id(self)}', default=None)
+
+    @property
+    def is_in_span(self) -> bool:
+        return self.__span_var.get() is not None
+
+    @property
+    def span(self) -> Optional[Span]:
+        return self.__span_var.get()
+
+    def update(self, log_level_value: int) -> DepthPosition:
+        """
+        Should be called once per log for each stream handler log level.
+
+        @param log_level_value: Stream handler log level value.
+        @return: Position of the current log.
+        """
+
+        span = self.__span_var.get()
+        depth = 0 if span is None else span.get_depth(log_level_value)
+        latest_depth_dict = self.__latest_depth_var.get() or {}
+        latest_depth = latest_depth_dict.get(log_level_value, -1)
+
+        if depth > latest_depth + 1:
+            depth = latest_depth + 1
+
+        if depth != latest_depth:
+            self.__latest_depth_var.set(
+                {**latest_depth_dict, log_level_value: depth})
+
+        return DepthPosition.get(depth, 0 <= latest_depth < depth)
+
+    def push(self, log_level_value: Optional[int] = None) -> Token:
+        """
+        Start span. Next logs are children of the span log.
+
+        @param log_level_value:
+            Stream handlers with log level value up to it
+            wrote the span log.
+            None if the span has no log,
+            so next logs are children of the latest log.
+        @return: Token to end the span with.
+        """
+
+        return self.__span_var.set(
+            Span(self.__span_var.get(), log_level_value))
+
+    def resume(self, span: Span) -> Token:
+        """
+        Start span that was started before,
+        as when traced generator is resumed.
+
+        @param span: Span.
+        @return: Token to end the span with.
+        """
+
+        return self.__span_var.set(span)
+
+    def pop(self, token: Token):
+        """
+        End span.
+
+        @param token: Token that was returned by push of the span.
+        """
+
+        self.__span_var.reset(token)
+
+
+def create_depth_tracker(
+        is_context_depth: bool,
+        max_depth: Optional[int] = None,
+        overflow_policy: DepthOverflowPolicyEnum =
+        DEFAULT_DEPTH_OVERFLOW_POLICY) -> DepthTrackerBase:
+
+    if is_context_depth:
+        return ContextDepthTracker(max_depth, overflow_policy)
+
+    return ThreadDepthTracker(max_depth, overflow_policy)
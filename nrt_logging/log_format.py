@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
+from typing import Callable, Optional, Union
 
 
 class LogElementEnum(Enum):
@@ -36,12 +38,160 @@ class LogElementEnum(Enum):
         raise ValueError(f'[{name}] is not valid log element name')
 
 
+class LogDateFormatter:
+    """
+    Format log dates of one date format.
+
+    Formatters are shared by all stream handlers with the same date format,
+    so the date of a record is formatted once for all of them.
+
+    ISO-8601 and epoch formats are formatted without strftime.
+    Other formats are split by microseconds directives,
+    and the parts before and after them are formatted once per second
+    of dates without time zone.
+    """
+
+    __MICROSECONDS_DIRECTIVE = '%f'
+
+    # {date format: (ISO separator, ISO timespec)}
+    __ISO_FORMAT_DICT = {
+        '%Y-%m-%d %H:%M:%S.%f': (' ', 'microseconds'),
+        '%Y-%m-%dT%H:%M:%S.%f': ('T', 'microseconds'),
+        '%Y-%m-%d %H:%M:%S': (' ', 'seconds'),
+        '%Y-%m-%dT%H:%M:%S': ('T', 'seconds')
+    }
+
+    __EPOCH_FORMAT = '%s'
+    __EPOCH_MICROSECONDS_FORMAT = '%s.%f'
+
+    # {date format: Date formatter}
+    __formatter_dict: dict[str, 'LogDateFormatter'] = {}
+
+    __date_format: str
+    __format_func: Callable[[datetime], str]
+    # Date format parts between microseconds directives
+    __part_list: list[str]
+    # (Last date, Formatted last date)
+    __last_date_cache: tuple[Optional[datetime], str]
+    # (Epoch second, Formatted parts of the second)
+    __second_cache: tuple[Optional[int], list[str]]
+
+    def __init__(self, date_format: str):
+        self.__date_format = date_format
+        self.__part_list = self.__split_by_microseconds(date_format)
+        self.__last_date_cache = (None, '')
+        self.__second_cache = (None, [])
+        self.__format_func = self.__get_format_func()
+
+    def format(self, date: datetime) -> str:
+        last_date, date_str = self.__last_date_cache
+
+        if date is last_date:
+            return date_str
+
+        date_str = self.__format_func(date)
+        self.__last_date_cache = (date, date_str)
+
+        return date_str
+
+    @property
+    def date_format(self) -> str:
+        return self.__date_format
+
+    def __get_format_func(self) -> Callable[[datetime], str]:
+        if self.__date_format in self.__ISO_FORMAT_DICT:
+            return self.__format_iso
+
+        if self.__date_format == self.__EPOCH_FORMAT:
+            return self.__format_epoch
+
+        if self.__date_format == self.__EPOCH_MICROSECONDS_FORMAT:
+            return self.__format_epoch_with_microseconds
+
+        return self.__format_with_second_cache
+
+    def __format_iso(self, date: datetime) -> str:
+        if date.tzinfo is not None:
+            return date.strftime(self.__date_format)
+
+        return date.isoformat(*self.__ISO_FORMAT_DICT[self.__date_format])
+
+    def __format_with_second_cache(self, date: datetime) -> str:
+        if date.tzinfo is not None:
+            return date.strftime(self.__date_format)
+
+        second = int(date.timestamp())
+        cache_second, formatted_part_list = self.__second_cache
+
+        if second != cache_second:
+            formatted_part_list = \
+                [date.strftime(part) for part in self.__part_list]
+            self.__second_cache = (second, formatted_part_list)
+
+        if len(formatted_part_list) == 1:
+            return formatted_part_list[0]
+
+        return f'{date.microsecond:06d}'.join(formatted_part_list)
+
+    @classmethod
+    def get(cls, date_format: str) -> 'LogDateFormatter':
+        """
+        Get shared date formatter of date format.
+        """
+
+        formatter = cls.__formatter_dict.get(date_format)
+
+        if formatter is None:
+            formatter = \
+                cls.__formatter_dict.setdefault(
+                    date_format, LogDateFormatter(date_format))
+
+        return formatter
+
+    @classmethod
+    def __format_epoch(cls, date: datetime) -> str:
+        return str(int(date.timestamp()))
+
+    @classmethod
+    def __format_epoch_with_microseconds(cls, date: datetime) -> str:
+        return f'{int(date.timestamp())}.{date.microsecond:06d}'
+
+    @classmethod
+    def __split_by_microseconds(cls, date_format: str) -> list[str]:
+        """
+        Split date format by microseconds directives.
+        Escaped percent sign ('%%') is not a directive start.
+        """
+
+        part_list = []
+        part_start = 0
+        i = 0
+
+        while i < len(date_format) - 1:
+            if date_format[i] != '%':
+                i += 1
+            elif date_format[i:i + 2] == cls.__MICROSECONDS_DIRECTIVE:
+                part_list.append(date_format[part_start:i])
+                i += 2
+                part_start = i
+            else:
+                i += 2
+
+        part_list.append(date_format[part_start:])
+
+        return part_list
+
+
 @dataclass
 class LogDateFormat:
     DEFAULT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
 
     date_format: str = DEFAULT_DATE_FORMAT
 
+    @property
+    def formatter(self) -> LogDateFormatter:
+        return LogDateFormatter.get(self.date_format)
+
 
 @dataclass
 class LogYamlElements:
@@ -55,16 +205,255 @@ class LogYamlElements:
             LogElementEnum.MESSAGE
         )
 
-    yaml_elements: set[LogElementEnum] = DEFAULT_YAML_ELEMENTS
+    yaml_elements: tuple[LogElementEnum, ...] = DEFAULT_YAML_ELEMENTS
+
+    @property
+    def ordered_yaml_elements(self) -> tuple[LogElementEnum, ...]:
+        """
+        YAML elements in the order that they are written.
+        Elements of a set are ordered by LogElementEnum order.
+        """
+
+        if isinstance(self.yaml_elements, set):
+            return \
+                tuple(
+                    log_element
+                    for log_element in LogElementEnum
+                    if log_element in self.yaml_elements)
+
+        return tuple(dict.fromkeys(self.yaml_elements))
 
     @classmethod
     def build(cls, log_yaml_elements):
-        if isinstance(log_yaml_elements, list):
-            return LogYamlElements(yaml_elements=set(log_yaml_elements))
+        """
+        Build LogYamlElements.
+
+        @param log_yaml_elements: LogYamlElements, or list or tuple
+            of log elements in the order that they are written,
+            or set of log elements that is ordered by LogElementEnum order.
+        """
 
-        if isinstance(log_yaml_elements, set):
-            return LogYamlElements(yaml_elements=log_yaml_elements)
+        if isinstance(log_yaml_elements, LogYamlElements):
+            return log_yaml_elements
+
+        if isinstance(log_yaml_elements, (list, tuple, set)):
+            return \
+                LogYamlElements(
+                    yaml_elements=LogYamlElements(
+                        log_yaml_elements).ordered_yaml_elements)
 
         raise ValueError(
             f'Type [{type(log_yaml_elements)}]'
             f' of log_yaml_elements is not supported')
+
+
+class LogTemplateBase:
+    """
+    Template of log record that is compiled once to a render function,
+    that joins the template literals with the values of the log elements.
+    Date is formatted only if date element appears in the template.
+    """
+
+    __RENDER_FUNC_NAME = 'render'
+    __RENDER_ARGS = \
+        'date, format_date, log_level, path, method, line_number, message'
+    __DATE_VAR = 'date_str'
+
+    __ELEMENT_VAR_DICT = {
+        LogElementEnum.DATE: __DATE_VAR,
+        LogElementEnum.LOG_LEVEL: 'log_level',
+        LogElementEnum.PATH: 'path',
+        LogElementEnum.METHOD: 'method',
+        LogElementEnum.LINE_NUMBER: 'line_number',
+        LogElementEnum.MESSAGE: 'message'
+    }
+
+    _elements: tuple[LogElementEnum, ...]
+    _render_func: Callable[..., str]
+
+    def render(
+            self,
+            date: Optional[datetime],
+            format_date: Callable[[datetime], str],
+            log_level: str,
+            path: str,
+            method: str,
+            line_number: str,
+            message: str) -> str:
+
+        return \
+            self._render_func(
+                date,
+                format_date,
+                log_level,
+                path,
+                method,
+                line_number,
+                message)
+
+    @property
+    def elements(self) -> tuple[LogElementEnum, ...]:
+        return self._elements
+
+    @property
+    def is_date(self) -> bool:
+        """
+        True if the template has date element,
+        otherwise date of log records is not needed to render them.
+        """
+
+        return LogElementEnum.DATE in self._elements
+
+    @classmethod
+    def _create_render_func(
+            cls,
+            segment_list: list[Union[str, LogElementEnum]],
+            prepare_code_list: Optional[list[str]] = None,
+            namespace: Optional[dict] = None) -> Callable[..., str]:
+        """
+        Create render function that joins segments.
+
+        @param segment_list: Literals and log elements.
+        @param prepare_code_list: Code lines that run before the join.
+        @param namespace: Global variables of the render function.
+        """
+
+        body_list = []
+
+        if LogElementEnum.DATE in segment_list:
+            body_list.append(f'{cls.__DATE_VAR} = format_date(date)')
+
+        body_list.extend(prepare_code_list or [])
+
+        join_args = \
+            ''.join(
+                f'{cls.__ELEMENT_VAR_DICT[segment]}, '
+                if isinstance(segment, LogElementEnum)
+                else f'{repr(segment)}, '
+                for segment in segment_list)
+
+        body_list.append(f"return ''.join(({join_args}))")
+
+        body = '\n    '.join(body_list)
+        source = \
+            f'def {cls.__RENDER_FUNC_NAME}({cls.__RENDER_ARGS}):\n' \
+            f'    {body}\n'
+
+        namespace = dict(namespace or {})
+        # skipcq: PYL-W0122
+        exec(source, namespace)
+
+        return namespace[cls.__RENDER_FUNC_NAME]
+
+
+class LogLineTemplate(LogTemplateBase):
+    """
+    Log line template.
+
+    Template is split by log elements in LogElementEnum order,
+    so rendering gives the same log line as replacing the elements
+    one after the other.
+    """
+
+    __template: str
+
+    def __init__(self, template: str):
+        self.__template = template
+
+        segment_list: list[Union[str, LogElementEnum]] = [template]
+
+        for log_element in LogElementEnum:
+            segment_list = self.__split_segments(segment_list, log_element)
+
+        self._elements = \
+            tuple(
+                log_element
+                for log_element in LogElementEnum
+                if log_element in segment_list)
+        self._render_func = self._create_render_func(segment_list)
+
+    @property
+    def template(self) -> str:
+        return self.__template
+
+    @classmethod
+    def __split_segments(
+            cls,
+            segment_list: list[Union[str, LogElementEnum]],
+            log_element: LogElementEnum) -> list[Union[str, LogElementEnum]]:
+
+        split_segment_list = []
+
+        for segment in segment_list:
+            if isinstance(segment, LogElementEnum):
+                split_segment_list.append(segment)
+                continue
+
+            for i, literal in enumerate(
+                    segment.split(log_element.line_format)):
+                if i > 0:
+                    split_segment_list.append(log_element)
+
+                if literal:
+                    split_segment_list.append(literal)
+
+        return split_segment_list
+
+
+class LogYamlTemplate(LogTemplateBase):
+    """
+    YAML log record template of YAML elements in one depth.
+    """
+
+    __FORMAT_MESSAGE_FUNC_NAME = 'format_multiline_message'
+
+    __message_indent: str
+
+    def __init__(
+            self,
+            yaml_elements: tuple[LogElementEnum, ...],
+            record_prefix: str,
+            first_element_prefix: str,
+            element_prefix: str,
+            message_indent: str):
+        """
+        @param yaml_elements: YAML elements in the order that they are written.
+        @param record_prefix: Prefix of the YAML record.
+        @param first_element_prefix: Prefix of the first YAML element.
+        @param element_prefix: Prefix of the other YAML elements.
+        @param message_indent: New line and indentation
+            of multiline message lines.
+        """
+
+        self.__message_indent = message_indent
+        self._elements = yaml_elements
+
+        segment_list: list[Union[str, LogElementEnum]] = [record_prefix]
+
+        for i, log_element in enumerate(yaml_elements):
+            segment_list.append(
+                f'{first_element_prefix if i == 0 else element_prefix}'
+                f'{log_element.value}: ')
+            segment_list.append(log_element)
+
+        prepare_code_list = []
+
+        if LogElementEnum.MESSAGE in yaml_elements:
+            prepare_code_list.append(
+                f"message = {self.__FORMAT_MESSAGE_FUNC_NAME}(message)"
+                f" if '\\n' in message else message")
+
+        self._render_func = \
+            self._create_render_func(
+                segment_list,
+                prepare_code_list,
+                {
+                    self.__FORMAT_MESSAGE_FUNC_NAME:
+                        self.__format_multiline_message
+                })
+
+    def __format_multiline_message(self, message: str) -> str:
+        multiline_operator = '|' if message[-1] == '\n' else '|-'
+        message_lines = message.replace('\n', self.__message_indent)
+
+        return f'{multiline_operator}{self.__message_indent}{message_lines}'
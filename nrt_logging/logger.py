@@ -1,8 +1,17 @@
-from typing import Optional
-
+import asyncio
+import functools
+import inspect
+from collections.abc import Mapping
+from contextvars import Token
+from typing import Callable, Optional, Union
+
+from nrt_logging.depth_tracker import \
+    DepthPosition, DepthTrackerBase, Span, SpanDepthTracker, \
+    create_depth_tracker
 from nrt_logging.log_level import LogLevelEnum
 from nrt_logging.logger_stream_handlers import \
     LoggerStreamHandlerBase, ManualDepthEnum, DEFAULT_LOG_LEVEL
+from nrt_logging.stack_capture import StackCapture
 
 
 class NrtLogger:
@@ -16,11 +25,61 @@ class NrtLogger:
     or it can be in line style with children logs of children methods.
 
     User can force logs to be children of previous logs in the same method.
+
+    The stack of each log call is captured once
+    and shared by all the stream handlers of the logger.
+    Position of each log in the log tree is computed once
+    for all the stream handlers with the same depth key
+    (log level and depth options).
+    Stream handlers that are added to multiple loggers
+    keep their own log trees.
+
+    Hierarchy can be set explicitly with spans
+    (logger.span and logger.traced).
+    Logs in span are children of the span log,
+    and their depth is taken from the span without stack inspection.
+    In span mode all the logs take their depth from spans,
+    and logs that are not in span are roots of log trees.
+
+    Messages can be formatted lazily, with printf-style arguments
+    (logger.debug('x=%s y=%r', x, y)) or with a callable that returns
+    the message (logger.debug(lambda: expensive())).
+    The message is created once per log, only if the logger
+    and at least one stream handler write the log level,
+    and it is shared by all the stream handlers.
+    ManualDepthEnum as the last positional argument is manual_depth,
+    as in logger.info(msg, ManualDepthEnum.INCREASE).
+
+    Stream handlers of each log level are computed when the logger
+    log level, the stream handlers, or their log levels change.
+    Log methods of log levels that are not written are replaced
+    with a method that does nothing.
     """
 
+    # __log <- log method <- caller
+    __CALLER_STACK_DEPTH = 2
+
+    # {Log level: Names of log methods of the log level}
+    __LOG_METHOD_NAME_DICT = {
+        LogLevelEnum.CRITICAL: ('critical',),
+        LogLevelEnum.ERROR: ('error',),
+        LogLevelEnum.WARN: ('warn',),
+        LogLevelEnum.INFO: ('info',),
+        LogLevelEnum.DEBUG: ('debug',),
+        LogLevelEnum.TRACE: ('trace', 'snapshot')
+    }
+
     __stream_handler_list: list[LoggerStreamHandlerBase]
+    # {Stream handler depth key: DepthTrackerBase}
+    __depth_tracker_dict: dict[tuple, DepthTrackerBase]
+    __span_tracker: SpanDepthTracker
     __log_level: Optional[LogLevelEnum] = None
+    # {Log level value: Stream handlers that write the log level}
+    __handler_dispatch_dict: dict[int, tuple[LoggerStreamHandlerBase, ...]]
+    # {Log level value: True if a stream handler of it writes the date}
+    __is_date_dict: dict[int, bool]
 
+    __is_span_mode: bool = False
     __is_debug: bool = False
 
     def __init__(self, log_level: LogLevelEnum = DEFAULT_LOG_LEVEL):
@@ -35,90 +94,206 @@ class NrtLogger:
 
         self.__log_level = log_level
         self.__stream_handler_list = []
+        self.__depth_tracker_dict = {}
+        self.__span_tracker = SpanDepthTracker()
+        self._update_log_dispatch()
 
     def critical(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.CRITICAL:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.critical(msg, manual_depth)
+        self.__log(LogLevelEnum.CRITICAL, msg, manual_depth, args=args)
 
     def error(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.ERROR:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.error(msg, manual_depth)
+        self.__log(LogLevelEnum.ERROR, msg, manual_depth, args=args)
 
     def warn(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.WARN:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.warn(msg, manual_depth)
+        self.__log(LogLevelEnum.WARN, msg, manual_depth, args=args)
 
     def info(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.INFO:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.info(msg, manual_depth)
+        self.__log(LogLevelEnum.INFO, msg, manual_depth, args=args)
 
     def debug(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.DEBUG:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.debug(msg, manual_depth)
+        self.__log(LogLevelEnum.DEBUG, msg, manual_depth, args=args)
 
     def trace(
             self,
-            msg: str,
+            msg: Union[str, Callable[[], str]],
+            *args,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
 
-        if self.log_level <= LogLevelEnum.TRACE:
-            self.__verify_stream_handler_list_not_empty()
-
-            for handler in self.__stream_handler_list:
-                handler.trace(msg, manual_depth)
+        self.__log(LogLevelEnum.TRACE, msg, manual_depth, args=args)
 
     def snapshot(
             self,
             methods_depth: int = LoggerStreamHandlerBase.SNAPSHOT_METHODS_DEPTH,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        if self.log_level <= LogLevelEnum.TRACE:
-            self.__verify_stream_handler_list_not_empty()
 
-            for handler in self.__stream_handler_list:
-                handler.snapshot(methods_depth, manual_depth)
+        handler_list = self.__get_stream_handlers(LogLevelEnum.TRACE)
+
+        if not handler_list:
+            self.__verify_stream_handler_list_not_empty()
+            return
+
+        depth_position_dict = {}
+
+        if self.__is_span_position():
+            stack_capture = \
+                StackCapture.build(
+                    1,
+                    methods_depth,
+                    methods_depth,
+                    self.__is_date_dict[LogLevelEnum.TRACE.value])
+
+            for handler in handler_list:
+                handler.snapshot(
+                    methods_depth,
+                    manual_depth,
+                    stack_capture,
+                    self.__get_span_depth_position(
+                        handler, depth_position_dict))
+
+            return
+
+        stack_capture = \
+            StackCapture.build(
+                1,
+                methods_depth,
+                is_date=self.__is_date_dict[LogLevelEnum.TRACE.value])
+
+        for handler in handler_list:
+            handler.snapshot(
+                methods_depth,
+                manual_depth,
+                stack_capture,
+                self.__get_depth_position(
+                    handler,
+                    stack_capture,
+                    manual_depth,
+                    depth_position_dict))
 
     def increase_depth(self):
-        for handler in self.__stream_handler_list:
-            handler.increase_depth()
+        """
+        Next logs in the calling method will be children
+        of the latest log. Not used in span mode.
+        """
+
+        if self.__stream_handler_list and not self.__is_span_mode:
+            self.__increase_depth(StackCapture.get_frame_name(1))
 
     def decrease_depth(self, level: int = 1):
-        for handler in self.__stream_handler_list:
-            handler.decrease_depth(level)
+        if self.__stream_handler_list \
+                and level >= 1 \
+                and not self.__is_span_mode:
+            self.__decrease_depth(StackCapture.get_frame_name(1), level)
+
+    def depth(self) -> 'LogDepth':
+        """
+        Increase depth in the block, and decrease it when the block ends.
+        The calling method is resolved once for both.
+        In span mode the block is span without span message.
+
+        logger.info('Parent')
+
+        with logger.depth():
+            logger.info('Child of Parent')
+
+        @return: Context manager of the depth.
+        """
+
+        return LogDepth(self)
+
+    def span(
+            self,
+            msg: str,
+            log_level: LogLevelEnum = LogLevelEnum.INFO) -> 'LogSpan':
+        """
+        Span of logs.
+        The message is logged when the span starts,
+        and logs in the span are its children.
+
+        with logger.span('Connect'):
+            logger.info('Child of Connect')
+
+        @param msg: Span message.
+        @param log_level: Span message log level.
+        @return: Context manager of the span.
+        """
+
+        return LogSpan(self, msg, log_level)
+
+    def traced(
+            self,
+            func: Optional[Callable] = None,
+            msg: Optional[str] = None,
+            log_level: LogLevelEnum = LogLevelEnum.INFO) -> Callable:
+        """
+        Decorator that runs the decorated function
+        (or coroutine function) in span.
+        Generator and async generator functions run in span
+        each time they are resumed, and the span log is written
+        when the iteration starts.
+
+        @logger.traced
+        def connect(): ...
+
+        @logger.traced(msg='Connect', log_level=LogLevelEnum.DEBUG)
+        def connect(): ...
+
+        @param func: Decorated function.
+        @param msg: Span message. Default is the function qualified name.
+        @param log_level: Span message log level.
+        @return: Decorated function, or decorator if func is None.
+        """
+
+        if func is None:
+            return functools.partial(
+                self.traced, msg=msg, log_level=log_level)
+
+        span_msg = func.__qualname__ if msg is None else msg
+
+        if inspect.isasyncgenfunction(func):
+            return self.__traced_async_gen(func, span_msg, log_level)
+
+        if inspect.isgeneratorfunction(func):
+            return self.__traced_gen(func, span_msg, log_level)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with LogSpan(self, span_msg, log_level, start_depth=1):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with LogSpan(self, span_msg, log_level, start_depth=1):
+                return func(*args, **kwargs)
+
+        return wrapper
 
     def add_stream_handler(
             self,
@@ -137,16 +312,30 @@ class NrtLogger:
         if self.is_debug:
             stream_handler.is_debug = self.is_debug
 
+        stream_handler.loggers_amount += 1
+        # skipcq: PYL-W0212
+        stream_handler._logger_set.add(self)
+        self.__stream_handler_list.append(stream_handler)
+
         if is_min_sh_logger_level:
             self.log_level = min(self.__log_level, stream_handler.log_level)
+        else:
+            self._update_log_dispatch()
 
-        self.__stream_handler_list.append(stream_handler)
+    def flush(self):
+        for handler in self.__stream_handler_list:
+            handler.flush()
 
     def close_stream_handlers(self):
         for handler in self.__stream_handler_list:
             handler.close()
+            handler.loggers_amount -= 1
+            # skipcq: PYL-W0212
+            handler._logger_set.discard(self)
 
         self.__stream_handler_list = []
+        self.__depth_tracker_dict = {}
+        self._update_log_dispatch()
 
     def update_log_level(
             self, log_level: LogLevelEnum, is_update_sh: bool = True):
@@ -156,6 +345,8 @@ class NrtLogger:
         if is_update_sh:
             self.__update_stream_handlers_log_level(log_level)
 
+        self._update_log_dispatch()
+
     @property
     def log_level(self) -> LogLevelEnum:
         return self.__log_level
@@ -163,11 +354,28 @@ class NrtLogger:
     @log_level.setter
     def log_level(self, log_level: LogLevelEnum):
         self.__log_level = log_level
+        self._update_log_dispatch()
 
     @property
     def stream_handler_list(self) -> list[LoggerStreamHandlerBase]:
         return self.__stream_handler_list
 
+    @property
+    def is_span_mode(self) -> bool:
+        return self.__is_span_mode
+
+    @is_span_mode.setter
+    def is_span_mode(self, is_span_mode: bool):
+        """
+        In span mode depth of all the logs is taken from spans,
+        and only the frame of the log call is captured.
+        Manual depth, increase_depth and decrease_depth are ignored.
+
+        @param is_span_mode: True for span mode.
+        """
+
+        self.__is_span_mode = is_span_mode
+
     @property
     def is_debug(self) -> bool:
         return self.__is_debug
@@ -176,6 +384,370 @@ class NrtLogger:
     def is_debug(self, is_debug: bool):
         self.__is_debug = is_debug
 
+    def _update_log_dispatch(self):
+        """
+        Compute stream handlers of each log level,
+        and replace log methods of log levels that are not written
+        with a method that does nothing.
+        Date of log records is captured only for log levels
+        that have a stream handler that writes it.
+        Called when the logger log level, the stream handlers,
+        or their log levels or log formats change.
+        """
+
+        handler_dispatch_dict = {
+            log_level.value: tuple(
+                handler for handler in self.__stream_handler_list
+                if log_level >= handler.log_level)
+            for log_level in LogLevelEnum
+        }
+        self.__handler_dispatch_dict = handler_dispatch_dict
+        self.__is_date_dict = {
+            log_level_value: any(handler.is_date for handler in handlers)
+            for log_level_value, handlers in handler_dispatch_dict.items()
+        }
+
+        for log_level in LogLevelEnum:
+            # Without stream handlers, log raises error as before
+            is_no_handler = \
+                bool(self.__stream_handler_list) \
+                and not handler_dispatch_dict[log_level.value]
+            is_disabled = log_level < self.__log_level or is_no_handler
+
+            for method_name in self.__LOG_METHOD_NAME_DICT[log_level]:
+                if is_disabled:
+                    setattr(self, method_name, _disabled_log)
+                else:
+                    self.__dict__.pop(method_name, None)
+
+    def _enter_span(
+            self,
+            msg: str,
+            log_level: LogLevelEnum,
+            start_depth: int) -> Token:
+        """
+        Log span message and start the span.
+
+        @param msg: Span message.
+        @param log_level: Span message log level.
+        @param start_depth:
+            Depth of the span caller frame,
+            relative to the caller of this method (0 is the caller).
+        @return: Token to end the span with.
+        """
+
+        if self.log_level <= log_level:
+            self.__log(
+                log_level,
+                msg,
+                ManualDepthEnum.NO_CHANGE,
+                start_depth + 2,
+                is_span=True)
+
+            return self.__span_tracker.push(log_level.value)
+
+        # No stream handler wrote the span log
+        return self.__span_tracker.push(0)
+
+    def _exit_span(self, token: Token):
+        self.__span_tracker.pop(token)
+
+    def _get_span(self) -> Optional[Span]:
+        return self.__span_tracker.span
+
+    def _resume_span(self, span: Span) -> Token:
+        """
+        Start span that was started before, without span message.
+
+        @param span: Span.
+        @return: Token to end the span with.
+        """
+
+        return self.__span_tracker.resume(span)
+
+    def _enter_depth(self, start_depth: int) -> Union[str, Token, None]:
+        """
+        Increase depth of the next logs in the caller method.
+
+        @param start_depth:
+            Depth of the caller method frame,
+            relative to the caller of this method (0 is the caller).
+        @return: Frame name or span token to exit the depth with.
+        """
+
+        if self.__is_span_mode:
+            return self.__span_tracker.push()
+
+        if not self.__stream_handler_list:
+            return None
+
+        fm_name = StackCapture.get_frame_name(start_depth + 1)
+        self.__increase_depth(fm_name)
+        return fm_name
+
+    def _exit_depth(self, depth_id: Union[str, Token, None]):
+        if isinstance(depth_id, Token):
+            self.__span_tracker.pop(depth_id)
+        elif depth_id is not None:
+            self.__decrease_depth(depth_id, 1)
+
+    def _get_depth_tracker(
+            self, handler: LoggerStreamHandlerBase) -> DepthTrackerBase:
+        """
+        Get depth tracker of the log trees of the stream handler.
+        Stream handlers with the same depth key share the depth tracker.
+
+        @param handler: Stream handler that is not shared by loggers.
+        @return: Depth tracker.
+        """
+
+        depth_tracker = self.__depth_tracker_dict.get(handler.depth_key)
+
+        if depth_tracker is None:
+            depth_tracker = \
+                self.__depth_tracker_dict.setdefault(
+                    handler.depth_key,
+                    create_depth_tracker(
+                        handler.is_context_depth,
+                        handler.max_depth,
+                        handler.depth_overflow_policy))
+
+        return depth_tracker
+
+    def __traced_async_gen(
+            self,
+            func: Callable,
+            span_msg: str,
+            log_level: LogLevelEnum) -> Callable:
+        """
+        Decorate async generator function,
+        so it runs in span each time it is resumed.
+        """
+
+        @functools.wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            async_gen = func(*args, **kwargs)
+            log_span = \
+                LogResumableSpan(self, span_msg, log_level, start_depth=1)
+            step = async_gen.asend
+            value = None
+
+            while True:
+                with log_span:
+                    try:
+                        item = await step(value)
+                    except StopAsyncIteration:
+                        return
+
+                try:
+                    value = yield item
+                    step = async_gen.asend
+                except GeneratorExit:
+                    with log_span:
+                        await async_gen.aclose()
+
+                    raise
+                except BaseException as e:
+                    step = async_gen.athrow
+                    value = e
+
+        return async_gen_wrapper
+
+    def __traced_gen(
+            self,
+            func: Callable,
+            span_msg: str,
+            log_level: LogLevelEnum) -> Callable:
+        """
+        Decorate generator function,
+        so it runs in span each time it is resumed.
+        """
+
+        @functools.wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            gen = func(*args, **kwargs)
+            log_span = \
+                LogResumableSpan(self, span_msg, log_level, start_depth=1)
+            step = gen.send
+            value = None
+
+            while True:
+                with log_span:
+                    try:
+                        item = step(value)
+                    except StopIteration as e:
+                        return e.value
+
+                try:
+                    value = yield item
+                    step = gen.send
+                except GeneratorExit:
+                    with log_span:
+                        gen.close()
+
+                    raise
+                except BaseException as e:
+                    step = gen.throw
+                    value = e
+
+        return gen_wrapper
+
+    def __increase_depth(self, fm_name: str):
+        for handler in self.__get_shared_stream_handlers():
+            handler.increase_depth(fm_name)
+
+        for depth_tracker in self.__get_depth_trackers():
+            depth_tracker.increase_depth(fm_name)
+
+    def __decrease_depth(self, fm_name: str, level: int):
+        for handler in self.__get_shared_stream_handlers():
+            handler.decrease_depth(level, fm_name)
+
+        for depth_tracker in self.__get_depth_trackers():
+            depth_tracker.decrease_depth(fm_name)
+
+    def __log(
+            self,
+            log_level: LogLevelEnum,
+            msg: str,
+            manual_depth: ManualDepthEnum,
+            stack_depth: int = __CALLER_STACK_DEPTH,
+            is_span: bool = False,
+            args: tuple = ()):
+
+        handler_list = self.__get_stream_handlers(log_level)
+
+        if not handler_list:
+            self.__verify_stream_handler_list_not_empty()
+            return
+
+        if args and isinstance(args[-1], ManualDepthEnum):
+            manual_depth = args[-1]
+            args = args[:-1]
+
+        if args or callable(msg):
+            msg = self.__create_msg(msg, args)
+
+        depth_position_dict = {}
+
+        if is_span or self.__is_span_position():
+            # Only the call site is captured, depth is taken from span
+            stack_capture = \
+                StackCapture.build(
+                    stack_depth,
+                    frames_amount=1,
+                    is_date=self.__is_date_dict[log_level.value])
+
+            for handler in handler_list:
+                handler.log(
+                    log_level,
+                    msg,
+                    manual_depth,
+                    stack_capture,
+                    self.__get_span_depth_position(
+                        handler, depth_position_dict))
+
+            return
+
+        stack_capture = \
+            StackCapture.build(
+                stack_depth, is_date=self.__is_date_dict[log_level.value])
+
+        for handler in handler_list:
+            handler.log(
+                log_level,
+                msg,
+                manual_depth,
+                stack_capture,
+                self.__get_depth_position(
+                    handler,
+                    stack_capture,
+                    manual_depth,
+                    depth_position_dict))
+
+    def __is_span_position(self) -> bool:
+        return self.__is_span_mode or self.__span_tracker.is_in_span
+
+    def __get_span_depth_position(
+            self,
+            handler: LoggerStreamHandlerBase,
+            depth_position_dict: dict[int, DepthPosition]) -> DepthPosition:
+        """
+        Get position of the log in span,
+        for the log level of the stream handler.
+
+        @param handler: Stream handler.
+        @param depth_position_dict:
+            Positions that were already computed for this log,
+            by stream handler log level value.
+        @return: Position of the log.
+        """
+
+        log_level_value = handler.log_level.value
+        depth_position = depth_position_dict.get(log_level_value)
+
+        if depth_position is None:
+            depth_position = self.__span_tracker.update(log_level_value)
+            depth_position_dict[log_level_value] = depth_position
+
+        return depth_position
+
+    def __get_depth_position(
+            self,
+            handler: LoggerStreamHandlerBase,
+            stack_capture: StackCapture,
+            manual_depth: ManualDepthEnum,
+            depth_position_dict: dict[tuple, DepthPosition]) \
+            -> Optional[DepthPosition]:
+        """
+        Get position of the log in the log tree of the stream handler.
+
+        @param handler: Stream handler.
+        @param stack_capture: Capture of the log call.
+        @param manual_depth: Manual depth.
+        @param depth_position_dict:
+            Positions that were already computed for this log,
+            by stream handler depth key.
+        @return: Position of the log,
+            or None if the stream handler keeps its own log tree.
+        """
+
+        if handler.loggers_amount > 1:
+            return None
+
+        depth_key = handler.depth_key
+        depth_position = depth_position_dict.get(depth_key)
+
+        if depth_position is None:
+            depth_position = \
+                self._get_depth_tracker(handler).update(
+                    stack_capture.frame_name_list, manual_depth.value)
+            depth_position_dict[depth_key] = depth_position
+
+        return depth_position
+
+    def __get_depth_trackers(self) -> list[DepthTrackerBase]:
+        depth_tracker_dict = {}
+
+        for handler in self.__stream_handler_list:
+            if handler.loggers_amount <= 1:
+                depth_tracker_dict[handler.depth_key] = \
+                    self._get_depth_tracker(handler)
+
+        return list(depth_tracker_dict.values())
+
+    def __get_shared_stream_handlers(self) -> list[LoggerStreamHandlerBase]:
+        return [
+            handler for handler in self.__stream_handler_list
+            if handler.loggers_amount > 1
+        ]
+
+    def __get_stream_handlers(
+            self, log_level: LogLevelEnum) \
+            -> tuple[LoggerStreamHandlerBase, ...]:
+
+        return self.__handler_dispatch_dict[log_level.value]
+
     def __update_stream_handlers_log_level(self, log_level: LogLevelEnum):
         for sh in self.__stream_handler_list:
             sh.log_level = log_level
@@ -185,3 +757,163 @@ class NrtLogger:
             raise RuntimeError(
                 'Unable write to logs'
                 ' if no stream handler attached to logger')
+
+    @classmethod
+    def __create_msg(
+            cls,
+            msg: Union[str, Callable[[], str]],
+            args: tuple) -> str:
+        """
+        Create message of lazy log.
+
+        @param msg: Message, printf-style format,
+            or callable that returns the message.
+        @param args: printf-style arguments.
+            Single mapping argument is used for named format keys.
+        @return: Message.
+        """
+
+        if callable(msg):
+            msg = msg()
+
+        if args:
+            if len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+                args = args[0]
+
+            msg = msg % args
+
+        return msg
+
+
+def _disabled_log(msg=None, *args, **kwargs):
+    """
+    Log method of log level that is not written.
+    First argument is named, so most calls do not pack arguments.
+    """
+
+
+class LogSpan:
+    """
+    Context manager of logger span.
+    """
+
+    __logger: NrtLogger
+    __msg: str
+    __log_level: LogLevelEnum
+    __start_depth: int
+    __token_list: list[Token]
+
+    def __init__(
+            self,
+            logger: NrtLogger,
+            msg: str,
+            log_level: LogLevelEnum = LogLevelEnum.INFO,
+            start_depth: int = 0):
+        """
+        Constractor.
+
+        @param logger: Logger.
+        @param msg: Span message.
+        @param log_level: Span message log level.
+        @param start_depth:
+            Depth of the frame that the span message is logged from,
+            relative to the frame of the with statement.
+        """
+
+        self.__logger = logger
+        self.__msg = msg
+        self.__log_level = log_level
+        self.__start_depth = start_depth
+        self.__token_list = []
+
+    def __enter__(self) -> 'LogSpan':
+        # skipcq: PYL-W0212
+        self.__token_list.append(
+            self.__logger._enter_span(
+                self.__msg, self.__log_level, self.__start_depth + 1))
+        return self
+
+    def __exit__(self, *args):
+        # skipcq: PYL-W0212
+        self.__logger._exit_span(self.__token_list.pop())
+
+
+class LogDepth:
+    """
+    Context manager of logger depth.
+    """
+
+    __logger: NrtLogger
+    __depth_id_list: list[Union[str, Token, None]]
+
+    def __init__(self, logger: NrtLogger):
+        self.__logger = logger
+        self.__depth_id_list = []
+
+    def __enter__(self) -> 'LogDepth':
+        # skipcq: PYL-W0212
+        self.__depth_id_list.append(self.__logger._enter_depth(1))
+        return self
+
+    def __exit__(self, *args):
+        # skipcq: PYL-W0212
+        self.__logger._exit_depth(self.__depth_id_list.pop())
+
+
+class LogResumableSpan:
+    """
+    Context manager of logger span that is entered
+    each time traced generator is resumed.
+    The span message is logged only on the first enter,
+    and next enters resume the same span.
+    """
+
+    __logger: NrtLogger
+    __msg: str
+    __log_level: LogLevelEnum
+    __start_depth: int
+    __span: Optional[Span]
+    __token_list: list[Token]
+
+    def __init__(
+            self,
+            logger: NrtLogger,
+            msg: str,
+            log_level: LogLevelEnum = LogLevelEnum.INFO,
+            start_depth: int = 0):
+        """
+        Constractor.
+
+        @param logger: Logger.
+        @param msg: Span message.
+        @param log_level: Span message log level.
+        @param start_depth:
+            Depth of the frame that the span message is logged from,
+            relative to the frame of the with statement.
+        """
+
+        self.__logger = logger
+        self.__msg = msg
+        self.__log_level = log_level
+        self.__start_depth = start_depth
+        self.__span = None
+        self.__token_list = []
+
+    def __enter__(self) -> 'LogResumableSpan':
+        if self.__span is None:
+            # skipcq: PYL-W0212
+            self.__token_list.append(
+                self.__logger._enter_span(
+                    self.__msg, self.__log_level, self.__start_depth + 1))
+            # skipcq: PYL-W0212
+            self.__span = self.__logger._get_span()
+        else:
+            # skipcq: PYL-W0212
+            self.__token_list.append(
+                self.__logger._resume_span(self.__span))
+
+        return self
+
+    def __exit__(self, *args):
+        # skipcq: PYL-W0212
+        self.__logger._exit_span(self.__token_list.pop())
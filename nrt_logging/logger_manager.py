@@ -41,6 +41,10 @@ class NrtLoggerManager:
         for name in logger_dict:
             self.close_logger(name)
 
+    def flush(self):
+        for logger in self.__loggers_dict.values():
+            logger.flush()
+
     def set_config(
             self, file_path: str = None, config: dict = None):
 
@@ -137,6 +141,20 @@ class NrtLoggerManager:
             sh, stream_handler_config, logger_config)
         self.__update_stream_handler_is_zip_from_config(
             sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_rotation_interval_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_archive_partition_format_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_buffer_size_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_flush_interval_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_flush_log_level_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_max_depth_from_config(
+            sh, stream_handler_config, logger_config)
+        self.__update_stream_handler_depth_overflow_policy_from_config(
+            sh, stream_handler_config, logger_config)
 
         if stream_handler_config.file_path is not None:
             sh.file_path = stream_handler_config.file_path
@@ -285,6 +303,111 @@ class NrtLoggerManager:
         if is_zip is not None:
             sh.is_zip = is_zip
 
+    def __update_stream_handler_rotation_interval_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        rotation_interval = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.ROTATION_INTERVAL,
+                stream_handler_config,
+                logger_config)
+
+        if rotation_interval is not None:
+            sh.rotation_interval = rotation_interval
+
+    def __update_stream_handler_archive_partition_format_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        archive_partition_format = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.ARCHIVE_PARTITION_FORMAT,
+                stream_handler_config,
+                logger_config)
+
+        if archive_partition_format is not None:
+            sh.archive_partition_format = archive_partition_format
+
+    def __update_stream_handler_buffer_size_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        buffer_size = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.BUFFER_SIZE,
+                stream_handler_config,
+                logger_config)
+
+        if buffer_size is not None:
+            sh.buffer_size = buffer_size
+
+    def __update_stream_handler_flush_interval_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        flush_interval = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.FLUSH_INTERVAL,
+                stream_handler_config,
+                logger_config)
+
+        if flush_interval is not None:
+            sh.flush_interval = flush_interval
+
+    def __update_stream_handler_flush_log_level_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        flush_log_level = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.FLUSH_LOG_LEVEL,
+                stream_handler_config,
+                logger_config)
+
+        if flush_log_level is not None:
+            sh.flush_log_level = flush_log_level
+
+    def __update_stream_handler_max_depth_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        max_depth = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.MAX_DEPTH,
+                stream_handler_config,
+                logger_config)
+
+        if max_depth is not None:
+            sh.max_depth = max_depth
+
+    def __update_stream_handler_depth_overflow_policy_from_config(
+            self,
+            sh: LoggerStreamHandlerBase,
+            stream_handler_config: StreamHandlerConfig,
+            logger_config: LoggerConfig):
+
+        depth_overflow_policy = \
+            self.__get_inherited_property_from_config(
+                ConfigBase.DEPTH_OVERFLOW_POLICY,
+                stream_handler_config,
+                logger_config)
+
+        if depth_overflow_policy is not None:
+            sh.depth_overflow_policy = depth_overflow_policy
+
     def __get_inherited_property_from_config(
             self,
             property_name: str,
@@ -1,23 +1,30 @@
+import atexit
 import ntpath
 import os
 import sys
-import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from glob import glob
-from inspect import stack, FrameInfo
-from os.path import exists, getsize
-from threading import Lock
+from threading import Event, Lock
 from threading import Thread
-from typing import IO, Optional, Union
+from time import monotonic, time
+from typing import IO, NamedTuple, Optional, Union
+from weakref import WeakSet
 from zipfile import ZipFile, ZIP_DEFLATED
 
+from nrt_logging.async_writer import \
+    AsyncWriter, LogRecord, QueueFullPolicyEnum, DEFAULT_DROP_LOG_LEVEL, \
+    DEFAULT_QUEUE_FULL_POLICY, DEFAULT_QUEUE_SIZE
+from nrt_logging.depth_tracker import \
+    DepthOverflowPolicyEnum, DepthPosition, DepthTrackerBase, \
+    create_depth_tracker, DEFAULT_DEPTH_OVERFLOW_POLICY
 from nrt_logging.exceptions import NotImplementedCodeException
 from nrt_logging.log_format import \
-    LogElementEnum, LogDateFormat, LogYamlElements
+    LogElementEnum, LogDateFormat, LogLineTemplate, LogYamlElements, \
+    LogYamlTemplate
 from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.stack_capture import StackCapture
 
 
 class StreamHandlerEnum(Enum):
@@ -54,13 +61,6 @@ class ManualDepthEnum(Enum):
     INCREASE = 1
 
 
-@dataclass
-class DepthData:
-    name: str
-    manual_depth_change: int = 0
-    total_manual_depth: int = 0
-
-
 DEFAULT_LOG_STYLE = LogStyleEnum.LINE
 DEFAULT_LOG_LEVEL = LogLevelEnum.INFO
 
@@ -142,8 +142,149 @@ class FileSizeEnum(Enum):
         return num
 
 
+class RotationIntervalEnum(Enum):
+    """
+    Log file rotation interval in seconds.
+    """
+
+    HOURLY = 60 * 60
+    DAILY = 24 * 60 * 60
+
+    @property
+    def seconds(self) -> int:
+        return self._value_
+
+    @classmethod
+    def build(cls, name: str):
+        name_u = name.upper()
+
+        for rotation_interval_enum in cls:
+            if name_u == rotation_interval_enum.name:
+                return rotation_interval_enum
+
+        raise ValueError(f'[{name}] is not valid rotation interval name')
+
+    @classmethod
+    def get_seconds(cls, rotation_interval: Union[str, int]) -> int:
+        """
+        @param rotation_interval: Rotation interval name (hourly, daily),
+            or custom rotation interval in seconds.
+        @return: Rotation interval in seconds.
+        """
+
+        if isinstance(rotation_interval, str):
+            if not rotation_interval.isdigit():
+                return cls.build(rotation_interval).seconds
+
+            rotation_interval = int(rotation_interval)
+
+        if rotation_interval <= 0:
+            raise ValueError(
+                f'Rotation interval [{rotation_interval}]'
+                f' must be bigger from 0')
+
+        return rotation_interval
+
+
 DEFAULT_MAX_FILE_SIZE = 10 * FileSizeEnum.MB.bytes
 DEFAULT_FILES_AMOUNT = 10
+DEFAULT_BUFFER_SIZE = 0
+# Milliseconds
+DEFAULT_FLUSH_INTERVAL = 1000
+DEFAULT_FLUSH_LOG_LEVEL = LogLevelEnum.ERROR
+# Milliseconds
+DEFAULT_FILE_CHECK_INTERVAL = 1000
+
+
+class DepthIndentation(NamedTuple):
+    """
+    Indentation strings of log records in one depth.
+    """
+
+    # Indentation of log record elements
+    spaces: str
+    # Line before the first child log record
+    children_header: str
+    # New line and indentation of multiline message or log line
+    multiline_separator: str
+    # Start of LINE style log record
+    line_prefix: str
+
+
+class IndentationTable:
+    """
+    Indentation strings of one log style, indexed by depth.
+
+    Depths are added on first use, and the strings of a depth
+    are created once, so deep and shallow log records cost the same.
+    """
+
+    __LINE_PREFIX = '- log: '
+    __CHILDREN_HEADER = 'children:'
+
+    __style: LogStyleEnum
+    __spaces_separator: str
+    __children_spaces_separator: str
+    # Replaced by a longer list when it grows, so threads that read
+    # the list while it grows read a complete list
+    __depth_indentation_list: list[DepthIndentation]
+
+    def __init__(
+            self,
+            style: LogStyleEnum,
+            spaces_separator: str,
+            children_spaces_separator: str):
+
+        self.__style = style
+        self.__spaces_separator = spaces_separator
+        self.__children_spaces_separator = children_spaces_separator
+        self.__depth_indentation_list = []
+
+    def get(self, depth: int) -> DepthIndentation:
+        depth_indentation_list = self.__depth_indentation_list
+
+        if depth < len(depth_indentation_list):
+            return depth_indentation_list[depth]
+
+        depth_indentation_list = \
+            depth_indentation_list \
+            + [
+                self.__create_depth_indentation(d)
+                for d in range(len(depth_indentation_list), depth + 1)
+            ]
+        self.__depth_indentation_list = depth_indentation_list
+
+        return depth_indentation_list[depth]
+
+    @property
+    def style(self) -> LogStyleEnum:
+        return self.__style
+
+    @property
+    def depths_amount(self) -> int:
+        return len(self.__depth_indentation_list)
+
+    def __create_depth_indentation(self, depth: int) -> DepthIndentation:
+        spaces = f'{self.__spaces_separator}  ' * depth
+        children_header = \
+            f'{self.__children_spaces_separator * max(depth - 1, 0)}' \
+            f'{self.__CHILDREN_HEADER}'
+
+        if self.__style == LogStyleEnum.YAML:
+            multiline_separator = f'\n{spaces}{self.__spaces_separator}'
+        elif self.__style == LogStyleEnum.LINE:
+            children_header = f'{self.__spaces_separator}{children_header}'
+            multiline_separator = \
+                f'\n{spaces}{self.__children_spaces_separator}'
+        else:
+            raise NotImplementedCodeException()
+
+        return \
+            DepthIndentation(
+                spaces,
+                children_header,
+                multiline_separator,
+                f'{spaces}{self.__LINE_PREFIX}')
 
 
 class LoggerStreamHandlerBase(ABC):
@@ -160,8 +301,8 @@ class LoggerStreamHandlerBase(ABC):
         f':{LogElementEnum.LINE_NUMBER.line_format}]' \
         f' {LogElementEnum.MESSAGE.line_format}'
 
-    _CLEAN_THREADS_DICTS = 100
-    __CLEAN_THREADS_COUNT = 2000
+    # _log or _snapshot <- log method <- caller
+    __CALLER_STACK_DEPTH = 2
 
     __SNAPSHOT_SEPERATOR = \
         '====================================' \
@@ -174,35 +315,40 @@ class LoggerStreamHandlerBase(ABC):
 
     _lock: Lock
 
-    __clean_threads_counter: int
-    _stack_log_start_index: int
-    __stack_log_increase_start_index: int
-    __stack_log_decrease_start_index: int
     _log_level: Optional[LogLevelEnum] = None
     _style: Optional[LogStyleEnum] = None
     _name: Optional[str] = None
     _log_line_template: Optional[str] = None
-
-    # {Thread Id: depth}
-    _depth_dict: dict[int, int]
-    # {Thread Id: list}
-    _depth_list_dict: dict[int, list[DepthData]]
-    # {Thread Id: list}
-    _increase_depth_list_dict: dict[int, list[str]]
-    _decrease_depth_list_dict: dict[int, list[str]]
+    _compiled_log_line_template: Optional[LogLineTemplate] = None
+    _indentation_table_dict: dict[LogStyleEnum, IndentationTable]
+    # (YAML elements, {(Depth, Is child): YAML template})
+    _yaml_template_cache: \
+        tuple[Optional[tuple], dict[tuple[int, bool], LogYamlTemplate]]
+
+    _is_context_depth: bool = False
+    _max_depth: Optional[int] = None
+    _depth_overflow_policy: DepthOverflowPolicyEnum = \
+        DEFAULT_DEPTH_OVERFLOW_POLICY
+    _depth_tracker: DepthTrackerBase
+    # {Call site of log that was deeper than max depth: Amount of logs}
+    _depth_overflow_dict: dict[str, int]
+    _loggers_amount: int
+    # Loggers that dispatch logs to the stream handler by its log level
+    _logger_set: WeakSet
+    # All the stream handlers,
+    # so set_log_level updates the dispatch of their loggers
+    _stream_handler_set: WeakSet = WeakSet()
+
+    _async_writer: Optional[AsyncWriter] = None
+    _queue_size: int = DEFAULT_QUEUE_SIZE
+    _queue_full_policy: QueueFullPolicyEnum = DEFAULT_QUEUE_FULL_POLICY
+    _drop_log_level: LogLevelEnum = DEFAULT_DROP_LOG_LEVEL
+    # Dropped records of stopped async writers
+    _dropped_records_amount: int = 0
 
     _is_debug: bool = False
 
-    def __init__(
-            self,
-            stack_log_start_index: int,
-            stack_log_increase_start_index: int = 3,
-            stack_log_decrease_start_index: int = 3):
-
-        self._stack_log_start_index = stack_log_start_index
-        self.__stack_log_increase_start_index = stack_log_increase_start_index
-        self.__stack_log_decrease_start_index = stack_log_decrease_start_index
-
+    def __init__(self):
         if self._log_level is None:
             self._log_level = DEFAULT_LOG_LEVEL
 
@@ -212,116 +358,157 @@ class LoggerStreamHandlerBase(ABC):
         if self._log_line_template is None:
             self._log_line_template = self.LOG_LINE_DEFAULT_TEMPLATE
 
+        self._compiled_log_line_template = \
+            LogLineTemplate(self._log_line_template)
+
         if self._log_date_format is None:
             self._log_date_format = LogDateFormat()
 
         if self._log_yaml_elements is None:
             self._log_yaml_elements = LogYamlElements()
 
-        thread_id = threading.get_ident()
-        self._depth_dict = {thread_id: 0}
-        self._depth_list_dict = {thread_id: []}
-        self._increase_depth_list_dict = {thread_id: []}
-        self._decrease_depth_list_dict = {thread_id: []}
-        self.__clean_threads_counter = 0
+        self._yaml_template_cache = (None, {})
+        self._indentation_table_dict = {
+            style: IndentationTable(
+                style,
+                self.YAML_SPACES_SEPARATOR,
+                self.YAML_CHILDREN_SPACES_SEPARATOR)
+            for style in LogStyleEnum
+        }
+
+        self._depth_tracker = \
+            create_depth_tracker(
+                self._is_context_depth,
+                self._max_depth,
+                self._depth_overflow_policy)
+        self._depth_overflow_dict = {}
+        self._loggers_amount = 0
+        self._logger_set = WeakSet()
+        self._stream_handler_set.add(self)
         self._lock = Lock()
 
     @abstractmethod
     def critical(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def error(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def warn(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def info(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def debug(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def trace(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def snapshot(
             self,
             methods_depth: int = SNAPSHOT_METHODS_DEPTH,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
         raise NotImplementedCodeException
 
     @abstractmethod
     def close(self):
         raise NotImplementedCodeException
 
-    def increase_depth(self):
-        with self._lock:
-            stack_str_list, _ = \
-                self.__get_stack_list(
-                    start_index=self.__stack_log_increase_start_index)
+    def flush(self):
+        """
+        Write buffered log records to the stream.
+        """
 
-            thread_id = threading.get_ident()
+        self._join_async_writer()
 
-            self.__add_new_thread_id_to_dicts(thread_id)
+        with self._lock:
+            self._flush()
 
-            self._increase_depth_list_dict[thread_id].append(
-                stack_str_list[0])
+    def log(
+            self,
+            log_level: LogLevelEnum,
+            msg: str,
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+        """
+        Log message.
 
-    def decrease_depth(self, level: int = 1):
-        if level < 1:
-            return
+        @param log_level: Message log level.
+        @param msg: Message.
+        @param manual_depth: Manual depth.
+        @param stack_capture:
+            Capture of the log call.
+            If None then the stack of the caller will be captured.
+        @param depth_position:
+            Position of the log in the log tree.
+            If None then the position is updated in the stream handler
+            depth tracker.
+        """
 
-        with self._lock:
-            stack_str_list, _ = \
-                self.__get_stack_list(
-                    start_index=self.__stack_log_decrease_start_index)
+        self._log(
+            log_level,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture,
+            depth_position=depth_position)
 
-            fm_name = stack_str_list[0]
-            drop_list = []
+    def increase_depth(self, fm_name: Optional[str] = None):
+        """
+        Next logs in the calling method will be children of the latest log.
 
-            thread_id = threading.get_ident()
+        @param fm_name:
+            Frame name of the calling method.
+            If None then it is taken from the caller frame.
+        """
 
-            self.__add_new_thread_id_to_dicts(thread_id)
+        if fm_name is None:
+            fm_name = StackCapture.get_frame_name(1)
 
-            for i, depth in enumerate(
-                    reversed(self._depth_list_dict[thread_id])):
-                if depth.name == fm_name and depth.manual_depth_change == 1:
-                    level -= 1
-                    drop_list.append(
-                        len(self._depth_list_dict[thread_id]) - 1 - i)
+        self._depth_tracker.increase_depth(fm_name)
 
-                    if self._depth_dict[thread_id] > 0:
-                        self._depth_dict[thread_id] -= 1
+    def decrease_depth(self, level: int = 1, fm_name: Optional[str] = None):
+        if level < 1:
+            return
 
-            for drop_index in drop_list:
-                self._depth_list_dict[thread_id].pop(drop_index)
+        if fm_name is None:
+            fm_name = StackCapture.get_frame_name(1)
 
-            self._decrease_depth_list_dict[thread_id].append(fm_name)
+        self._depth_tracker.decrease_depth(fm_name)
 
     @property
     def name(self) -> str:
@@ -338,6 +525,7 @@ class LoggerStreamHandlerBase(ABC):
     @style.setter
     def style(self, style: LogStyleEnum):
         self._style = style
+        self._update_loggers_log_dispatch()
 
     @property
     def log_level(self) -> LogLevelEnum:
@@ -346,6 +534,7 @@ class LoggerStreamHandlerBase(ABC):
     @log_level.setter
     def log_level(self, log_level: LogLevelEnum):
         self._log_level = log_level
+        self._update_loggers_log_dispatch()
 
     @property
     def log_date_format(self) -> LogDateFormat:
@@ -366,6 +555,7 @@ class LoggerStreamHandlerBase(ABC):
             Union[LogYamlElements, list[LogElementEnum], set[LogElementEnum]]):
 
         self._log_yaml_elements = LogYamlElements.build(log_yaml_elements)
+        self._update_loggers_log_dispatch()
 
     @property
     def log_line_template(self) -> str:
@@ -374,6 +564,198 @@ class LoggerStreamHandlerBase(ABC):
     @log_line_template.setter
     def log_line_template(self, log_line_template: str):
         self._log_line_template = log_line_template
+        self._compiled_log_line_template = \
+            LogLineTemplate(log_line_template)
+        self._update_loggers_log_dispatch()
+
+    @property
+    def is_date(self) -> bool:
+        """
+        True if log records of the stream handler have date,
+        so loggers capture the date only if a stream handler writes it.
+        """
+
+        if self.style == LogStyleEnum.YAML:
+            return \
+                LogElementEnum.DATE in self.log_yaml_elements.yaml_elements
+
+        return self.__get_compiled_log_line_template().is_date
+
+    @property
+    def is_context_depth(self) -> bool:
+        return self._is_context_depth
+
+    @is_context_depth.setter
+    def is_context_depth(self, is_context_depth: bool):
+        """
+        Keep log depth per context (contextvars) instead of per thread,
+        so each asyncio task has its own log tree.
+        Log depth of the current trees is reset.
+
+        @param is_context_depth: True for depth per context,
+            False for depth per thread.
+        """
+
+        with self._lock:
+            self._is_context_depth = is_context_depth
+            self._depth_tracker = \
+                create_depth_tracker(
+                    is_context_depth,
+                    self._max_depth,
+                    self._depth_overflow_policy)
+
+    @property
+    def max_depth(self) -> Optional[int]:
+        return self._max_depth
+
+    @max_depth.setter
+    def max_depth(self, max_depth: Optional[int]):
+        """
+        Limit depth of the log trees, so unbalanced increase_depth calls
+        and deep recursion do not grow the log tree path without limit.
+        Logs that are deeper than max depth are written
+        according to the depth overflow policy.
+
+        @param max_depth: Max depth. None for unlimited depth.
+        """
+
+        self._depth_tracker.max_depth = max_depth
+        self._max_depth = max_depth
+
+    @property
+    def depth_overflow_policy(self) -> DepthOverflowPolicyEnum:
+        return self._depth_overflow_policy
+
+    @depth_overflow_policy.setter
+    def depth_overflow_policy(
+            self, depth_overflow_policy: DepthOverflowPolicyEnum):
+
+        self._depth_tracker.overflow_policy = depth_overflow_policy
+        self._depth_overflow_policy = depth_overflow_policy
+
+    @property
+    def depth_overflow_dict(self) -> dict[str, int]:
+        """
+        Amount of logs that were deeper than max depth,
+        by call site ('path.method:line_number').
+        """
+
+        with self._lock:
+            return dict(self._depth_overflow_dict)
+
+    @property
+    def depth_overflow_amount(self) -> int:
+        return sum(self.depth_overflow_dict.values())
+
+    @property
+    def depth_key(self) -> tuple:
+        """
+        Stream handlers with the same depth key in the same logger
+        get the same records, so they have the same log trees.
+        """
+
+        return \
+            self._log_level, \
+            self._is_context_depth, \
+            self._max_depth, \
+            self._depth_overflow_policy
+
+    @property
+    def async_mode(self) -> bool:
+        return self._async_writer is not None
+
+    @async_mode.setter
+    def async_mode(self, async_mode: bool):
+        """
+        Write log records in a writer thread.
+        Threads that log only create the log string
+        and put it in a bounded queue.
+        When the queue is full, queue_full_policy is applied.
+
+        @param async_mode: True for writer thread,
+            False for writing in the thread that logs.
+            Records in the queue are written before async mode is off.
+        """
+
+        if async_mode:
+            if self._async_writer is None:
+                self.__start_async_writer()
+        else:
+            self._stop_async_writer()
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue_size
+
+    @queue_size.setter
+    def queue_size(self, queue_size: int):
+        if queue_size <= 0:
+            raise ValueError('Queue size must be bigger from 0')
+
+        self._queue_size = queue_size
+
+        if self._async_writer is not None:
+            # Restart async writer with the new queue size
+            self._stop_async_writer()
+            self.__start_async_writer()
+
+    @property
+    def queue_full_policy(self) -> QueueFullPolicyEnum:
+        return self._queue_full_policy
+
+    @queue_full_policy.setter
+    def queue_full_policy(self, queue_full_policy: QueueFullPolicyEnum):
+        self._queue_full_policy = queue_full_policy
+        async_writer = self._async_writer
+
+        if async_writer is not None:
+            async_writer.queue_full_policy = queue_full_policy
+
+    @property
+    def drop_log_level(self) -> LogLevelEnum:
+        return self._drop_log_level
+
+    @drop_log_level.setter
+    def drop_log_level(self, drop_log_level: LogLevelEnum):
+        """
+        @param drop_log_level: Log records below this log level
+            are dropped when the queue is full,
+            if queue_full_policy is DROP_BELOW_LEVEL.
+        """
+
+        self._drop_log_level = drop_log_level
+        async_writer = self._async_writer
+
+        if async_writer is not None:
+            async_writer.drop_log_level = drop_log_level
+
+    @property
+    def dropped_records_amount(self) -> int:
+        """
+        Amount of log records that were dropped
+        because the queue of async mode was full.
+        """
+
+        async_writer = self._async_writer
+
+        if async_writer is None:
+            return self._dropped_records_amount
+
+        return \
+            self._dropped_records_amount \
+            + async_writer.dropped_records_amount
+
+    @property
+    def loggers_amount(self) -> int:
+        """
+        Amount of loggers that the stream handler is added to.
+        """
+
+        return self._loggers_amount
+
+    @loggers_amount.setter
+    def loggers_amount(self, loggers_amount: int):
+        self._loggers_amount = loggers_amount
 
     @property
     def is_debug(self) -> bool:
@@ -386,85 +768,185 @@ class LoggerStreamHandlerBase(ABC):
     def _snapshot(
             self,
             methods_depth: int,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
 
         if methods_depth < 1:
             raise ValueError(
                 f'Logger methods_depth value [{methods_depth}]'
                 f' cannot be less than 1')
 
-        stack_log_start_index = self._stack_log_start_index - 1
-
-        stack_str_list, stack_list = \
-            self.__get_stack_list(start_index=stack_log_start_index)
-
-        with self._lock:
-            snapshot_str = \
-                self.__SNAPSHOT_SEPERATOR.join(
-                    [self.__get_method_snapshot(
-                        stack_str_list[i], stack_list[i])
-                        for i in range(min(methods_depth, len(stack_list)))])
-
-            stack_log_start_index = self._stack_log_start_index
-            self._stack_log_start_index += 1
+        if LogLevelEnum.TRACE < self.log_level:
+            return
 
-            try:
-                self._log(
-                    LogLevelEnum.TRACE,
-                    f'\n{snapshot_str}',
-                    manual_depth,
-                    is_lock=False)
-            finally:
-                self._stack_log_start_index = stack_log_start_index
+        if stack_capture is None:
+            stack_capture = \
+                StackCapture.build(
+                    self.__CALLER_STACK_DEPTH,
+                    methods_depth,
+                    is_date=self.is_date)
+
+        snapshot_str = \
+            self.__SNAPSHOT_SEPERATOR.join(
+                [self.__get_method_snapshot(frame_name, f_locals)
+                 for frame_name, f_locals in zip(
+                    stack_capture.frame_name_list,
+                    stack_capture.f_locals_list)])
+
+        self._log(
+            LogLevelEnum.TRACE,
+            f'\n{snapshot_str}',
+            manual_depth,
+            stack_capture=stack_capture,
+            depth_position=depth_position)
 
     def _log(
             self,
             log_level: LogLevelEnum,
             msg: str,
             manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
-            is_lock: bool = True):
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+        """
+        Depth of the log is kept per thread (or per context),
+        so the log string is created without lock,
+        and the lock is held only while the log string is written.
+        """
 
         if log_level >= self.log_level:
-            stack_str_list, stack_list = \
-                self.__get_stack_list(start_index=self._stack_log_start_index)
+            if stack_capture is None:
+                stack_capture = \
+                    StackCapture.build(
+                        self.__CALLER_STACK_DEPTH, is_date=self.is_date)
+
+            stack_str_list = stack_capture.frame_name_list
+            msg = self._encode_msg(msg)
+
+            if isinstance(msg, bytes):
+                msg = msg.decode('utf-8')
+
+            if self.is_debug:
+                msg += self.__add_debug_to_message()
+
+            if depth_position is None:
+                depth_position = \
+                    self._depth_tracker.update(
+                        stack_str_list, manual_depth.value)
+
+            log_str = \
+                self.__create_log_str(
+                    msg, log_level, stack_capture, depth_position)
+
+            async_writer = self._async_writer
+
+            # Log record is written here if async mode was stopped
+            # after the async writer was read
+            if async_writer is not None \
+                    and async_writer.put(LogRecord(log_str, log_level)):
+                if depth_position.is_overflow:
+                    with self._lock:
+                        self.__count_depth_overflow(stack_capture)
+            else:
+                with self._lock:
+                    if depth_position.is_overflow:
+                        self.__count_depth_overflow(stack_capture)
 
-            try:
-                self._lock.acquire(is_lock)
+                    self._write(log_str, log_level)
+
+    def _encode_msg(self, msg: str) -> str:
+        """
+        Hook for stream handlers that cannot write any message as is.
+
+        @param msg: Message.
+        @return: Message that can be written to the stream.
+        """
 
-                if isinstance(msg, bytes):
-                    msg = msg.decode('utf-8')
+        return msg
 
-                if self.is_debug:
-                    msg += self.__add_debug_to_message()
+    def _write(self, log_str: str, log_level: LogLevelEnum):
+        self._stream.write(f'{log_str}\n')
 
-                thread_id = threading.get_ident()
+    def _write_batch(self, log_record_list: list[LogRecord]):
+        """
+        Write log records with a single write to the stream.
+        """
 
-                self.__add_new_thread_id_to_dicts(thread_id)
+        log_str_list = [log_record.log_str for log_record in log_record_list]
+        # Empty string adds the new line of the last log record
+        log_str_list.append('')
+        self._stream.write('\n'.join(log_str_list))
 
-                manual_depth = \
-                    self.__update_manual_depth(
-                        stack_str_list[0], manual_depth, thread_id)
+    def _flush(self):
+        if self._stream is not None:
+            self._stream.flush()
 
-                log_str = \
-                    self.__create_log_str(
-                        msg,
-                        log_level,
-                        stack_str_list,
-                        stack_list,
-                        manual_depth,
-                        thread_id)
+    def _update_loggers_log_dispatch(self):
+        """
+        Update log dispatch of the loggers of the stream handler,
+        after a change in the log records that it writes.
+        """
 
-                self._stream.write(f'{log_str}\n')
-                self.__clean_threads_dicts()
-            finally:
-                if is_lock:
-                    self._lock.release()
+        for logger in list(self._logger_set):
+            # skipcq: PYL-W0212
+            logger._update_log_dispatch()
 
-    def __get_method_snapshot(
-            self, frame_name: str, frame_info: FrameInfo) -> str:
+    @classmethod
+    def _update_class_loggers_log_dispatch(cls):
+        """
+        Update log dispatch of the loggers of the stream handlers
+        of the class, after a change in the class defaults.
+        """
+
+        for stream_handler in list(cls._stream_handler_set):
+            if isinstance(stream_handler, cls):
+                stream_handler._update_loggers_log_dispatch()
+
+    def _join_async_writer(self):
+        async_writer = self._async_writer
+
+        if async_writer is not None:
+            async_writer.join()
+
+    def _stop_async_writer(self):
+        """
+        Write log records that are in the queue
+        and stop the writer thread. Async mode is off.
+        """
+
+        async_writer = self._async_writer
+
+        if async_writer is not None:
+            self._async_writer = None
+            async_writer.stop()
+            self._dropped_records_amount += \
+                async_writer.dropped_records_amount
+
+    def __write_batch(self, log_record_list: list[LogRecord]):
+        with self._lock:
+            self._write_batch(log_record_list)
+
+    def __start_async_writer(self):
+        async_writer = \
+            AsyncWriter(
+                self.__write_batch,
+                self._queue_size,
+                queue_full_policy=self._queue_full_policy,
+                drop_log_level=self._drop_log_level)
+        async_writer.start()
+        self._async_writer = async_writer
+
+    def __count_depth_overflow(self, stack_capture: StackCapture):
+        call_site = stack_capture.call_site
+        call_site_str = \
+            f'{call_site.path}.{call_site.method}:{call_site.line_number}'
+        self._depth_overflow_dict[call_site_str] = \
+            self._depth_overflow_dict.get(call_site_str, 0) + 1
+
+    def __get_method_snapshot(self, frame_name: str, f_locals: dict) -> str:
         return \
             f'Frame: {frame_name}\n' \
-            f'{self.__get_f_locals_snapshot(frame_info.frame.f_locals)}'
+            f'{self.__get_f_locals_snapshot(f_locals)}'
 
     def __get_f_locals_snapshot(self, f_locals: dict):
         f_locals_str = \
@@ -496,482 +978,205 @@ class LoggerStreamHandlerBase(ABC):
 
         return self_str
 
-    def __get_latest_fm_depth(
-            self, fm_name: str, thread_id: int) -> Optional[DepthData]:
-        for fm_depth in reversed(self._depth_list_dict[thread_id]):
-            if fm_name == fm_depth.name:
-                return fm_depth
-
-        return None
-
     def __create_log_str(
             self,
             msg: str,
             log_level: LogLevelEnum,
-            stack_str_list: list[str],
-            stack_list: list[FrameInfo],
-            manual_depth: ManualDepthEnum,
-            thread_id: int):
-        if self._depth_list_dict.get(thread_id):
-            return \
-                self.__create_log_str_on_depth_plus(
-                    msg,
-                    log_level,
-                    stack_str_list,
-                    stack_list,
-                    manual_depth,
-                    thread_id)
-
-        return \
-            self.__create_log_str_on_depth_0(
-                msg, log_level, stack_str_list, stack_list, thread_id)
-
-    def __update_manual_depth(
-            self,
-            fm_name: str,
-            manual_depth: ManualDepthEnum,
-            thread_id: int):
-
-        if manual_depth == ManualDepthEnum.NO_CHANGE \
-                and fm_name in self._increase_depth_list_dict[thread_id]:
-            self._increase_depth_list_dict[thread_id].remove(fm_name)
-            return ManualDepthEnum.INCREASE
-
-        return manual_depth
-
-    def __create_log_str_on_depth_0(
-            self,
-            msg: str,
-            log_level: LogLevelEnum,
-            stack_str_list: list[str],
-            stack_list: list[FrameInfo],
-            thread_id: int) -> str:
+            stack_capture: StackCapture,
+            depth_position: DepthPosition):
 
-        fm_name = stack_str_list[0]
+        depth = depth_position.depth
 
-        self._depth_list_dict[thread_id].append(DepthData(name=fm_name))
+        if depth_position.is_new_tree:
+            if self.style == LogStyleEnum.YAML:
+                return \
+                    self.YAML_DOCUMENT_SEPARATOR \
+                    + self.__create_yaml_elements_str(
+                        msg, log_level, False, stack_capture, depth)
 
-        if self.style == LogStyleEnum.YAML:
-            return \
-                self.YAML_DOCUMENT_SEPARATOR \
-                + self.__create_yaml_elements_str(
-                    msg, log_level, False, stack_list, thread_id)
+            if self.style == LogStyleEnum.LINE:
+                return self.__create_line_element_str(
+                    msg, log_level, False, stack_capture, depth)
 
-        if self.style == LogStyleEnum.LINE:
-            return self.__create_line_element_str(
-                msg, log_level, False, stack_list, thread_id)
+            raise NotImplementedCodeException()
 
-        raise NotImplementedCodeException()
-
-    def __create_log_str_on_depth_plus(
-            self,
-            msg: str,
-            log_level: LogLevelEnum,
-            stack_str_list: list[str],
-            stack_list: list[FrameInfo],
-            manual_depth: ManualDepthEnum,
-            thread_id: int):
-
-        fm_name = stack_str_list[0]
-        parent_stack_list = stack_str_list[1:]
-        expected_parent_fm_name = self._depth_list_dict[thread_id][-1].name
-
-        is_child = \
-            self.__update_depth(
-                fm_name,
-                stack_str_list,
-                expected_parent_fm_name,
-                parent_stack_list,
-                manual_depth,
-                thread_id)
+        is_child = depth_position.is_child
 
         return \
-            self.__create_log_str_prefix(is_child, thread_id) \
+            self.__create_log_str_prefix(is_child, depth) \
             + self.__create_log_str_suffix(
-                msg, log_level, is_child, stack_list, thread_id)
+                msg, log_level, is_child, stack_capture, depth)
 
     def __create_log_str_suffix(
             self,
             msg: str,
             log_level: LogLevelEnum,
             is_child: bool,
-            stack_list: list[FrameInfo],
-            thread_id: int):
+            stack_capture: StackCapture,
+            depth: int):
 
         if self.style == LogStyleEnum.YAML:
             return self.__create_yaml_elements_str(
-                msg, log_level, is_child, stack_list, thread_id)
+                msg, log_level, is_child, stack_capture, depth)
 
         if self.style == LogStyleEnum.LINE:
             return self.__create_line_element_str(
-                msg, log_level, is_child, stack_list, thread_id)
+                msg, log_level, is_child, stack_capture, depth)
 
         raise NotImplementedCodeException()
 
-    def __create_log_str_prefix(self, is_child: bool, thread_id: int):
+    def __create_log_str_prefix(self, is_child: bool, depth: int):
         if is_child:
-            return self.__create_prefix_log_str_for_child(thread_id)
+            return self.__get_depth_indentation(depth).children_header
 
-        if self._depth_dict[thread_id] == 0 \
+        if depth == 0 \
                 and self.style == LogStyleEnum.YAML:
             return f'{self.YAML_DOCUMENT_SEPARATOR}'
 
         return ''
 
-    def __create_prefix_log_str_for_child(self, thread_id: int):
-        depth_4_spaces = \
-            ''.join(
-                [
-                    self.YAML_CHILDREN_SPACES_SEPARATOR
-                    for _ in range(self._depth_dict[thread_id] - 1)
-                ])
-        if self.style == LogStyleEnum.YAML:
-            return f'{depth_4_spaces}children:'
-
-        if self.style == LogStyleEnum.LINE:
-            return f'{self.YAML_SPACES_SEPARATOR}{depth_4_spaces}children:'
-
-        raise NotImplementedCodeException()
-
-    def __update_depth(
-            self,
-            fm_name: str,
-            stack_list: list[str],
-            expected_parent_fm_name: str,
-            parent_stack_list: list[str],
-            manual_depth: ManualDepthEnum,
-            thread_id: int) -> bool:
-        """
-        Update log depth.
-
-        @param fm_name: Frame name.
-        @param stack_list:  Stack list.
-        @param expected_parent_fm_name: Expected parent frame name.
-        @param parent_stack_list:  parent frame stack list.
-        @param manual_depth: Manual depth.
-        @param thread_id: Thread id.
-        @return: True in case increase depth, else False.
-        """
-
-        # In case this is log in child method
-        if self.__is_increased_child_depth(
-                expected_parent_fm_name, parent_stack_list):
-            self.__update_depth_for_increased_child_depth(fm_name, thread_id)
-            return True
-
-        # In case the log is in the same method of previous log
-        if self.__is_child_in_previous_child_depth(
-                expected_parent_fm_name, stack_list):
-            is_child = \
-                self.__update_depth_for_change_in_manual_depth(
-                    fm_name, manual_depth, thread_id)
-            return is_child
-
-        # In case go up in the stack so search previous parent
-        self.__update_depth_for_go_up_in_stack(
-            stack_list, manual_depth, thread_id)
-        return False
-
-    def __update_depth_for_go_up_in_stack(
-            self,
-            stack_list: list[str],
-            manual_depth: ManualDepthEnum,
-            thread_id: int):
-
-        reverse_depth = 0
-
-        for i, parent in enumerate(
-                reversed(self._depth_list_dict[thread_id])):
-            if parent.name in stack_list:
-                self._depth_dict[thread_id] -= reverse_depth
-
-                if self._depth_dict[thread_id] < 0:
-                    self._depth_dict[thread_id] = 0
-
-                for _ in range(i):
-                    self._depth_list_dict[thread_id].pop()
-
-                if manual_depth.value:
-                    self.__update_depth_for_change_in_manual_depth(
-                        stack_list[0], manual_depth, thread_id)
-                else:
-                    self._depth_list_dict[thread_id].append(
-                        DepthData(name=stack_list[0]))
-                return
-
-            reverse_depth += parent.manual_depth_change + 1
-
-        if manual_depth.value:
-            self.__update_depth_for_change_in_manual_depth(
-                stack_list[0], manual_depth, thread_id)
-        else:
-            self._depth_list_dict[thread_id] = \
-                [DepthData(name=stack_list[0])]
-            self._depth_dict[thread_id] = 0
-
-    def __get_stack_list(
-            self, start_index: int) -> (list[str], list[FrameInfo]):
-
-        stack_str_list = []
-        stack_list = stack()[start_index:]
-
-        for sf in stack_list:
-            path, method, _ = \
-                self.__get_log_path_method_and_line_number_from_sf(sf)
-            stack_str_list.append(self.__create_fm_name(path, method))
-
-        return stack_str_list, stack_list
+    def __get_depth_indentation(self, depth: int) -> DepthIndentation:
+        return self._indentation_table_dict[self.style].get(depth)
 
     def __create_yaml_elements_str(
             self,
             msg: str,
             log_level: LogLevelEnum,
             is_child: bool,
-            stack_list: list[FrameInfo],
-            thread_id: int) -> str:
-        depth_spaces = \
-            ''.join(
-                [f'{self.YAML_SPACES_SEPARATOR}  '
-                 for _ in range(self._depth_dict[thread_id])])
+            stack_capture: StackCapture,
+            depth: int) -> str:
 
-        yaml_str = ''
+        call_site = stack_capture.call_site
 
-        if self._depth_dict[thread_id] > 0:
-            if is_child:
-                yaml_str = f'\n{depth_spaces[:-2]}- '
-            else:
-                yaml_str = f'{depth_spaces[:-2]}- '
-
-        sf = stack_list[0]
+        return \
+            self.__get_yaml_template(depth, is_child).render(
+                stack_capture.date,
+                self.log_date_format.formatter.format,
+                log_level.name,
+                call_site.path,
+                call_site.method,
+                call_site.line_number,
+                msg)
+
+    def __get_yaml_template(
+            self, depth: int, is_child: bool) -> LogYamlTemplate:
+        """
+        YAML templates are compiled once per depth,
+        and again after YAML elements are replaced.
+        """
 
-        path, method, line_number = \
-            self.__get_log_path_method_and_line_number_from_sf(sf)
+        yaml_elements = self.log_yaml_elements.yaml_elements
+        template_cache = self._yaml_template_cache
 
-        yaml_elements_str = \
-            self.__create_yaml_elements(
-                depth_spaces, log_level, path, method, line_number, msg)
+        if template_cache[0] is not yaml_elements:
+            template_cache = (yaml_elements, {})
+            self._yaml_template_cache = template_cache
 
-        if self._depth_dict[thread_id] > 0:
-            yaml_elements_str = \
-                yaml_elements_str[len(f'\n{depth_spaces[:-2]}- '):]
+        yaml_template = template_cache[1].get((depth, is_child))
 
-        return yaml_str + yaml_elements_str
+        if yaml_template is None:
+            yaml_template = \
+                self.__create_yaml_template(yaml_elements, depth, is_child)
+            template_cache[1][(depth, is_child)] = yaml_template
 
-    def __create_yaml_elements(
-            self,
-            depth_spaces: str,
-            log_level: LogLevelEnum,
-            path: str,
-            method: str,
-            line_number: str,
-            msg: str) -> str:
+        return yaml_template
 
-        return \
-            ''.join([
-                self.__create_yaml_element(
-                    yaml_element,
-                    depth_spaces,
-                    log_level,
-                    path, method,
-                    line_number,
-                    msg)
-                for yaml_element in self.log_yaml_elements.yaml_elements
-            ])
-
-    def __create_yaml_element(
+    def __create_yaml_template(
             self,
-            yaml_element: LogElementEnum,
-            depth_spaces: str,
-            log_level: LogLevelEnum,
-            path: str,
-            method: str,
-            line_number: str,
-            msg: str):
+            yaml_elements: tuple[LogElementEnum, ...],
+            depth: int,
+            is_child: bool) -> LogYamlTemplate:
 
-        if yaml_element == LogElementEnum.DATE:
-            return f'\n{self.__create_yaml_date_element(depth_spaces)}'
+        depth_indentation = \
+            self._indentation_table_dict[LogStyleEnum.YAML].get(depth)
 
-        if yaml_element == LogElementEnum.LOG_LEVEL:
-            log_level_str = \
-                self.__create_yaml_log_level_element(depth_spaces, log_level)
-            return f'\n{log_level_str}'
+        if depth > 0:
+            record_prefix = f'{depth_indentation.spaces[:-2]}- '
 
-        if yaml_element == LogElementEnum.PATH:
-            return f'\n{self.__create_yaml_path_element(path, depth_spaces)}'
-
-        if yaml_element == LogElementEnum.METHOD:
-            return \
-                f'\n{self.__create_yaml_method_element(method, depth_spaces)}'
-
-        if yaml_element == LogElementEnum.LINE_NUMBER:
-            return \
-                '\n' + self.__create_yaml_line_number_element(
-                    line_number, depth_spaces)
+            if is_child:
+                record_prefix = f'\n{record_prefix}'
 
-        if yaml_element == LogElementEnum.MESSAGE:
-            return \
-                '\n' \
-                f'{self.__create_yaml_line_message_element(msg, depth_spaces)}'
+            first_element_prefix = ''
+        else:
+            record_prefix = ''
+            first_element_prefix = '\n'
 
-        raise NotImplementedCodeException(
-            f'Bug: Yaml element {yaml_element} not implemented')
+        return \
+            LogYamlTemplate(
+                LogYamlElements(yaml_elements).ordered_yaml_elements,
+                record_prefix,
+                first_element_prefix,
+                f'\n{depth_indentation.spaces}',
+                depth_indentation.multiline_separator)
 
     def __create_line_element_str(
             self,
             msg: str,
             log_level: LogLevelEnum,
             is_child: bool,
-            stack_list: list[FrameInfo],
-            thread_id: int) -> str:
-        depth_spaces = \
-            ''.join(
-                [f'{self.YAML_SPACES_SEPARATOR}  '
-                 for _ in range(self._depth_dict[thread_id])])
-
-        sf = stack_list[0]
-
-        path, method, line_number = \
-            self.__get_log_path_method_and_line_number_from_sf(sf)
+            stack_capture: StackCapture,
+            depth: int) -> str:
 
         return \
             self.__create_line_element(
-                depth_spaces,
+                self.__get_depth_indentation(depth),
                 log_level,
-                path,
-                method,
-                line_number,
+                stack_capture,
                 msg,
                 is_child)
 
     def __create_line_element(
             self,
-            depth_spaces: str,
+            depth_indentation: DepthIndentation,
             log_level: LogLevelEnum,
-            path: str,
-            method: str,
-            line_number: str,
+            stack_capture: StackCapture,
             msg: str,
             is_child: bool) -> str:
 
-        log_line = self.log_line_template\
-            .replace(
-                LogElementEnum.DATE.line_format,
-                datetime.now().strftime(self.log_date_format.date_format))\
-            .replace(LogElementEnum.LOG_LEVEL.line_format, log_level.name)\
-            .replace(LogElementEnum.PATH.line_format, path)\
-            .replace(LogElementEnum.METHOD.line_format, method)\
-            .replace(LogElementEnum.LINE_NUMBER.line_format, line_number)\
-            .replace(LogElementEnum.MESSAGE.line_format, msg)
+        call_site = stack_capture.call_site
+
+        log_line = \
+            self.__get_compiled_log_line_template().render(
+                stack_capture.date,
+                self.log_date_format.formatter.format,
+                log_level.name,
+                call_site.path,
+                call_site.method,
+                call_site.line_number,
+                msg)
 
         if '\n' in log_line:
             multiline_operator = self.__get_yaml_multiline_operator(log_line)
-            depth_spaces_of_str = \
-                f'\n{depth_spaces}{self.YAML_CHILDREN_SPACES_SEPARATOR}'
-            log_line_list = log_line.split('\n')
-            log_line_with_tabs = depth_spaces_of_str.join(log_line_list)
+            multiline_separator = depth_indentation.multiline_separator
+            log_line_with_tabs = log_line.replace('\n', multiline_separator)
 
             line_log = \
-                f'{depth_spaces}' \
-                f'- log: {multiline_operator}' \
-                f'{depth_spaces_of_str}{log_line_with_tabs}'
+                f'{depth_indentation.line_prefix}{multiline_operator}' \
+                f'{multiline_separator}{log_line_with_tabs}'
         else:
-            line_log = f'{depth_spaces}- log: {log_line}'
+            line_log = f'{depth_indentation.line_prefix}{log_line}'
 
         if is_child:
             line_log = f'\n{line_log}'
 
         return line_log
 
-    def __create_yaml_date_element(self, depth_spaces: str) -> str:
-        return \
-            f'{depth_spaces}{LogElementEnum.DATE.value}:' \
-            f' {datetime.now().strftime(self.log_date_format.date_format)}'
-
-    def __update_depth_for_manual_increased_child_depth(
-            self, fm_name: str, thread_id: int) -> bool:
-
-        latest_fm_depth = self.__get_latest_fm_depth(fm_name, thread_id)
-
-        if latest_fm_depth is None:
-            # Scenario:
-            #   1. thread_1: Time: 0, logger.info('msg')
-            #   2. thread_1: Time: 1, logger.increase_depth()
-            #   3. thread_2: Time: 2, Same logger.info('msg') of thread_1
-            return False
-
-        depth_data = DepthData(name=fm_name)
-        depth_data.manual_depth_change = 1
-        depth_data.total_manual_depth = latest_fm_depth.total_manual_depth + 1
-
-        self._depth_dict[thread_id] += 1
-
-        self._depth_list_dict[thread_id].append(depth_data)
-
-        return True
-
-    def __update_depth_for_manual_decreased_child_depth(
-            self, fm_name: str, thread_id: int):
-        latest_fm_depth = self.__get_latest_fm_depth(fm_name, thread_id)
-
-        if self._depth_dict[thread_id] > 0 \
-                and latest_fm_depth.total_manual_depth > 0:
-            depth_data = DepthData(name=fm_name)
-            depth_data.manual_depth_change = -1
-            depth_data.total_manual_depth = \
-                latest_fm_depth.total_manual_depth - 1
-            self._depth_dict[thread_id] -= 1
-
-    def __update_depth_for_increased_child_depth(
-            self, fm_name: str, thread_id: int):
-        self._depth_list_dict[thread_id].append(DepthData(name=fm_name))
-        self._depth_dict[thread_id] += 1
-
-    def __update_depth_for_change_in_manual_depth(
-            self, fm_name: str,
-            manual_depth: ManualDepthEnum,
-            thread_id: int):
-        if manual_depth == ManualDepthEnum.INCREASE:
-            return \
-                self.__update_depth_for_manual_increased_child_depth(
-                    fm_name, thread_id)
+    def __get_compiled_log_line_template(self) -> LogLineTemplate:
+        """
+        Template is compiled again only if it was replaced
+        with set_log_line_template after the stream handler was created.
+        """
 
-        if manual_depth == ManualDepthEnum.DECREASE:
-            self.__update_depth_for_manual_decreased_child_depth(
-                fm_name, thread_id)
+        if self._compiled_log_line_template.template \
+                is not self._log_line_template:
+            self._compiled_log_line_template = \
+                LogLineTemplate(self._log_line_template)
 
-        return False
+        return self._compiled_log_line_template
 
     def __add_debug_to_message(self) -> str:
-        debug_st_str_list, _ = self.__get_stack_list(start_index=1)
-        return \
-            '\nNRT-Logging DEBUG:\n' \
-            f'Start Index: {self._stack_log_start_index}\n' \
-            + '\n'.join(debug_st_str_list)
-
-    def __add_new_thread_id_to_dicts(self, thread_id: int):
-        if self._depth_dict.get(thread_id) is None:
-            self._depth_dict[thread_id] = 0
-            self._depth_list_dict[thread_id] = []
-            self._increase_depth_list_dict[thread_id] = []
-            self._decrease_depth_list_dict[thread_id] = []
-
-    def __clean_threads_dicts(self):
-        if self.__clean_threads_counter > self.__CLEAN_THREADS_COUNT:
-            self.__clean_threads_counter = 0
-            current_thread_id_list = \
-                [thread.ident for thread in threading.enumerate()]
-            logger_thread_id_list = list(self._depth_list_dict)
-
-            dead_threads_list = \
-                set(logger_thread_id_list) - set(current_thread_id_list)
-
-            for thread_id in dead_threads_list:
-                self._depth_dict.pop(thread_id)
-                self._depth_list_dict.pop(thread_id)
-                self._increase_depth_list_dict.pop(thread_id)
-                self._decrease_depth_list_dict.pop(thread_id)
-        elif len(self._depth_list_dict) >= self._CLEAN_THREADS_DICTS:
-            self.__clean_threads_counter += 1
+        debug_st_str_list = StackCapture.build(0).frame_name_list
+        return '\nNRT-Logging DEBUG:\n' + '\n'.join(debug_st_str_list)
 
     @classmethod
     def is_utf_8(cls, msg) -> bool:
@@ -984,10 +1189,12 @@ class LoggerStreamHandlerBase(ABC):
     @classmethod
     def set_log_level(cls, level: LogLevelEnum):
         cls._log_level = level
+        cls._update_class_loggers_log_dispatch()
 
     @classmethod
     def set_log_style(cls, log_style: LogStyleEnum):
         cls._style = log_style
+        cls._update_class_loggers_log_dispatch()
 
     @classmethod
     def set_log_date_format(cls, log_date_format: LogDateFormat):
@@ -996,10 +1203,26 @@ class LoggerStreamHandlerBase(ABC):
     @classmethod
     def set_log_yaml_elements(cls, log_yaml_elements: LogYamlElements):
         cls._log_yaml_elements = log_yaml_elements
+        cls._update_class_loggers_log_dispatch()
 
     @classmethod
     def set_log_line_template(cls, log_line_template: str):
         cls._log_line_template = log_line_template
+        cls._update_class_loggers_log_dispatch()
+
+    @classmethod
+    def set_is_context_depth(cls, is_context_depth: bool):
+        cls._is_context_depth = is_context_depth
+
+    @classmethod
+    def set_max_depth(cls, max_depth: Optional[int]):
+        cls._max_depth = max_depth
+
+    @classmethod
+    def set_depth_overflow_policy(
+            cls, depth_overflow_policy: DepthOverflowPolicyEnum):
+
+        cls._depth_overflow_policy = depth_overflow_policy
 
     @classmethod
     def __is_variable(cls, obj_value, attr_name: str) -> bool:
@@ -1016,90 +1239,6 @@ class LoggerStreamHandlerBase(ABC):
 
         return 'method' not in str(obj_value)
 
-    @classmethod
-    def __is_increased_child_depth(
-            cls,
-            parent_fm_name: str,
-            parent_stack_list: list[str]) -> bool:
-        return parent_fm_name in parent_stack_list
-
-    @classmethod
-    def __is_child_in_previous_child_depth(
-            cls, expected_parent_fm_name: str, stack_list: list[str]) -> bool:
-        """
-        Check if the log is in the same method of previous log.
-
-        @param expected_parent_fm_name:
-        @param stack_list:
-        @return:
-        """
-
-        return expected_parent_fm_name == stack_list[0]
-
-    @classmethod
-    def __create_yaml_log_level_element(
-            cls, depth_spaces: str, log_level: LogLevelEnum) -> str:
-        return \
-            f'{depth_spaces}{LogElementEnum.LOG_LEVEL}:' \
-            f' {log_level}'
-
-    @classmethod
-    def __create_yaml_path_element(cls, path: str, depth_spaces: str) -> str:
-        return f'{depth_spaces}{LogElementEnum.PATH.value}: {path}'
-
-    @classmethod
-    def __create_yaml_method_element(
-            cls, method: str, depth_spaces: str) -> str:
-        return f'{depth_spaces}{LogElementEnum.METHOD.value}: {method}'
-
-    @classmethod
-    def __create_yaml_line_number_element(
-            cls, line_number: str, depth_spaces: str) -> str:
-        return \
-            f'{depth_spaces}'\
-            f'{LogElementEnum.LINE_NUMBER.value}: {line_number}'
-
-    @classmethod
-    def __create_yaml_line_message_element(
-            cls, msg: str, depth_spaces: str) -> str:
-
-        element = f'{depth_spaces}{LogElementEnum.MESSAGE.value}: '
-
-        if '\n' in msg:
-            multiline_operator = cls.__get_yaml_multiline_operator(msg)
-
-            depth_spaces_of_str = \
-                f'\n{depth_spaces}{cls.YAML_SPACES_SEPARATOR}'
-            message_list = msg.split('\n')
-            message_with_tabs = depth_spaces_of_str.join(message_list)
-            element += \
-                f'{multiline_operator}' \
-                f'{depth_spaces_of_str}{message_with_tabs}'
-        else:
-            element += msg
-
-        return element
-
-    @classmethod
-    def __get_log_path_method_and_line_number_from_sf(cls, frame) -> tuple:
-        method = frame[3]
-
-        slf = frame[0].f_locals.get('self')
-
-        if slf:
-            class_name = slf.__class__.__name__
-            path = f'{ntpath.basename(frame[1])}.{class_name}'
-        else:
-            path = ntpath.basename(frame[1])
-
-        line_number = str(frame[2])
-
-        return path, method, line_number
-
-    @classmethod
-    def __create_fm_name(cls, path: str, method: str) -> str:
-        return f'{path}.{method}'
-
     @classmethod
     def __get_yaml_multiline_operator(cls, yaml_text: str):
         return '|' if yaml_text[-1] == '\n' else '|-'
@@ -1108,77 +1247,106 @@ class LoggerStreamHandlerBase(ABC):
 class ConsoleStreamHandler(LoggerStreamHandlerBase):
 
     def __init__(self):
-        super().__init__(
-            stack_log_start_index=5,
-            stack_log_increase_start_index=3,
-            stack_log_decrease_start_index=3)
+        super().__init__()
         self._stream = sys.stdout
 
     def critical(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.CRITICAL, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.CRITICAL,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def error(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.ERROR, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.ERROR,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def warn(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.WARN, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.WARN,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def info(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.INFO, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.INFO,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def debug(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.DEBUG, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.DEBUG,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def trace(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.TRACE, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.TRACE,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def snapshot(
             self,
             methods_depth=LoggerStreamHandlerBase.SNAPSHOT_METHODS_DEPTH,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._snapshot(methods_depth, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+        self._snapshot(
+            methods_depth, manual_depth, stack_capture, depth_position)
 
     def close(self):
         """
-        close function not relevant for ConsoleStreamHandler.
+        Stop the writer thread of async mode.
+        Async mode is off after close.
         """
 
-    def _log(
-            self,
-            log_level: LogLevelEnum,
-            msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
-            is_lock: bool = True):
+        self._stop_async_writer()
 
+    def _encode_msg(self, msg: str) -> str:
         # Issue with Pycharm that init std.stdout with encoding cp1252
         if self._stream.__getattribute__('encoding') != 'utf-8' \
                 and isinstance(msg, str):
-            msg = msg.encode('ascii', 'ignore').decode()
+            return msg.encode('ascii', 'ignore').decode()
 
-        super()._log(log_level, msg, manual_depth, is_lock)
+        return msg
 
 
 class FileStreamHandler(LoggerStreamHandlerBase):
     __ARCHIVE_DATE_FORMAT = '%Y_%m_%d_%H_%M_%S_%f'
     __ZIP_COMPRESSION_LEVEL = 7
+    # New line is written as os.linesep in text mode
+    __NEW_LINE_EXTRA_SIZE = len(os.linesep) - 1
 
     __file_path: str
     __file_path_prefix: str
@@ -1188,61 +1356,137 @@ class FileStreamHandler(LoggerStreamHandlerBase):
     __max_file_size: int = DEFAULT_MAX_FILE_SIZE
     __files_amount: int = DEFAULT_FILES_AMOUNT
     __is_zip: bool = False
+    # Seconds
+    __rotation_interval: Optional[int] = None
+    __archive_partition_format: Optional[str] = None
+
+    __buffer_size: int = DEFAULT_BUFFER_SIZE
+    __flush_interval: int = DEFAULT_FLUSH_INTERVAL
+    __flush_log_level: LogLevelEnum = DEFAULT_FLUSH_LOG_LEVEL
+
+    __file_check_interval: int = DEFAULT_FILE_CHECK_INTERVAL
+
+    # (Device, Inode) of the file that _stream is open on
+    __stream_file_id: Optional[tuple[int, int]] = None
+    # Written size of the file that _stream is open on,
+    # characters are counted as bytes until the next file check
+    __file_size: int = 0
+    # Monotonic time of the next file check
+    __file_check_time: float = 0
+    # Start of the rotation interval of the file that _stream is open on
+    __rotation_start: Optional[datetime] = None
+    # Time of the next rotation, None if rotation interval is not set
+    __rotation_time: Optional[float] = None
+    __flush_thread: Optional[Thread] = None
+    __flush_stop_event: Optional[Event] = None
+
+    # Flushed at exit
+    __file_stream_handler_set: WeakSet = WeakSet()
 
     def __init__(self, file_path: str):
-        super().__init__(
-            stack_log_start_index=5,
-            stack_log_increase_start_index=3,
-            stack_log_decrease_start_index=3)
+        super().__init__()
         self.__file_path = file_path
         self.__file_path_prefix = self.__get_log_file_path_prefix()
         self.__file_extension = self.__get_log_file_extension()
+        self.__file_stream_handler_set.add(self)
 
     def critical(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.CRITICAL, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.CRITICAL,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def error(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.ERROR, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.ERROR,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def warn(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.WARN, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.WARN,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def info(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.INFO, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.INFO,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def debug(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.DEBUG, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.DEBUG,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def trace(
             self,
             msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._log(LogLevelEnum.TRACE, msg, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None):
+        self._log(
+            LogLevelEnum.TRACE,
+            msg,
+            manual_depth,
+            stack_capture=stack_capture)
 
     def snapshot(
             self,
             methods_depth=LoggerStreamHandlerBase.SNAPSHOT_METHODS_DEPTH,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE):
-        self._snapshot(methods_depth, manual_depth)
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+        self._snapshot(
+            methods_depth, manual_depth, stack_capture, depth_position)
 
     def close(self):
-        if self._stream is not None:
-            self._stream.close()
+        """
+        Close log file and stop the writer thread of async mode.
+        Log file is reopened on the next record.
+        Async mode is off after close.
+        """
+
+        self._stop_async_writer()
+
+        with self._lock:
+            self.__stop_flush_thread()
+            self.__close_stream()
+
+    @classmethod
+    def flush_all(cls):
+        """
+        Flush all file stream handlers.
+        Called at exit, so buffered log records are not lost.
+        """
+
+        for file_stream_handler in list(cls.__file_stream_handler_set):
+            file_stream_handler.flush()
 
     @property
     def is_limit_file_size(self) -> bool:
@@ -1282,38 +1526,335 @@ class FileStreamHandler(LoggerStreamHandlerBase):
     def is_zip(self, is_zip: bool):
         self.__is_zip = is_zip
 
-    def _log(
+    @property
+    def rotation_interval(self) -> Optional[int]:
+        return self.__rotation_interval
+
+    @rotation_interval.setter
+    def rotation_interval(
             self,
-            log_level: LogLevelEnum,
-            msg: str,
-            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
-            is_lock: bool = True):
+            rotation_interval: Optional[Union[RotationIntervalEnum, int]]):
+        """
+        Archive log file every rotation interval.
+        Intervals of up to a day start at midnight, local time.
+        Can be combined with is_limit_file_size.
 
-        self.__limit_file_size()
+        @param rotation_interval: Rotation interval,
+            or custom rotation interval in seconds.
+            None for no time rotation.
+        """
 
-        try:
-            self._stream = open(self.__file_path, 'a')
-            super()._log(log_level, msg, manual_depth, is_lock)
-        finally:
-            self.close()
-
-    def __limit_file_size(self):
-        if self.is_limit_file_size:
-            if not exists(self.__file_path):
-                return
+        if isinstance(rotation_interval, RotationIntervalEnum):
+            rotation_interval = rotation_interval.seconds
+        elif rotation_interval is not None and rotation_interval <= 0:
+            raise ValueError('Rotation interval must be bigger from 0')
 
-            file_size = getsize(self.__file_path)
+        with self._lock:
+            self.__rotation_interval = rotation_interval
+            self.__update_rotation_time()
 
-            if file_size >= self.max_file_size:
-                with self._lock:
-                    archive_file_path = self.__archive_log()
+    @property
+    def archive_partition_format(self) -> Optional[str]:
+        return self.__archive_partition_format
 
+    @archive_partition_format.setter
+    def archive_partition_format(
+            self, archive_partition_format: Optional[str]):
+        """
+        Archive log files in partition directories,
+        so old partitions can be deleted as whole directories,
+        and archives of a time window can be found without glob
+        of all archives.
+
+        @param archive_partition_format: Partition directory date format,
+            relative to the log file directory, for example '%Y/%m/%d/%H'.
+            Date is the start of the rotation interval of the archive,
+            or the archive time if rotation interval is not set.
+            files_amount is kept by partitions, from the newest,
+            and archives of older partitions are deleted.
+            Partition directories are deleted once they are empty.
+            None for archives next to the log file.
+        """
+
+        self.__archive_partition_format = archive_partition_format
+
+    @property
+    def buffer_size(self) -> int:
+        return self.__buffer_size
+
+    @buffer_size.setter
+    def buffer_size(self, buffer_size: int):
+        """
+        Write buffer size in bytes.
+        Buffer is flushed when it is full, every flush_interval
+        and on records with flush_log_level or above.
+
+        @param buffer_size: Buffer size in bytes,
+            0 for flush after each record.
+        """
+
+        if buffer_size < 0:
+            raise ValueError('Log buffer size cannot be negative number')
+
+        with self._lock:
+            self.__buffer_size = buffer_size
+            # Reopen log file with the new buffer size
+            self.__stop_flush_thread()
+            self.__close_stream()
+
+    @property
+    def flush_interval(self) -> int:
+        return self.__flush_interval
+
+    @flush_interval.setter
+    def flush_interval(self, flush_interval: int):
+        """
+        @param flush_interval: Flush interval of write buffer
+            in milliseconds, 0 for no periodic flush.
+        """
+
+        if flush_interval < 0:
+            raise ValueError('Log flush interval cannot be negative number')
+
+        with self._lock:
+            self.__flush_interval = flush_interval
+            self.__stop_flush_thread()
+            self.__file_check_time = 0
+
+    @property
+    def flush_log_level(self) -> LogLevelEnum:
+        return self.__flush_log_level
+
+    @flush_log_level.setter
+    def flush_log_level(self, flush_log_level: LogLevelEnum):
+        self.__flush_log_level = flush_log_level
+
+    @property
+    def file_check_interval(self) -> int:
+        return self.__file_check_interval
+
+    @file_check_interval.setter
+    def file_check_interval(self, file_check_interval: int):
+        """
+        Log file is checked for move or delete outside the stream handler,
+        and its size is synced with the written size.
+
+        @param file_check_interval: File check interval in milliseconds,
+            0 for check before each write.
+        """
+
+        if file_check_interval < 0:
+            raise ValueError(
+                'Log file check interval cannot be negative number')
+
+        with self._lock:
+            self.__file_check_interval = file_check_interval
+            self.__file_check_time = 0
+
+    def _write(self, log_str: str, log_level: LogLevelEnum):
+        self.__prepare_stream()
+        super()._write(log_str, log_level)
+        self.__file_size += self.__get_written_size(log_str)
+        self.__flush_by_policy(log_level)
+
+    def _write_batch(self, log_record_list: list[LogRecord]):
+        """
+        Write log records with a single write to the log file.
+        Batch is split at the file size limit,
+        so log file is archived between log records as in sync mode.
+        """
+
+        batch_start = 0
+
+        while batch_start < len(log_record_list):
+            self.__prepare_stream()
+            batch_end, batch_size = \
+                self.__get_batch_end_and_size(log_record_list, batch_start)
+            super()._write_batch(log_record_list[batch_start:batch_end])
+            self.__file_size += batch_size
+            batch_start = batch_end
+
+        self.__flush_by_policy(
+            max(log_record.log_level for log_record in log_record_list))
+
+    def __get_batch_end_and_size(
+            self,
+            log_record_list: list[LogRecord],
+            batch_start: int) -> tuple[int, int]:
+        """
+        @param log_record_list: Log records.
+        @param batch_start: Index of the first log record of the batch.
+        @return: Index after the last log record that is written
+            before the file size limit, and written size of the batch.
+        """
+
+        batch_size = 0
+
+        for index in range(batch_start, len(log_record_list)):
+            if index > batch_start \
+                    and self.is_limit_file_size \
+                    and self.__file_size + batch_size >= self.max_file_size:
+                return index, batch_size
+
+            batch_size += \
+                self.__get_written_size(log_record_list[index].log_str)
+
+        return len(log_record_list), batch_size
+
+    def __get_written_size(self, log_str: str) -> int:
+        """
+        @param log_str: Log string.
+        @return: Size in bytes of the log string and its new line
+            in the log file, in the encoding of the log file
+            and with new lines of the platform.
+        """
+
+        if log_str.isascii():
+            size = len(log_str)
+        else:
+            size = \
+                len(log_str.encode(
+                    self._stream.encoding, self._stream.errors))
+
+        if self.__NEW_LINE_EXTRA_SIZE > 0:
+            size += (log_str.count('\n') + 1) * self.__NEW_LINE_EXTRA_SIZE
+
+        return size + 1
+
+    def __prepare_stream(self):
+        if monotonic() >= self.__file_check_time:
+            self.__check_file()
+            self.__start_flush_thread()
+
+        if self.is_limit_file_size \
+                and self.__file_size >= self.max_file_size:
+            self.__archive_and_reopen()
+        elif self.__rotation_time is not None \
+                and time() >= self.__rotation_time:
+            self.__archive_and_reopen()
+
+    def __flush_by_policy(self, log_level: LogLevelEnum):
+        if self.buffer_size == 0 or log_level >= self.flush_log_level:
+            self._flush()
+
+    def __check_file(self):
+        """
+        Keep log file open across records.
+        Log file is reopened if it was closed,
+        or moved or deleted outside the stream handler.
+        Written size is synced with the size of the log file,
+        which is bigger if other processes write to the log file.
+        """
+
+        if self._stream is not None:
+            try:
+                file_stat = os.stat(self.__file_path)
+                file_id = (file_stat.st_dev, file_stat.st_ino)
+            except FileNotFoundError:
+                file_stat = None
+                file_id = None
+
+            if file_id == self.__stream_file_id:
+                self.__file_size = max(self.__file_size, file_stat.st_size)
+            else:
+                self.__close_stream()
+
+        if self._stream is None:
+            self.__open_stream()
+
+        self.__file_check_time = \
+            monotonic() + self.file_check_interval / 1000
+
+    def __open_stream(self):
+        self._stream = self.__open_file()
+        stream_stat = os.fstat(self._stream.fileno())
+        self.__stream_file_id = (stream_stat.st_dev, stream_stat.st_ino)
+        self.__file_size = stream_stat.st_size
+        # Log file from previous rotation interval is archived
+        # before the next write
+        self.__rotation_start = \
+            datetime.fromtimestamp(stream_stat.st_mtime) \
+            if stream_stat.st_size > 0 else datetime.now()
+        self.__update_rotation_time()
+
+    def __update_rotation_time(self):
+        if self.rotation_interval is None or self.__rotation_start is None:
+            self.__rotation_time = None
+            return
+
+        rotation_start = self.__rotation_start
+        interval = timedelta(seconds=self.rotation_interval)
+
+        if self.rotation_interval <= RotationIntervalEnum.DAILY.seconds:
+            interval_base = \
+                rotation_start.replace(
+                    hour=0, minute=0, second=0, microsecond=0)
+        else:
+            interval_base = datetime.fromtimestamp(0)
+
+        self.__rotation_start = \
+            interval_base \
+            + (rotation_start - interval_base) // interval * interval
+        self.__rotation_time = \
+            (self.__rotation_start + interval).timestamp()
+
+    def __open_file(self) -> IO:
+        if self.buffer_size == 0:
+            return open(self.__file_path, 'a')
+
+        stream = open(self.__file_path, 'a', buffering=self.buffer_size)
+        # Text is passed to the binary buffer on each write,
+        # so buffer_size limits the unwritten bytes
+        stream.reconfigure(write_through=True)
+        return stream
+
+    def __close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            finally:
+                self._stream = None
+                self.__stream_file_id = None
+                self.__file_size = 0
+                self.__file_check_time = 0
+
+    def __start_flush_thread(self):
+        if self.__flush_thread is None \
+                and self.buffer_size > 0 and self.flush_interval > 0:
+            self.__flush_stop_event = Event()
+            self.__flush_thread = \
+                Thread(
+                    target=self.__flush_periodically,
+                    args=(self.__flush_stop_event,),
+                    daemon=True)
+            self.__flush_thread.start()
+
+    def __stop_flush_thread(self):
+        if self.__flush_thread is not None:
+            self.__flush_stop_event.set()
+            self.__flush_thread = None
+            self.__flush_stop_event = None
+
+    def __flush_periodically(self, stop_event: Event):
+        while not stop_event.wait(self.flush_interval / 1000):
+            self.flush()
+
+    def __archive_and_reopen(self):
+        # Log file cannot be renamed or deleted while open on Windows
+        self.__close_stream()
+
+        if os.path.exists(self.__file_path):
+            archive_file_path = self.__archive_log()
+
+            if archive_file_path is not None:
                 t = \
                     Thread(
                         target=self.__zip_archive_and_limit_file_amount,
                         args=(archive_file_path,))
                 t.start()
 
+        self.__check_file()
+
     def __zip_archive_and_limit_file_amount(self, archive_file_path: str):
         if self.is_zip:
             with ZipFile(
@@ -1331,14 +1872,124 @@ class FileStreamHandler(LoggerStreamHandlerBase):
     def __limit_files_amount(self):
         # if files_amount == 0 than truncate log in __archive_log()
         if self.files_amount > 0:
-            files_list = self.__get_archive_files_list()
+            if self.archive_partition_format is not None:
+                self.__limit_partitions_amount()
+                return
+
+            files_list = \
+                self.__get_archive_files_list(f'{self.__file_path_prefix}*')
 
             if len(files_list) > self.files_amount:
-                files_list.sort()
+                # Archive file names are sorted by archive date
+                files_list.sort(key=ntpath.basename)
                 os.remove(files_list[0])
 
-    def __get_archive_files_list(self):
-        return [file for file in glob(f'{self.__file_path_prefix}*')
+    def __limit_partitions_amount(self):
+        """
+        Partitions are kept from the newest,
+        until they have files_amount archives.
+        Archives of older partitions are deleted,
+        and the partition directories are deleted once they are empty.
+        Oldest archives of the newest partition are deleted
+        in case it has more than files_amount archives.
+        """
+
+        archives_amount = 0
+        partition_dirs_list = self.__get_partition_dirs_list()
+
+        for index, partition_dir_path in enumerate(partition_dirs_list):
+            if archives_amount >= self.files_amount:
+                self.__remove_partitions(partition_dirs_list[index:])
+                return
+
+            files_list = self.__get_partition_files_list(partition_dir_path)
+
+            if index == 0 and len(files_list) > self.files_amount:
+                # Archive file names are sorted by archive date
+                files_list.sort(key=ntpath.basename)
+
+                for file_path in files_list[:-self.files_amount]:
+                    os.remove(file_path)
+
+            archives_amount += len(files_list)
+
+    def __get_partition_dirs_list(self) -> list[str]:
+        """
+        @return: Partition directories, sorted from the newest.
+            Directories whose path is not in archive_partition_format
+            are not partitions.
+        """
+
+        log_dir_path = os.path.dirname(self.__file_path) or os.curdir
+        partition_format = os.path.normpath(self.archive_partition_format)
+        dir_path_list = [log_dir_path]
+
+        # Only directories of the partition levels are listed
+        for _ in partition_format.split(os.sep):
+            sub_dir_path_list = []
+
+            for dir_path in dir_path_list:
+                with os.scandir(dir_path) as dir_entries:
+                    sub_dir_path_list.extend(
+                        dir_entry.path
+                        for dir_entry in dir_entries
+                        if dir_entry.is_dir())
+
+            dir_path_list = sub_dir_path_list
+
+        partition_list = []
+
+        for dir_path in dir_path_list:
+            try:
+                partition_date = \
+                    datetime.strptime(
+                        os.path.relpath(dir_path, log_dir_path),
+                        partition_format)
+            except ValueError:
+                continue
+
+            partition_list.append((partition_date, dir_path))
+
+        partition_list.sort(reverse=True)
+        return [dir_path for _, dir_path in partition_list]
+
+    def __remove_partitions(self, partition_dirs_list: list[str]):
+        """
+        Delete archives of the stream handler in the partitions.
+        Other files in the partitions are kept.
+        """
+
+        for partition_dir_path in partition_dirs_list:
+            for file_path in \
+                    self.__get_partition_files_list(partition_dir_path):
+                os.remove(file_path)
+
+            self.__remove_empty_partition_dirs(partition_dir_path)
+
+    def __get_partition_files_list(self, partition_dir_path: str) \
+            -> list[str]:
+        return \
+            self.__get_archive_files_list(
+                os.path.join(
+                    partition_dir_path,
+                    f'{ntpath.basename(self.__file_path_prefix)}*'))
+
+    def __remove_empty_partition_dirs(self, dir_path: str):
+        log_dir_path = os.path.abspath(os.path.dirname(self.__file_path))
+        dir_path = os.path.abspath(dir_path)
+
+        while dir_path.startswith(log_dir_path) \
+                and dir_path != log_dir_path:
+            try:
+                os.rmdir(dir_path)
+            except OSError:
+                # Partition is not empty
+                return
+
+            dir_path = os.path.dirname(dir_path)
+
+    def __get_archive_files_list(self, file_path_pattern: str) -> list[str]:
+        return [file for file in glob(file_path_pattern)
                 if self.__is_archive_file(file)]
 
     def __archive_log(self) -> Optional[str]:
@@ -1352,7 +2003,24 @@ class FileStreamHandler(LoggerStreamHandlerBase):
 
     def __create_archive_file_path_name(self) -> str:
         archive_suffix = self.__create_archive_suffix(self.__file_extension)
-        return f'{self.__file_path_prefix}{archive_suffix}'
+
+        if self.archive_partition_format is None:
+            return f'{self.__file_path_prefix}{archive_suffix}'
+
+        if self.rotation_interval is None or self.__rotation_start is None:
+            partition_date = datetime.now()
+        else:
+            partition_date = self.__rotation_start
+
+        partition_dir_path = \
+            os.path.join(
+                os.path.dirname(self.__file_path),
+                partition_date.strftime(self.archive_partition_format))
+        os.makedirs(partition_dir_path, exist_ok=True)
+
+        return os.path.join(
+            partition_dir_path,
+            f'{ntpath.basename(self.__file_path_prefix)}{archive_suffix}')
 
     def __get_log_file_path_prefix(self) -> str:
         try:
@@ -1369,7 +2037,9 @@ class FileStreamHandler(LoggerStreamHandlerBase):
             return None
 
     def __is_archive_file(self, file_path: str):
-        suffix = file_path[len(self.__file_path_prefix) + 1:]
+        suffix = \
+            ntpath.basename(file_path)[
+                len(ntpath.basename(self.__file_path_prefix)) + 1:]
 
         try:
             suffix = suffix[:suffix.index('.')]
@@ -1389,3 +2059,6 @@ class FileStreamHandler(LoggerStreamHandlerBase):
                    f'.{file_extension}'
 
         return f'_{datetime.now().strftime(cls.__ARCHIVE_DATE_FORMAT)}'
+
+
+atexit.register(FileStreamHandler.flush_all)
@@ -0,0 +1,623 @@
+import ntpath
+import sys
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from inspect import CO_OPTIMIZED
+from threading import Lock
+from types import CodeType, FrameType
+from typing import Optional
+
+
+class FrameNameCache:
+    """
+    Process-wide size bounded LRU cache of frame names.
+
+    Maps (code object, class name) to interned frame name
+    ('file.py.Class.method'), so file name, class name and method name
+    are joined only once per code object.
+
+    By default the class is taken from 'self' in the frame local variables.
+    If is_qualname is True (Python 3.11+), the class is taken from
+    co_qualname of the code object, and the frame local variables
+    are not read.
+    In this mode the class is the class that defines the method,
+    and not the class of 'self',
+    and functions that are nested in methods have no class.
+    """
+
+    DEFAULT_MAX_SIZE = 1024
+
+    __cache: OrderedDict
+    __lock: Lock
+    __max_size: int
+    __is_qualname: bool
+    __hits: int
+    __misses: int
+    __evictions: int
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.__cache = OrderedDict()
+        self.__lock = Lock()
+        self.max_size = max_size
+        self.__is_qualname = False
+        self.__reset_counters()
+
+    def get_frame_name(self, frame: FrameType) -> str:
+        code = frame.f_code
+
+        if self.__is_qualname:
+            key = (code, None)
+        else:
+            key = (code, self.__get_self_class_name(frame))
+
+        with self.__lock:
+            frame_name = self.__cache.get(key)
+
+            if frame_name is not None:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+                return frame_name
+
+            self.__misses += 1
+
+        frame_name = sys.intern(self.__create_frame_name(code, key[1]))
+
+        with self.__lock:
+            self.__cache[key] = frame_name
+
+            while len(self.__cache) > self.__max_size:
+                self.__cache.popitem(last=False)
+                self.__evictions += 1
+
+        return frame_name
+
+    def clear(self):
+        with self.__lock:
+            self.__cache.clear()
+            self.__reset_counters()
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int):
+        if max_size < 1:
+            raise ValueError(
+                f'Frame name cache max size [{max_size}]'
+                ' must be greater than 0')
+
+        self.__max_size = max_size
+
+        with self.__lock:
+            while len(self.__cache) > self.__max_size:
+                self.__cache.popitem(last=False)
+                self.__evictions += 1
+
+    @property
+    def is_qualname(self) -> bool:
+        return self.__is_qualname
+
+    @is_qualname.setter
+    def is_qualname(self, is_qualname: bool):
+        if is_qualname and not hasattr(CodeType, 'co_qualname'):
+            raise ValueError('co_qualname is supported from Python 3.11')
+
+        with self.__lock:
+            self.__is_qualname = is_qualname
+            self.__cache.clear()
+
+    @property
+    def size(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    def __reset_counters(self):
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __create_frame_name(
+            self, code: CodeType, class_name: Optional[str]) -> str:
+
+        file_name = ntpath.basename(code.co_filename)
+
+        if self.__is_qualname:
+            class_name = self.__get_qualname_class_name(code)
+
+        if class_name:
+            return f'{file_name}.{class_name}.{code.co_name}'
+
+        return f'{file_name}.{code.co_name}'
+
+    @classmethod
+    def __get_self_class_name(cls, frame: FrameType) -> Optional[str]:
+        code = frame.f_code
+
+        if code.co_flags & CO_OPTIMIZED and not cls.__is_self_var(code):
+            return None
+
+        slf = frame.f_locals.get('self')
+
+        if slf:
+            return slf.__class__.__name__
+
+        return None
+
+    @classmethod
+    def __get_qualname_class_name(cls, code: CodeType) -> Optional[str]:
+        qualname_list = code.co_qualname.split('.')
+
+        if len(qualname_list) < 2 or qualname_list[-2] == '<locals>':
+            return None
+
+        return qualname_list[-2]
+
+    @classmethod
+    def __is_self_var(cls, code: CodeType) -> bool:
+        return \
+            'self' in code.co_varnames \
+            or 'self' in code.co_cellvars \
+            or 'self' in code.co_freevars
+
+
+frame_name_cache = FrameNameCache()
+
+
+class CallTreeBackendEnum(Enum):
+    # sys.monitoring (PEP 669), Python 3.12+
+    MONITORING = 'monitoring'
+    # sys.setprofile
+    PROFILE = 'profile'
+
+    @classmethod
+    def build(cls, name: str):
+        name_u = name.upper()
+
+        for backend_enum in cls:
+            if name_u == backend_enum.name:
+                return backend_enum
+
+        raise ValueError(f'[{name}] is not valid call tree backend name')
+
+
+class CallTreeStack:
+    """
+    Frames of one thread that run tracked code objects,
+    from the latest frame.
+    """
+
+    __slots__ = ('frame_name_list', 'frame_id_list', 'generation')
+
+    frame_name_list: deque
+    frame_id_list: deque
+    # Generation of CallTreeMonitor that the stack is in sync with
+    generation: int
+
+    def __init__(self, generation: int):
+        self.frame_name_list = deque()
+        self.frame_id_list = deque()
+        self.generation = generation
+
+
+class CallTreeMonitor:
+    """
+    Track entry and exit of frames of the code objects that log,
+    so the stack of a log is known without walking all the frames.
+
+    A code object is tracked from its first log.
+    The stack of each thread contains only frames of tracked code objects,
+    and it has the same log tree as the whole stack,
+    since only frames that log are in log trees.
+
+    With MONITORING backend (Python 3.12+), events are enabled only
+    for the tracked code objects, except PY_UNWIND and PY_THROW
+    that are global and are raised only for exceptions.
+    With PROFILE backend, the profile function is called
+    for each call and return in the program.
+    PROFILE backend is not started if another profile function is set,
+    as MONITORING backend is not started if there is no free tool id.
+
+    The stack of a thread is rebuilt by walking its frames
+    on the first log after a new code object is tracked,
+    and on a log that its frame is not the latest frame in the stack
+    (for example, frames that started before the monitor).
+    """
+
+    TOOL_NAME = 'nrt_logging'
+
+    __backend: Optional[CallTreeBackendEnum]
+    __tool_id: Optional[int]
+    __code_set: set[CodeType]
+    __generation: int
+    __local: threading.local
+    __lock: Lock
+    __rebuilds: int
+
+    def __init__(self):
+        self.__backend = None
+        self.__tool_id = None
+        self.__code_set = set()
+        self.__generation = 0
+        self.__local = threading.local()
+        self.__lock = Lock()
+        self.__rebuilds = 0
+
+    def start(self, backend: Optional[CallTreeBackendEnum] = None):
+        """
+        Start tracking.
+
+        @param backend:
+            Call tree backend.
+            If None then MONITORING is used if it is supported,
+            else PROFILE.
+        """
+
+        with self.__lock:
+            if self.__backend is not None:
+                raise RuntimeError('Call tree monitor is already running')
+
+            if backend is None:
+                backend = \
+                    CallTreeBackendEnum.MONITORING \
+                    if hasattr(sys, 'monitoring') \
+                    else CallTreeBackendEnum.PROFILE
+
+            if backend == CallTreeBackendEnum.MONITORING:
+                self.__start_monitoring()
+            else:
+                self.__start_profile()
+
+            self.__backend = backend
+            self.__generation += 1
+
+    def stop(self):
+        with self.__lock:
+            if self.__backend == CallTreeBackendEnum.MONITORING:
+                self.__stop_monitoring()
+            elif self.__backend == CallTreeBackendEnum.PROFILE:
+                self.__stop_profile()
+
+            self.__backend = None
+            self.__code_set = set()
+            self.__generation += 1
+            self.__rebuilds = 0
+
+    def get_frame_name_list(self, frame: FrameType) -> list[str]:
+        """
+        @param frame: Frame of the log call.
+        @return: Frame names of the tracked frames, from the log frame.
+        """
+
+        stack = getattr(self.__local, 'stack', None)
+
+        if stack is None \
+                or stack.generation != self.__generation \
+                or not stack.frame_id_list \
+                or stack.frame_id_list[0] != id(frame):
+
+            if frame.f_code not in self.__code_set:
+                self.__track(frame.f_code)
+
+            stack = self.__build_stack(frame)
+
+        return list(stack.frame_name_list)
+
+    @property
+    def is_running(self) -> bool:
+        return self.__backend is not None
+
+    @property
+    def backend(self) -> Optional[CallTreeBackendEnum]:
+        return self.__backend
+
+    @property
+    def code_amount(self) -> int:
+        """
+        Amount of tracked code objects.
+        """
+
+        return len(self.__code_set)
+
+    @property
+    def rebuilds(self) -> int:
+        """
+        Amount of stacks that were rebuilt by walking frames.
+        """
+
+        return self.__rebuilds
+
+    def __track(self, code: CodeType):
+        with self.__lock:
+            if self.__backend is None or code in self.__code_set:
+                return
+
+            if self.__backend == CallTreeBackendEnum.MONITORING:
+                events = sys.monitoring.events
+                start_events = events.PY_START | events.PY_RESUME
+                return_events = events.PY_RETURN | events.PY_YIELD
+                sys.monitoring.set_local_events(
+                    self.__tool_id, code, start_events | return_events)
+
+            self.__code_set.add(code)
+            # Stacks of all the threads do not contain the new code object
+            self.__generation += 1
+
+    def __build_stack(self, frame: FrameType) -> CallTreeStack:
+        stack = CallTreeStack(self.__generation)
+
+        while frame is not None:
+            if frame.f_code in self.__code_set:
+                stack.frame_name_list.append(
+                    frame_name_cache.get_frame_name(frame))
+                stack.frame_id_list.append(id(frame))
+
+            frame = frame.f_back
+
+        self.__local.stack = stack
+        self.__rebuilds += 1
+        return stack
+
+    def __push(self, frame: FrameType):
+        stack = getattr(self.__local, 'stack', None)
+
+        if stack is not None and stack.generation == self.__generation:
+            stack.frame_name_list.appendleft(
+                frame_name_cache.get_frame_name(frame))
+            stack.frame_id_list.appendleft(id(frame))
+
+    def __pop(self, frame: FrameType):
+        stack = getattr(self.__local, 'stack', None)
+
+        if stack is None:
+            return
+
+        if stack.frame_id_list and stack.frame_id_list[0] == id(frame):
+            stack.frame_name_list.popleft()
+            stack.frame_id_list.popleft()
+        else:
+            # Not in sync, so the stack is rebuilt on the next log
+            stack.generation = -1
+
+    # skipcq: PYL-W0613
+    def __on_start(self, code: CodeType, instruction_offset: int):
+        self.__push(sys._getframe(1))
+
+    # skipcq: PYL-W0613
+    def __on_return(self, code: CodeType, instruction_offset: int, retval):
+        self.__pop(sys._getframe(1))
+
+    # skipcq: PYL-W0613
+    def __on_throw(
+            self,
+            code: CodeType,
+            instruction_offset: int,
+            exception: BaseException):
+
+        if code in self.__code_set:
+            self.__push(sys._getframe(1))
+
+    # skipcq: PYL-W0613
+    def __on_unwind(
+            self,
+            code: CodeType,
+            instruction_offset: int,
+            exception: BaseException):
+
+        if code in self.__code_set:
+            self.__pop(sys._getframe(1))
+
+    # skipcq: PYL-W0613
+    def __profile(self, frame: FrameType, event: str, arg):
+        if frame.f_code in self.__code_set:
+            if event == 'call':
+                self.__push(frame)
+            elif event == 'return':
+                self.__pop(frame)
+
+    def __start_monitoring(self):
+        monitoring = sys.monitoring
+
+        for tool_id in range(6):
+            if monitoring.get_tool(tool_id) is None:
+                monitoring.use_tool_id(tool_id, self.TOOL_NAME)
+                self.__tool_id = tool_id
+                break
+        else:
+            raise RuntimeError('No free sys.monitoring tool id')
+
+        events = monitoring.events
+
+        for event, callback in (
+                (events.PY_START, self.__on_start),
+                (events.PY_RESUME, self.__on_start),
+                (events.PY_THROW, self.__on_throw),
+                (events.PY_RETURN, self.__on_return),
+                (events.PY_YIELD, self.__on_return),
+                (events.PY_UNWIND, self.__on_unwind)):
+            monitoring.register_callback(self.__tool_id, event, callback)
+
+        monitoring.set_events(
+            self.__tool_id, events.PY_UNWIND | events.PY_THROW)
+
+    def __stop_monitoring(self):
+        monitoring = sys.monitoring
+
+        for code in self.__code_set:
+            monitoring.set_local_events(self.__tool_id, code, 0)
+
+        monitoring.set_events(self.__tool_id, 0)
+        monitoring.free_tool_id(self.__tool_id)
+        self.__tool_id = None
+
+    def __start_profile(self):
+        # Profile function of profiler or debugger would be replaced
+        if sys.getprofile() is not None \
+                or getattr(threading, 'getprofile', lambda: None)() \
+                is not None:
+            raise RuntimeError(
+                'Profile function is already set,'
+                ' unable to start PROFILE call tree backend')
+
+        sys.setprofile(self.__profile)
+
+        if hasattr(threading, 'setprofile_all_threads'):
+            threading.setprofile_all_threads(self.__profile)
+        else:
+            threading.setprofile(self.__profile)
+
+    @classmethod
+    def __stop_profile(cls):
+        sys.setprofile(None)
+
+        if hasattr(threading, 'setprofile_all_threads'):
+            threading.setprofile_all_threads(None)
+        else:
+            threading.setprofile(None)
+
+
+call_tree_monitor = CallTreeMonitor()
+
+
+@dataclass
+class CallSite:
+    path: str
+    method: str
+    line_number: str
+
+
+@dataclass
+class StackCapture:
+    """
+    Lightweight capture of a log call.
+
+    Contains only the data that the depth engine and the formatters use:
+    frame name ('file.py.Class.method') of each frame in the stack,
+    path, method and line number of the first frame,
+    the call date if it is written,
+    and optionally copy of the local variables of the first frames.
+
+    Frames are walked with sys._getframe and f_back,
+    so source lines are not read and frames are not referenced
+    after the capture is built.
+    Frame names are taken from frame_name_cache.
+    If call_tree_monitor is running, frame names are taken
+    from the tracked stack, without walking the frames.
+
+    The capture is built once per log call
+    and shared by all the stream handlers of the logger.
+    """
+
+    frame_name_list: list[str]
+    call_site: CallSite
+    f_locals_list: list[dict]
+    date: Optional[datetime]
+
+    @classmethod
+    def build(
+            cls,
+            start_depth: int,
+            f_locals_depth: int = 0,
+            frames_amount: Optional[int] = None,
+            is_date: bool = True) -> 'StackCapture':
+        """
+        Capture the stack of the caller.
+
+        @param start_depth:
+            Depth of the first frame to capture,
+            relative to the caller of this method (0 is the caller).
+        @param f_locals_depth:
+            Amount of the first frames that their local variables
+            will be copied to f_locals_list.
+        @param frames_amount:
+            Max amount of frames to capture.
+            If None then the whole stack is captured.
+        @param is_date:
+            True to capture the call date,
+            False if no stream handler writes the date.
+        @return: StackCapture.
+        """
+
+        frame: Optional[FrameType] = sys._getframe(start_depth + 1)
+
+        if call_tree_monitor.is_running \
+                and not f_locals_depth \
+                and frames_amount is None:
+
+            return cls.__build_from_call_tree(frame, is_date)
+
+        frame_name_list = []
+        f_locals_list = []
+        call_site = None
+
+        while frame is not None \
+                and len(frame_name_list) != frames_amount:
+
+            frame_name = frame_name_cache.get_frame_name(frame)
+
+            if call_site is None:
+                method = frame.f_code.co_name
+                call_site = \
+                    CallSite(
+                        frame_name[:-len(method) - 1],
+                        method,
+                        str(frame.f_lineno))
+
+            if len(f_locals_list) < f_locals_depth:
+                f_locals_list.append(dict(frame.f_locals))
+
+            frame_name_list.append(frame_name)
+            frame = frame.f_back
+
+        return \
+            cls(
+                frame_name_list,
+                call_site,
+                f_locals_list,
+                datetime.now() if is_date else None)
+
+    @classmethod
+    def get_frame_name(cls, start_depth: int) -> str:
+        """
+        Get frame name of one frame of the caller stack,
+        without capturing the stack.
+
+        @param start_depth:
+            Depth of the frame,
+            relative to the caller of this method (0 is the caller).
+        @return: Frame name ('file.py.Class.method').
+        """
+
+        return frame_name_cache.get_frame_name(sys._getframe(start_depth + 1))
+
+    @classmethod
+    def __build_from_call_tree(
+            cls, frame: FrameType, is_date: bool) -> 'StackCapture':
+        frame_name_list = call_tree_monitor.get_frame_name_list(frame)
+        method = frame.f_code.co_name
+        call_site = \
+            CallSite(
+                frame_name_list[0][:-len(method) - 1],
+                method,
+                str(frame.f_lineno))
+
+        return \
+            cls(
+                frame_name_list,
+                call_site,
+                [],
+                datetime.now() if is_date else None)
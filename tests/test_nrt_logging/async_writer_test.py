@@ -0,0 +1,369 @@
+import os
+import threading
+import unittest
+from io import StringIO
+from threading import Event, Thread
+
+from parameterized import parameterized
+
+from nrt_logging.async_writer import \
+    AsyncWriter, LogRecord, QueueFullPolicyEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import FileStreamHandler
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase
+
+
+class BlockedWriter:
+    """
+    Write batches after release,
+    so the queue of the async writer can be filled.
+    """
+
+    log_str_list: list[str]
+    batch_size_list: list[int]
+    started_event: Event
+    release_event: Event
+
+    def __init__(self):
+        self.log_str_list = []
+        self.batch_size_list = []
+        self.started_event = Event()
+        self.release_event = Event()
+
+    def write_batch(self, log_record_list: list[LogRecord]):
+        self.started_event.set()
+        self.release_event.wait()
+        self.batch_size_list.append(len(log_record_list))
+        self.log_str_list += \
+            [log_record.log_str for log_record in log_record_list]
+
+
+class WriteCountStringIO(StringIO):
+    writes: int = 0
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+class QueueFullPolicyEnumTests(TestBase):
+
+    def test_build(self):
+        self.assertEqual(
+            QueueFullPolicyEnum.DROP_BELOW_LEVEL,
+            QueueFullPolicyEnum.build('drop_below_level'))
+
+    def test_build_negative(self):
+        with self.assertRaises(ValueError):
+            QueueFullPolicyEnum.build('INVALID_POLICY')
+
+
+class AsyncWriterTests(TestBase):
+
+    @parameterized.expand([
+        [
+            QueueFullPolicyEnum.DROP_NEWEST,
+            LogLevelEnum.ERROR,
+            ['msg 1', 'msg 2', 'msg 3'],
+            1
+        ],
+        [
+            QueueFullPolicyEnum.DROP_OLDEST,
+            LogLevelEnum.ERROR,
+            ['msg 1', 'msg 3', 'msg 4'],
+            1
+        ],
+        [
+            QueueFullPolicyEnum.DROP_BELOW_LEVEL,
+            LogLevelEnum.INFO,
+            ['msg 1', 'msg 2', 'msg 3'],
+            1
+        ]
+    ])
+    def test_queue_full_policy(
+            self,
+            queue_full_policy: QueueFullPolicyEnum,
+            last_log_level: LogLevelEnum,
+            expected_log_str_list: list[str],
+            expected_dropped_records_amount: int):
+
+        writer = BlockedWriter()
+        async_writer = \
+            AsyncWriter(
+                writer.write_batch,
+                queue_size=2,
+                batch_size=1,
+                queue_full_policy=queue_full_policy,
+                drop_log_level=LogLevelEnum.WARN)
+        async_writer.start()
+
+        async_writer.put(LogRecord('msg 1', LogLevelEnum.INFO))
+        writer.started_event.wait()
+        async_writer.put(LogRecord('msg 2', LogLevelEnum.INFO))
+        async_writer.put(LogRecord('msg 3', LogLevelEnum.INFO))
+        async_writer.put(LogRecord('msg 4', last_log_level))
+        writer.release_event.set()
+        async_writer.stop()
+
+        self.assertEqual(expected_log_str_list, writer.log_str_list)
+        self.assertEqual(
+            expected_dropped_records_amount,
+            async_writer.dropped_records_amount)
+        self.assertFalse(async_writer.is_running)
+
+    def test_block_policy_waits_for_writer(self):
+        writer = BlockedWriter()
+        async_writer = AsyncWriter(writer.write_batch, queue_size=1)
+        async_writer.start()
+
+        async_writer.put(LogRecord('msg 1', LogLevelEnum.INFO))
+        writer.started_event.wait()
+        async_writer.put(LogRecord('msg 2', LogLevelEnum.INFO))
+        t = \
+            Thread(
+                target=async_writer.put,
+                args=(LogRecord('msg 3', LogLevelEnum.INFO),))
+        t.start()
+        t.join(0.1)
+
+        self.assertTrue(t.is_alive())
+
+        writer.release_event.set()
+        t.join()
+        async_writer.join()
+
+        self.assertEqual(['msg 1', 'msg 2', 'msg 3'], writer.log_str_list)
+        self.assertEqual(0, async_writer.dropped_records_amount)
+        async_writer.stop()
+
+    def test_stop_returns_blocked_put(self):
+        writer = BlockedWriter()
+        async_writer = AsyncWriter(writer.write_batch, queue_size=1)
+        async_writer.start()
+
+        async_writer.put(LogRecord('msg 1', LogLevelEnum.INFO))
+        writer.started_event.wait()
+        async_writer.put(LogRecord('msg 2', LogLevelEnum.INFO))
+        put_result_list = []
+        t = \
+            Thread(
+                target=lambda: put_result_list.append(
+                    async_writer.put(LogRecord('msg 3', LogLevelEnum.INFO))))
+        t.start()
+        t.join(0.1)
+        stop_thread = Thread(target=async_writer.stop)
+        stop_thread.start()
+        t.join(1)
+
+        self.assertFalse(t.is_alive())
+        self.assertEqual([False], put_result_list)
+        self.assertFalse(
+            async_writer.put(LogRecord('msg 4', LogLevelEnum.INFO)))
+
+        writer.release_event.set()
+        stop_thread.join()
+
+        self.assertEqual(['msg 1', 'msg 2'], writer.log_str_list)
+        self.assertEqual(0, async_writer.dropped_records_amount)
+        self.assertFalse(async_writer.is_running)
+
+    def test_batches(self):
+        writer = BlockedWriter()
+        async_writer = AsyncWriter(writer.write_batch, batch_size=3)
+        async_writer.start()
+
+        async_writer.put(LogRecord('msg 0', LogLevelEnum.INFO))
+        writer.started_event.wait()
+
+        for i in range(1, 8):
+            async_writer.put(LogRecord(f'msg {i}', LogLevelEnum.INFO))
+
+        writer.release_event.set()
+        async_writer.stop()
+
+        self.assertEqual([1, 3, 3, 1], writer.batch_size_list)
+        self.assertEqual(
+            [f'msg {i}' for i in range(8)], writer.log_str_list)
+
+    @parameterized.expand([[0, 1], [1, 0]])
+    def test_invalid_sizes_negative(self, queue_size: int, batch_size: int):
+        with self.assertRaises(ValueError):
+            AsyncWriter(
+                BlockedWriter().write_batch,
+                queue_size=queue_size,
+                batch_size=batch_size)
+
+
+class AsyncModeTests(TestBase):
+    THREADS_AMOUNT = 4
+    RECORDS_AMOUNT = 200
+
+    sh: StringIOConsoleStreamHandler
+
+    def setUp(self):
+        self.sh = StringIOConsoleStreamHandler()
+        self.sh.async_mode = True
+
+    def tearDown(self):
+        self.sh.async_mode = False
+
+    def test_records_order_per_thread(self):
+        logger = NrtLogger()
+        logger.add_stream_handler(self.sh)
+
+        def log(thread_index: int):
+            for i in range(self.RECORDS_AMOUNT):
+                logger.info(f'{thread_index} {i}')
+
+        thread_list = [
+            Thread(target=log, args=(thread_index,))
+            for thread_index in range(self.THREADS_AMOUNT)
+        ]
+
+        for t in thread_list:
+            t.start()
+
+        for t in thread_list:
+            t.join()
+
+        logger.flush()
+
+        record_list = [
+            record.split(' ')
+            for record in
+            self.sh.output.replace('- log: ', '').splitlines()
+        ]
+
+        for thread_index in range(self.THREADS_AMOUNT):
+            self.assertEqual(
+                [str(i) for i in range(self.RECORDS_AMOUNT)],
+                [
+                    i for record_thread_index, i in record_list
+                    if record_thread_index == str(thread_index)
+                ])
+
+    def test_async_mode_off_writes_queued_records(self):
+        logger = NrtLogger()
+        logger.add_stream_handler(self.sh)
+
+        logger.info('msg 1')
+        self.sh.async_mode = False
+        logger.info('msg 2')
+
+        self.assertFalse(self.sh.async_mode)
+        self.assertEqual(
+            '- log: msg 1\n- log: msg 2\n',
+            self.sh.output)
+        self.assertEqual(0, self.sh.dropped_records_amount)
+
+    def test_write_batch_with_single_write(self):
+        stream = WriteCountStringIO()
+        # skipcq: PYL-W0212
+        self.sh._stream = stream
+
+        # skipcq: PYL-W0212
+        self.sh._write_batch([
+            LogRecord('- log: msg 1', LogLevelEnum.INFO),
+            LogRecord('- log: msg 2', LogLevelEnum.ERROR)
+        ])
+
+        self.assertEqual(1, stream.writes)
+        self.assertEqual('- log: msg 1\n- log: msg 2\n', stream.getvalue())
+
+    def test_write_batch_with_file_size_limit(self):
+        file_path = os.path.join(self.TEMP_PATH, 'async_size.log')
+        os.makedirs(self.TEMP_PATH, exist_ok=True)
+        sh = FileStreamHandler(file_path)
+        sh.is_limit_file_size = True
+        sh.max_file_size = 25
+        sh.files_amount = 10
+        log_str = '- log: 12345678901234'
+
+        try:
+            # skipcq: PYL-W0212
+            sh._write_batch(
+                [LogRecord(log_str, LogLevelEnum.INFO) for _ in range(5)])
+            sh.close()
+
+            log_files = \
+                [
+                    file_name
+                    for file_name in os.listdir(self.TEMP_PATH)
+                    if file_name.startswith('async_size')
+                ]
+
+            self.assertEqual(3, len(log_files))
+
+            for file_name in log_files:
+                with open(os.path.join(self.TEMP_PATH, file_name)) as f:
+                    self.assertLessEqual(len(f.read()), 2 * len(log_str) + 2)
+        finally:
+            sh.close()
+
+            for file_name in os.listdir(self.TEMP_PATH):
+                if file_name.startswith('async_size'):
+                    os.remove(os.path.join(self.TEMP_PATH, file_name))
+
+    def test_close_stops_writer_thread(self):
+        file_path = os.path.join(self.TEMP_PATH, 'async_close.log')
+        os.makedirs(self.TEMP_PATH, exist_ok=True)
+        self.sh.close()
+        threads_amount = threading.active_count()
+
+        try:
+            for _ in range(5):
+                logger = NrtLogger()
+                console_sh = StringIOConsoleStreamHandler()
+                file_sh = FileStreamHandler(file_path)
+                sh_list = [console_sh, file_sh]
+
+                for sh in sh_list:
+                    sh.async_mode = True
+                    logger.add_stream_handler(sh)
+
+                logger.info('msg')
+
+                self.assertLess(threads_amount, threading.active_count())
+
+                logger.close_stream_handlers()
+
+                self.assertEqual(threads_amount, threading.active_count())
+                self.assertEqual(
+                    [False, False], [sh.async_mode for sh in sh_list])
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def test_records_are_written_while_async_mode_stops(self):
+        logger = NrtLogger()
+        logger.add_stream_handler(self.sh)
+        self.sh.queue_size = 1
+        # skipcq: PYL-W0212
+        stop_thread = Thread(target=self.sh._stop_async_writer)
+
+        def log():
+            for i in range(self.RECORDS_AMOUNT):
+                logger.info(f'msg {i}')
+
+                if i == self.RECORDS_AMOUNT // 2:
+                    stop_thread.start()
+
+        log()
+        stop_thread.join()
+
+        # Records that are written after stop can be written
+        # before the queue is drained
+        self.assertEqual(
+            sorted(f'msg {i}' for i in range(self.RECORDS_AMOUNT)),
+            sorted(self.sh.output.replace('- log: ', '').splitlines()))
+        self.assertEqual(0, self.sh.dropped_records_amount)
+
+    def test_invalid_queue_size_negative(self):
+        with self.assertRaises(ValueError):
+            self.sh.queue_size = 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,7 @@ from nrt_logging.config import StreamHandlerConfig
 from nrt_logging.log_format import LogElementEnum
 from nrt_logging.log_level import LogLevelEnum
 from nrt_logging.logger_manager import logger_manager
-from nrt_logging.logger_stream_handlers import \
+from nrt_logging.logger_stream_handlers import DepthOverflowPolicyEnum, \
     ManualDepthEnum, LoggerStreamHandlerBase, DEFAULT_MAX_FILE_SIZE
 from tests.test_nrt_logging.test_base import \
     TestBase, stdout_redirect, r_stdout, is_date_in_format
@@ -740,6 +740,111 @@ class LoggerManagerConfigTests(TestBase):
             expected_message,
             log_yaml.get(LogElementEnum.MESSAGE.element_name))
 
+    def test_config_with_max_depth(self):
+        config_dict = {
+            'max_depth': 5,
+            'loggers': [
+                {
+                    'name': self.LOGGER_NAME_1,
+                    'depth_overflow_policy': 'reset_subtree',
+                    'stream_handlers': [
+                        {
+                            'type': 'console'
+                        },
+                        {
+                            'type': 'console',
+                            'max_depth': 2,
+                            'depth_overflow_policy': 'collapse_oldest'
+                        }
+                    ]
+                }
+            ]
+        }
+
+        logger_manager.set_config(config=config_dict)
+        logger = logger_manager.get_logger(self.LOGGER_NAME_1)
+        sh_1, sh_2 = logger.stream_handler_list
+
+        self.assertEqual(5, sh_1.max_depth)
+        self.assertEqual(
+            DepthOverflowPolicyEnum.RESET_SUBTREE, sh_1.depth_overflow_policy)
+        self.assertEqual(2, sh_2.max_depth)
+        self.assertEqual(
+            DepthOverflowPolicyEnum.COLLAPSE_OLDEST,
+            sh_2.depth_overflow_policy)
+
+    def test_config_with_write_buffer(self):
+        config_dict = {
+            'buffer_size': '64 KB',
+            'loggers': [
+                {
+                    'name': self.LOGGER_NAME_1,
+                    'flush_interval': 200,
+                    'stream_handlers': [
+                        {
+                            'type': 'file',
+                            'file_path': os.path.join(
+                                self.TEMP_PATH, 'log_test_buffer_1.log')
+                        },
+                        {
+                            'type': 'file',
+                            'file_path': os.path.join(
+                                self.TEMP_PATH, 'log_test_buffer_2.log'),
+                            'buffer_size': 0,
+                            'flush_log_level': 'WARN'
+                        }
+                    ]
+                }
+            ]
+        }
+
+        logger_manager.set_config(config=config_dict)
+        logger = logger_manager.get_logger(self.LOGGER_NAME_1)
+        sh_1, sh_2 = logger.stream_handler_list
+
+        self.assertEqual(64 * 10 ** 3, sh_1.buffer_size)
+        self.assertEqual(200, sh_1.flush_interval)
+        self.assertEqual(LogLevelEnum.ERROR, sh_1.flush_log_level)
+        self.assertEqual(0, sh_2.buffer_size)
+        self.assertEqual(200, sh_2.flush_interval)
+        self.assertEqual(LogLevelEnum.WARN, sh_2.flush_log_level)
+
+    def test_config_with_rotation_interval(self):
+        config_dict = {
+            'rotation_interval': 'hourly',
+            'loggers': [
+                {
+                    'name': self.LOGGER_NAME_1,
+                    'archive_partition_format': '%Y/%m/%d/%H',
+                    'stream_handlers': [
+                        {
+                            'type': 'file',
+                            'file_path': os.path.join(
+                                self.TEMP_PATH, 'log_test_rotation_1.log')
+                        },
+                        {
+                            'type': 'file',
+                            'file_path': os.path.join(
+                                self.TEMP_PATH, 'log_test_rotation_2.log'),
+                            'rotation_interval': 90,
+                            'is_limit_file_size': True
+                        }
+                    ]
+                }
+            ]
+        }
+
+        logger_manager.set_config(config=config_dict)
+        logger = logger_manager.get_logger(self.LOGGER_NAME_1)
+        sh_1, sh_2 = logger.stream_handler_list
+
+        self.assertEqual(60 * 60, sh_1.rotation_interval)
+        self.assertEqual('%Y/%m/%d/%H', sh_1.archive_partition_format)
+        self.assertFalse(sh_1.is_limit_file_size)
+        self.assertEqual(90, sh_2.rotation_interval)
+        self.assertEqual('%Y/%m/%d/%H', sh_2.archive_partition_format)
+        self.assertTrue(sh_2.is_limit_file_size)
+
 
 class StreamHandlerConfigTests(TestBase):
 
@@ -767,6 +872,34 @@ class StreamHandlerConfigTests(TestBase):
         with self.assertRaises(ValueError, msg=''):
             StreamHandlerConfig(stream_handler_dict, False)
 
+    def test_init_stream_handler_config_with_invalid_depth_negative(self):
+        for stream_handler_dict in [
+            {'type': 'console', 'max_depth': -1},
+            {'type': 'console', 'depth_overflow_policy': 'INVALID_POLICY'}
+        ]:
+            with self.assertRaises(ValueError, msg=''):
+                StreamHandlerConfig(stream_handler_dict, False)
+
+    def test_init_stream_handler_config_with_invalid_buffer_negative(self):
+        for stream_handler_dict in [
+            {'type': 'console', 'buffer_size': -1},
+            {'type': 'console', 'buffer_size': '64 XB'},
+            {'type': 'console', 'flush_interval': -1},
+            {'type': 'console', 'flush_log_level': 'INVALID_LEVEL'}
+        ]:
+            with self.assertRaises(ValueError, msg=''):
+                StreamHandlerConfig(stream_handler_dict, False)
+
+    def test_init_stream_handler_config_with_invalid_rotation_negative(self):
+        for rotation_interval in ['weekly', 0, -1]:
+            with self.assertRaises(ValueError, msg=''):
+                StreamHandlerConfig(
+                    {
+                        'type': 'console',
+                        'rotation_interval': rotation_interval
+                    },
+                    False)
+
 
 if __name__ == '__main__':
     unittest.main()
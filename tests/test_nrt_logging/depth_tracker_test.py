@@ -0,0 +1,484 @@
+import asyncio
+import unittest
+from io import StringIO
+from threading import Thread
+from unittest.mock import patch
+
+import yaml
+from parameterized import parameterized
+
+from nrt_logging.depth_tracker import \
+    ContextDepthTracker, DepthOverflowPolicyEnum, DepthPosition, \
+    DepthState, ThreadDepthTracker
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import ConsoleStreamHandler
+from nrt_logging.stack_capture import StackCapture
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase, get_depth_dict, get_depth_list
+
+
+class DepthStateTests(TestBase):
+
+    def test_child_and_go_up_in_stack(self):
+        state = DepthState()
+        state.start('a')
+
+        self.assertTrue(state.update_depth(['b', 'a'], 0))
+        self.assertTrue(state.update_depth(['c', 'b', 'a'], 0))
+        self.assertEqual(2, state.depth)
+
+        self.assertFalse(state.update_depth(['d', 'a'], 0))
+        self.assertEqual(0, state.depth)
+        self.assertEqual(['a', 'd'], [d.name for d in state.depth_list])
+        self.assertIsNone(state.get_latest_fm_depth('c'))
+
+        self.assertFalse(state.update_depth(['e'], 0))
+        self.assertEqual(0, state.depth)
+        self.assertEqual(['e'], [d.name for d in state.depth_list])
+
+    def test_recursion(self):
+        state = DepthState()
+        state.start('r')
+
+        for i in range(1, 50):
+            self.assertTrue(state.update_depth(['r'] * (i + 1), 0))
+
+        self.assertEqual(49, state.depth)
+        self.assertEqual(state.depth_list[-1], state.get_latest_fm_depth('r'))
+
+        self.assertFalse(state.update_depth(['x'], 0))
+        self.assertEqual(0, state.depth)
+        self.assertIsNone(state.get_latest_fm_depth('r'))
+
+    def test_manual_depth(self):
+        state = DepthState()
+        state.start('a')
+
+        self.assertTrue(state.update_depth(['a'], 1))
+        self.assertTrue(state.update_depth(['a'], 1))
+        self.assertEqual(2, state.get_latest_fm_depth('a').total_manual_depth)
+        self.assertEqual(2, state.depth)
+
+        self.assertFalse(state.update_depth(['a'], -1))
+        self.assertEqual(1, state.depth)
+
+    def test_increase_and_decrease_depth(self):
+        state = DepthState()
+        state.start('a')
+        state.increase_depth('a')
+        state.increase_depth('a')
+
+        self.assertEqual(1, state.pop_increase_depth('a', 0))
+        self.assertEqual(-1, state.pop_increase_depth('a', -1))
+        self.assertEqual(1, state.pop_increase_depth('a', 0))
+        self.assertEqual(0, state.pop_increase_depth('a', 0))
+
+        state.update_depth(['a'], 1)
+        state.update_depth(['b', 'a'], 0)
+        state.update_depth(['a'], 1)
+        self.assertEqual(2, state.depth)
+        self.assertEqual(2, state.get_latest_fm_depth('a').total_manual_depth)
+
+        state.decrease_depth('a')
+        self.assertEqual(0, state.depth)
+        self.assertEqual(['a'], [d.name for d in state.depth_list])
+        self.assertEqual(0, state.get_latest_fm_depth('a').total_manual_depth)
+
+    def test_depth_position_reused(self):
+        depth_position = DepthPosition.get(3, True)
+
+        self.assertEqual(DepthPosition(3, True, False), depth_position)
+        self.assertIs(depth_position, DepthPosition.get(3, True))
+        self.assertIsNot(depth_position, DepthPosition.get(3))
+
+    @parameterized.expand([
+        (DepthOverflowPolicyEnum.CLAMP, False, 3, 0, ['a', 'b', 'c', 'd']),
+        (DepthOverflowPolicyEnum.COLLAPSE_OLDEST, False, 3, 1,
+         ['a', 'b', 'c', 'd']),
+        (DepthOverflowPolicyEnum.RESET_SUBTREE, True, 0, 0, ['d'])
+    ])
+    def test_limit_depth(
+            self,
+            overflow_policy: DepthOverflowPolicyEnum,
+            expected_is_new_tree: bool,
+            expected_depth: int,
+            expected_depth_offset: int,
+            expected_name_list: list[str]):
+
+        state = DepthState()
+        state.start('a')
+        state.update_depth(['b', 'a'], 0)
+        state.update_depth(['c', 'b', 'a'], 0)
+        state.update_depth(['d', 'c', 'b', 'a'], 0)
+
+        self.assertEqual(
+            expected_is_new_tree, state.limit_depth(2, overflow_policy))
+        self.assertEqual(expected_depth, state.depth)
+        self.assertEqual(expected_depth_offset, state.depth_offset)
+        self.assertEqual(
+            expected_name_list, [d.name for d in state.depth_list])
+        self.assertEqual(
+            len(expected_name_list) - 1,
+            state.depth_list.index(state.get_latest_fm_depth('d')))
+
+
+class ThreadDepthTrackerTests(TestBase):
+
+    def test_state_per_thread(self):
+        tracker = ThreadDepthTracker()
+        state = tracker.get_state()
+        state_list = []
+
+        t = Thread(target=lambda: state_list.append(tracker.get_state()))
+        t.start()
+        t.join()
+
+        self.assertIs(state, tracker.get_state())
+        self.assertIsNot(state, state_list[0])
+        self.assertEqual(2, tracker.states_amount)
+
+        state_list.clear()
+        self.assertEqual(1, tracker.states_amount)
+
+
+def log_parent(logger: NrtLogger):
+    logger.info('parent')
+    log_child(logger)
+    logger.increase_depth()
+    logger.trace('parent trace')
+    logger.info('parent info')
+
+
+def log_child(logger: NrtLogger):
+    logger.info('child')
+
+
+def log_recursion(logger: NrtLogger, level: int):
+    logger.info(f'level {level}')
+
+    if level < 4:
+        log_recursion(logger, level + 1)
+
+
+def log_chain_0(logger: NrtLogger):
+    logger.info('f0')
+    log_chain_1(logger)
+    logger.info('f0 after')
+
+
+def log_chain_1(logger: NrtLogger):
+    logger.info('f1')
+    log_chain_2(logger)
+    logger.info('f1 after')
+
+
+def log_chain_2(logger: NrtLogger):
+    logger.info('f2')
+    log_chain_3(logger)
+    logger.info('f2 after')
+
+
+def log_chain_3(logger: NrtLogger):
+    logger.info('f3')
+    log_chain_4(logger)
+    logger.info('f3 after')
+
+
+def log_chain_4(logger: NrtLogger):
+    logger.info('f4')
+
+
+class LoggerDepthTrackerTests(TestBase):
+
+    def test_depth_tracker_shared_by_stream_handlers(self):
+        logger = NrtLogger(LogLevelEnum.TRACE)
+        sh_list = [
+            StringIOConsoleStreamHandler(LogLevelEnum.INFO),
+            StringIOConsoleStreamHandler(LogLevelEnum.INFO),
+            StringIOConsoleStreamHandler(LogLevelEnum.TRACE)
+        ]
+
+        for sh in sh_list:
+            logger.add_stream_handler(sh)
+
+        log_parent(logger)
+
+        output_list = [sh.output for sh in sh_list]
+
+        self.assertEqual(output_list[0], output_list[1])
+        self.assertEqual(
+            '- log: parent\n'
+            '  children:\n'
+            '    - log: child\n'
+            '    - log: parent info\n',
+            output_list[0])
+        self.assertEqual(
+            '- log: parent\n'
+            '  children:\n'
+            '    - log: child\n'
+            '    - log: parent trace\n'
+            '    - log: parent info\n',
+            output_list[2])
+
+        for sh in sh_list:
+            # skipcq: PYL-W0212
+            self.assertEqual(0, sh._depth_tracker.states_amount)
+
+    def test_stream_handler_shared_by_loggers(self):
+        logger_1 = NrtLogger()
+        logger_2 = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger_1.add_stream_handler(sh)
+        logger_2.add_stream_handler(sh)
+
+        logger_1.info('parent')
+        log_child(logger_2)
+
+        self.assertEqual(2, sh.loggers_amount)
+        self.assertEqual(
+            '- log: parent\n'
+            '  children:\n'
+            '    - log: child\n',
+            sh.output)
+
+        logger_1.close_stream_handlers()
+        self.assertEqual(1, sh.loggers_amount)
+
+    @parameterized.expand([
+        (DepthOverflowPolicyEnum.CLAMP, [0, 1, 2, 2, 2]),
+        (DepthOverflowPolicyEnum.COLLAPSE_OLDEST, [0, 1, 2, 2, 2]),
+        (DepthOverflowPolicyEnum.RESET_SUBTREE, [0, 1, 2, 0, 1])
+    ])
+    def test_max_depth(
+            self,
+            overflow_policy: DepthOverflowPolicyEnum,
+            expected_depth_list: list[int]):
+
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        sh.max_depth = 2
+        sh.depth_overflow_policy = overflow_policy
+        logger.add_stream_handler(sh)
+
+        log_recursion(logger, 0)
+
+        self.assertEqual(expected_depth_list, get_depth_list(sh))
+
+        expected_call_site = \
+            'depth_tracker_test.py.log_recursion' \
+            f':{log_recursion.__code__.co_firstlineno + 1}'
+        expected_overflow_amount = \
+            2 if overflow_policy != DepthOverflowPolicyEnum.RESET_SUBTREE \
+            else 1
+
+        self.assertEqual(
+            {expected_call_site: expected_overflow_amount},
+            sh.depth_overflow_dict)
+        self.assertEqual(expected_overflow_amount, sh.depth_overflow_amount)
+
+    @parameterized.expand([
+        (DepthOverflowPolicyEnum.CLAMP, [0, 1, 2, 2, 2, 2, 1, 0, 0]),
+        (DepthOverflowPolicyEnum.COLLAPSE_OLDEST,
+         [0, 1, 2, 2, 2, 1, 0, 0, 0]),
+        (DepthOverflowPolicyEnum.RESET_SUBTREE, [0, 1, 2, 0, 1, 0, 0, 0, 0])
+    ])
+    def test_max_depth_after_return(
+            self,
+            overflow_policy: DepthOverflowPolicyEnum,
+            expected_depth_list: list[int]):
+
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        sh.max_depth = 2
+        sh.depth_overflow_policy = overflow_policy
+        logger.add_stream_handler(sh)
+
+        log_chain_0(logger)
+
+        self.assertEqual(expected_depth_list, get_depth_list(sh))
+        yaml.safe_load(sh.output)
+
+    def test_max_depth_with_increase_depth_in_loop(self):
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        sh.max_depth = 3
+        logger.add_stream_handler(sh)
+
+        for i in range(100):
+            logger.info(str(i))
+            logger.increase_depth()
+
+        self.assertEqual(
+            [0, 1, 2] + [3] * 97, get_depth_list(sh))
+        self.assertEqual(96, sh.depth_overflow_amount)
+
+    def test_max_depth_negative(self):
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+
+        with self.assertRaises(ValueError):
+            sh.max_depth = -1
+
+    def test_depth_context_manager(self):
+        logger_1 = NrtLogger()
+        sh_1 = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger_1.add_stream_handler(sh_1)
+        logger_2 = NrtLogger()
+        sh_2 = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger_2.add_stream_handler(sh_2)
+
+        for i in range(2):
+            logger_1.info(f'parent {i}')
+            logger_1.increase_depth()
+            logger_1.info('child')
+            logger_1.increase_depth()
+            logger_1.info('grandchild')
+            logger_1.decrease_depth()
+            logger_1.decrease_depth()
+
+            logger_2.info(f'parent {i}')
+
+            with logger_2.depth():
+                logger_2.info('child')
+
+                with logger_2.depth():
+                    logger_2.info('grandchild')
+
+        self.assertEqual(sh_1.output, sh_2.output)
+        self.assertEqual([0, 1, 2, 0, 1, 2], get_depth_list(sh_2))
+
+    def test_depth_context_manager_in_span_mode(self):
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger.add_stream_handler(sh)
+        logger.is_span_mode = True
+
+        logger.info('parent')
+
+        with logger.depth():
+            logger.info('child')
+
+        logger.info('sibling of parent')
+
+        self.assertEqual([0, 1, 0], get_depth_list(sh))
+
+    def test_increase_and_decrease_depth_without_stack_capture(self):
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger.add_stream_handler(sh)
+        shared_sh = StringIOConsoleStreamHandler(LogLevelEnum.INFO)
+        logger.add_stream_handler(shared_sh)
+        NrtLogger().add_stream_handler(shared_sh)
+
+        with patch.object(
+                StackCapture, 'build', side_effect=AssertionError):
+            logger.increase_depth()
+            logger.decrease_depth()
+
+            with logger.depth():
+                pass
+
+
+class NullStream(StringIO):
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+class ThreadDepthTrackerSoakTests(TestBase):
+    THREADS_AMOUNT = 100000
+    THREADS_BATCH = 100
+
+    def test_states_released_with_short_lived_threads(self):
+        logger = NrtLogger()
+        sh = ConsoleStreamHandler()
+        # skipcq: PYL-W0212
+        sh._stream = NullStream()
+        logger.add_stream_handler(sh)
+        # skipcq: PYL-W0212
+        depth_tracker = logger._get_depth_tracker(sh)
+
+        def log():
+            logger.info('abc')
+            logger.increase_depth()
+            logger.info('def')
+
+        # State of the main thread is kept
+        log()
+        self.assertEqual(1, depth_tracker.states_amount)
+        max_states_amount = 0
+
+        for _ in range(self.THREADS_AMOUNT // self.THREADS_BATCH):
+            thread_list = [
+                Thread(target=log) for _ in range(self.THREADS_BATCH)]
+
+            for t in thread_list:
+                t.start()
+
+            for t in thread_list:
+                t.join()
+
+            max_states_amount = \
+                max(max_states_amount, depth_tracker.states_amount)
+
+        self.assertEqual(1, max_states_amount)
+
+
+async def task_grandchild(logger: NrtLogger, name: str):
+    logger.info(f'{name} grandchild')
+
+
+async def task_child(logger: NrtLogger, name: str):
+    logger.info(f'{name} child')
+    await asyncio.sleep(0)
+    await task_grandchild(logger, name)
+
+
+async def task(logger: NrtLogger, name: str):
+    logger.info(f'{name} 1')
+    await task_child(logger, name)
+    logger.info(f'{name} 2')
+
+
+async def run_tasks(logger: NrtLogger):
+    await asyncio.gather(task(logger, 'a'), task(logger, 'b'))
+
+
+class ContextDepthTrackerTests(TestBase):
+
+    def test_state_per_task(self):
+        tracker = ContextDepthTracker()
+        state = tracker.get_state()
+
+        async def get_state():
+            await asyncio.sleep(0)
+            return tracker.get_state(), tracker.get_state()
+
+        async def get_states():
+            return await asyncio.gather(get_state(), get_state())
+
+        state_list = asyncio.run(get_states())
+
+        self.assertIs(state, tracker.get_state())
+        self.assertIs(state_list[0][0], state_list[0][1])
+        self.assertIs(state_list[1][0], state_list[1][1])
+        self.assertIsNot(state_list[0][0], state_list[1][0])
+        self.assertIsNot(state, state_list[0][0])
+
+    def test_log_tree_per_task(self):
+        logger = NrtLogger()
+        sh = StringIOConsoleStreamHandler()
+        sh.is_context_depth = True
+        logger.add_stream_handler(sh)
+
+        asyncio.run(run_tasks(logger))
+
+        self.assertEqual(
+            {
+                'a 1': 0, 'a child': 1, 'a grandchild': 2, 'a 2': 0,
+                'b 1': 0, 'b child': 1, 'b grandchild': 2, 'b 2': 0
+            },
+            get_depth_dict(sh))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
+from datetime import datetime, timedelta, timezone
 
 from parameterized import parameterized
 
-from nrt_logging.log_format import LogElementEnum, LogYamlElements
+from nrt_logging.log_format import \
+    LogDateFormat, LogDateFormatter, LogElementEnum, LogLineTemplate, \
+    LogYamlElements
 
 
 class LogElementEnumTests(unittest.TestCase):
@@ -31,12 +34,30 @@ class LogYamlElementsTests(unittest.TestCase):
             LogYamlElements().yaml_elements)
 
     @parameterized.expand([
-        [{LogElementEnum.DATE, LogElementEnum.LOG_LEVEL}],
-        [[LogElementEnum.DATE, LogElementEnum.LOG_LEVEL]]
+        [
+            {LogElementEnum.LOG_LEVEL, LogElementEnum.DATE},
+            (LogElementEnum.DATE, LogElementEnum.LOG_LEVEL)
+        ],
+        [
+            [LogElementEnum.DATE, LogElementEnum.LOG_LEVEL],
+            (LogElementEnum.DATE, LogElementEnum.LOG_LEVEL)
+        ],
+        [
+            [
+                LogElementEnum.MESSAGE,
+                LogElementEnum.DATE,
+                LogElementEnum.MESSAGE
+            ],
+            (LogElementEnum.MESSAGE, LogElementEnum.DATE)
+        ],
+        [
+            (LogElementEnum.LOG_LEVEL, LogElementEnum.DATE),
+            (LogElementEnum.LOG_LEVEL, LogElementEnum.DATE)
+        ]
     ])
-    def test_build(self, log_yaml_elements):
+    def test_build(self, log_yaml_elements, expected_yaml_elements: tuple):
         self.assertEqual(
-            {LogElementEnum.DATE, LogElementEnum.LOG_LEVEL},
+            expected_yaml_elements,
             LogYamlElements.build(log_yaml_elements).yaml_elements)
 
     def test_build_with_invalid_value_negative(self):
@@ -44,5 +65,132 @@ class LogYamlElementsTests(unittest.TestCase):
             LogYamlElements.build('test')
 
 
+class LogLineTemplateTests(unittest.TestCase):
+    DATE = datetime(2022, 1, 1, 10, 0, 0)
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    LOG_LEVEL = 'INFO'
+    PATH = 'test.py.Test'
+    METHOD = 'test_method'
+    LINE_NUMBER = '10'
+    MESSAGE = 'Test {0} \'$date$\'\nmessage'
+
+    @parameterized.expand([
+        ['$date$ [$log_level$] [$path$.$method$:$line_number$] $message$'],
+        ['$message$'],
+        ['no elements'],
+        [''],
+        ['{$message$} {0} \'$message$\' "$message$" $log_level$\n'],
+        ['$date$$date$ $$message$$ $line_number \\'],
+        ['$line_number$ $method$ $path$ $log_level$ $date$']
+    ])
+    def test_render(self, template: str):
+        expected_log_line = \
+            template \
+            .replace(
+                LogElementEnum.DATE.line_format,
+                self.format_date(self.DATE)) \
+            .replace(LogElementEnum.LOG_LEVEL.line_format, self.LOG_LEVEL) \
+            .replace(LogElementEnum.PATH.line_format, self.PATH) \
+            .replace(LogElementEnum.METHOD.line_format, self.METHOD) \
+            .replace(
+                LogElementEnum.LINE_NUMBER.line_format, self.LINE_NUMBER) \
+            .replace(LogElementEnum.MESSAGE.line_format, self.MESSAGE)
+
+        line_template = LogLineTemplate(template)
+
+        self.assertEqual(template, line_template.template)
+        self.assertEqual(
+            expected_log_line,
+            line_template.render(
+                self.DATE,
+                self.format_date,
+                self.LOG_LEVEL,
+                self.PATH,
+                self.METHOD,
+                self.LINE_NUMBER,
+                self.MESSAGE))
+
+    @parameterized.expand([
+        ['$message$', (LogElementEnum.MESSAGE,)],
+        ['test', ()],
+        [
+            '$message$ $log_level$ $message$',
+            (LogElementEnum.LOG_LEVEL, LogElementEnum.MESSAGE)
+        ]
+    ])
+    def test_elements(self, template: str, expected_elements: tuple):
+        self.assertEqual(
+            expected_elements, LogLineTemplate(template).elements)
+
+    def format_date(self, date: datetime) -> str:
+        return date.strftime(self.DATE_FORMAT)
+
+    def test_render_without_date_element(self):
+        line_template = LogLineTemplate('$message$')
+
+        self.assertEqual(
+            self.MESSAGE,
+            line_template.render(
+                None,
+                self.format_date,
+                self.LOG_LEVEL,
+                self.PATH,
+                self.METHOD,
+                self.LINE_NUMBER,
+                self.MESSAGE))
+
+
+class LogDateFormatterTests(unittest.TestCase):
+    DATE_LIST = [
+        datetime(2022, 1, 1, 10, 0, 0),
+        datetime(2022, 1, 1, 10, 0, 0, 1),
+        datetime(2022, 1, 1, 10, 0, 0, 999999),
+        datetime(2022, 1, 1, 10, 0, 1, 500),
+        datetime(2022, 12, 31, 23, 59, 59, 123456),
+        datetime(2022, 12, 31, 23, 59, 59, 123456, timezone.utc)
+    ]
+
+    @parameterized.expand([
+        [LogDateFormat.DEFAULT_DATE_FORMAT],
+        ['%Y-%m-%dT%H:%M:%S.%f'],
+        ['%Y-%m-%d %H:%M:%S'],
+        ['%Y-%m-%dT%H:%M:%S'],
+        ['%s'],
+        ['%s.%f'],
+        ['%H:%M:%S,%f'],
+        ['%f %f'],
+        ['%%f %Y %%%f'],
+        ['%d/%m/%Y %z'],
+        ['date'],
+        ['']
+    ])
+    def test_format(self, date_format: str):
+        formatter = LogDateFormatter(date_format)
+
+        for date in self.DATE_LIST + self.DATE_LIST:
+            self.assertEqual(
+                date.strftime(date_format), formatter.format(date))
+
+    def test_format_same_second(self):
+        formatter = LogDateFormatter('%H:%M:%S.%f')
+        date = datetime(2022, 1, 1, 10, 0, 0, 100)
+
+        self.assertEqual('10:00:00.000100', formatter.format(date))
+        self.assertEqual(
+            '10:00:00.000200',
+            formatter.format(date + timedelta(microseconds=100)))
+        self.assertEqual(
+            '10:00:01.000200',
+            formatter.format(date + timedelta(seconds=1, microseconds=100)))
+
+    def test_get(self):
+        formatter = LogDateFormatter.get('%H:%M:%S.%f')
+
+        self.assertIs(formatter, LogDateFormatter.get('%H:%M:%S.%f'))
+        self.assertIs(formatter, LogDateFormat('%H:%M:%S.%f').formatter)
+        self.assertEqual('%H:%M:%S.%f', formatter.date_format)
+        self.assertIsNot(formatter, LogDateFormatter.get('%H:%M:%S'))
+
+
 if __name__ == '__main__':
     unittest.main()
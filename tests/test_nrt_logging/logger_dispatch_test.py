@@ -0,0 +1,127 @@
+import gc
+import unittest
+
+from parameterized import parameterized
+
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from tests.test_nrt_logging.logger_lazy_message_test import MsgSupplier
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase, create_logger
+
+
+class ClassLogLevelStreamHandler(StringIOConsoleStreamHandler):
+    """
+    Stream handler with the log level of its class.
+    """
+
+
+class LoggerDispatchTests(TestBase):
+
+    @parameterized.expand([
+        [LogLevelEnum.INFO, LogLevelEnum.TRACE, ['debug', 'trace']],
+        [LogLevelEnum.TRACE, LogLevelEnum.WARN, ['info', 'debug', 'trace']],
+        [LogLevelEnum.TRACE, LogLevelEnum.TRACE, []]
+    ])
+    def test_disabled_log_methods(
+            self,
+            logger_log_level: LogLevelEnum,
+            sh_log_level: LogLevelEnum,
+            expected_disabled_methods: list[str]):
+
+        logger, _ = create_logger(logger_log_level, sh_log_level)
+
+        self.assertEqual(
+            expected_disabled_methods,
+            [
+                method_name
+                for method_name in
+                ['critical', 'error', 'warn', 'info', 'debug', 'trace']
+                if method_name in vars(logger)
+            ])
+        self.assertEqual(
+            'trace' in expected_disabled_methods,
+            'snapshot' in vars(logger))
+
+    def test_update_logger_log_level(self):
+        logger, sh_list = create_logger(LogLevelEnum.INFO)
+        msg_supplier = MsgSupplier()
+
+        logger.debug(msg_supplier)
+        logger.log_level = LogLevelEnum.DEBUG
+        logger.debug(msg_supplier)
+        logger.update_log_level(LogLevelEnum.ERROR, False)
+        logger.debug(msg_supplier)
+        logger.error('error')
+
+        self.assertEqual(1, msg_supplier.calls)
+        self.assertEqual(['msg 1', 'error'], sh_list[0].msg_list)
+
+    def test_update_stream_handler_log_level(self):
+        logger, sh_list = \
+            create_logger(
+                LogLevelEnum.TRACE, LogLevelEnum.INFO, LogLevelEnum.ERROR)
+        logger_2 = NrtLogger(LogLevelEnum.TRACE)
+        logger_2.add_stream_handler(sh_list[1])
+
+        logger.debug('debug 1')
+        logger_2.debug('debug 1')
+        sh_list[1].log_level = LogLevelEnum.DEBUG
+        logger.debug('debug 2')
+        logger_2.debug('debug 2')
+        sh_list[1].log_level = LogLevelEnum.CRITICAL
+        logger.info('info')
+
+        self.assertEqual(['info'], sh_list[0].msg_list)
+        self.assertEqual(['debug 2', 'debug 2'], sh_list[1].msg_list)
+
+    def test_set_log_level_of_stream_handler_class(self):
+        ClassLogLevelStreamHandler.set_log_level(LogLevelEnum.INFO)
+        sh = ClassLogLevelStreamHandler()
+        logger = NrtLogger(LogLevelEnum.TRACE)
+        logger.add_stream_handler(sh, is_min_sh_logger_level=False)
+
+        logger.debug('debug 1')
+        ClassLogLevelStreamHandler.set_log_level(LogLevelEnum.DEBUG)
+        logger.debug('debug 2')
+
+        self.assertEqual(LogLevelEnum.DEBUG, sh.log_level)
+        self.assertEqual(['debug 2'], sh.msg_list)
+
+    def test_add_and_close_stream_handlers(self):
+        logger = NrtLogger(LogLevelEnum.TRACE)
+        sh = StringIOConsoleStreamHandler(LogLevelEnum.ERROR)
+
+        with self.assertRaises(RuntimeError):
+            logger.trace('no stream handler')
+
+        logger.add_stream_handler(sh, is_min_sh_logger_level=False)
+        logger.trace('trace')
+        logger.error('error')
+        logger.close_stream_handlers()
+
+        self.assertEqual(['error'], sh.msg_list)
+        # skipcq: PYL-W0212
+        self.assertEqual(0, len(sh._logger_set))
+
+        with self.assertRaises(RuntimeError):
+            logger.trace('no stream handler')
+
+    def test_garbage_collected_logger_is_removed_from_stream_handler(self):
+        sh = StringIOConsoleStreamHandler()
+        logger = NrtLogger()
+        logger.add_stream_handler(sh)
+
+        # skipcq: PYL-W0212
+        self.assertEqual(1, len(sh._logger_set))
+
+        del logger
+        gc.collect()
+
+        # skipcq: PYL-W0212
+        self.assertEqual(0, len(sh._logger_set))
+        sh.log_level = LogLevelEnum.INFO
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from parameterized import parameterized
+
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger_stream_handlers import ManualDepthEnum
+from tests.test_nrt_logging.test_base import TestBase, create_logger
+
+
+class MsgSupplier:
+    calls: int
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        return f'msg {self.calls}'
+
+
+class LoggerLazyMessageTests(TestBase):
+
+    @parameterized.expand([
+        ['x=%s y=%r', (1, 'a'), "x=1 y='a'"],
+        ['%d%%', (50,), '50%'],
+        ['%(a)s-%(b)s', ({'a': 1, 'b': 2},), '1-2'],
+        ['no args', (), 'no args'],
+        ['%s', ((1, 2),), '(1, 2)']
+    ])
+    def test_printf_args(self, msg: str, args: tuple, expected_msg: str):
+        logger, sh_list = create_logger()
+
+        logger.info(msg, *args)
+
+        self.assertEqual([expected_msg], sh_list[0].msg_list)
+
+    def test_callable_msg_is_created_once_for_all_handlers(self):
+        logger, sh_list = \
+            create_logger(
+                LogLevelEnum.TRACE, LogLevelEnum.DEBUG, LogLevelEnum.TRACE)
+        msg_supplier = MsgSupplier()
+
+        logger.debug(msg_supplier)
+
+        self.assertEqual(1, msg_supplier.calls)
+        self.assertEqual(['msg 1'], sh_list[0].msg_list)
+        self.assertIs(sh_list[0].msg_list[0], sh_list[1].msg_list[0])
+
+    def test_callable_msg_with_printf_args(self):
+        logger, sh_list = create_logger()
+
+        logger.warn(lambda: 'x=%s', 5)
+
+        self.assertEqual(['x=5'], sh_list[0].msg_list)
+
+    @parameterized.expand([
+        [LogLevelEnum.INFO, LogLevelEnum.TRACE],
+        [LogLevelEnum.TRACE, LogLevelEnum.INFO]
+    ])
+    def test_filtered_msg_is_not_created(
+            self,
+            logger_log_level: LogLevelEnum,
+            sh_log_level: LogLevelEnum):
+
+        logger, sh_list = create_logger(logger_log_level, sh_log_level)
+        msg_supplier = MsgSupplier()
+
+        logger.debug(msg_supplier)
+        logger.debug('%s', msg_supplier)
+
+        self.assertEqual(0, msg_supplier.calls)
+        self.assertEqual([], sh_list[0].msg_list)
+
+    @parameterized.expand([
+        [('child',), {}, 'child', ManualDepthEnum.NO_CHANGE],
+        [
+            ('child', ManualDepthEnum.INCREASE),
+            {},
+            'child',
+            ManualDepthEnum.INCREASE
+        ],
+        [
+            ('child %s', 1, ManualDepthEnum.DECREASE),
+            {},
+            'child 1',
+            ManualDepthEnum.DECREASE
+        ],
+        [
+            ('child %s', 1),
+            {'manual_depth': ManualDepthEnum.INCREASE},
+            'child 1',
+            ManualDepthEnum.INCREASE
+        ]
+    ])
+    def test_manual_depth(
+            self,
+            args: tuple,
+            kwargs: dict,
+            expected_msg: str,
+            expected_manual_depth: ManualDepthEnum):
+
+        logger, sh_list = create_logger()
+
+        logger.error(*args, **kwargs)
+
+        self.assertEqual([expected_msg], sh_list[0].msg_list)
+        self.assertEqual(
+            [expected_manual_depth], sh_list[0].manual_depth_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
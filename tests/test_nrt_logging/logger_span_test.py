@@ -0,0 +1,338 @@
+import asyncio
+import sys
+import unittest
+
+import yaml
+
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import ManualDepthEnum
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase, get_depth_dict
+
+TEST_FILE_NAME = 'logger_span_test.py'
+
+
+def create_span_logger(
+        is_span_mode: bool = True) \
+        -> tuple[NrtLogger, StringIOConsoleStreamHandler]:
+
+    logger = NrtLogger()
+    sh = StringIOConsoleStreamHandler()
+    logger.add_stream_handler(sh)
+    logger.is_span_mode = is_span_mode
+    return logger, sh
+
+
+class LoggerSpanTests(TestBase):
+
+    def test_span(self):
+        logger, sh = create_span_logger()
+
+        logger.info('root')
+
+        with logger.span('outer'):
+            logger.info('a')
+
+            with logger.span('inner'):
+                logger.info('b')
+
+            logger.info('c')
+
+        logger.info('root 2')
+
+        self.assertEqual(
+            [
+                {'log': 'root'},
+                {'log': 'outer',
+                 'children': [
+                     {'log': 'a'},
+                     {'log': 'inner', 'children': [{'log': 'b'}]},
+                     {'log': 'c'}
+                 ]},
+                {'log': 'root 2'}
+            ],
+            yaml.safe_load(sh.output))
+
+    def test_span_with_stream_handlers_log_levels(self):
+        logger, debug_sh = create_span_logger()
+        logger.log_level = LogLevelEnum.DEBUG
+        debug_sh.log_level = LogLevelEnum.DEBUG
+        info_sh = StringIOConsoleStreamHandler()
+        warn_sh = StringIOConsoleStreamHandler()
+        warn_sh.log_level = LogLevelEnum.WARN
+        logger.add_stream_handler(info_sh)
+        logger.add_stream_handler(warn_sh)
+
+        with logger.span('outer'):
+            logger.debug('debug child')
+            logger.info('info child')
+            logger.warn('warn child')
+
+            with logger.span('inner', LogLevelEnum.DEBUG):
+                logger.info('inner info')
+
+        logger.warn('root')
+
+        self.assertEqual(
+            [
+                {'log': 'outer',
+                 'children': [
+                     {'log': 'debug child'},
+                     {'log': 'info child'},
+                     {'log': 'warn child'},
+                     {'log': 'inner', 'children': [{'log': 'inner info'}]}
+                 ]},
+                {'log': 'root'}
+            ],
+            yaml.safe_load(debug_sh.output))
+        self.assertEqual(
+            [
+                {'log': 'outer',
+                 'children': [
+                     {'log': 'info child'},
+                     {'log': 'warn child'},
+                     {'log': 'inner info'}
+                 ]},
+                {'log': 'root'}
+            ],
+            yaml.safe_load(info_sh.output))
+        self.assertEqual(
+            [{'log': 'warn child'}, {'log': 'root'}],
+            yaml.safe_load(warn_sh.output))
+
+    def test_span_captures_only_call_site(self):
+        logger, sh = create_span_logger()
+
+        with logger.span('span'):
+            line_number = sys._getframe().f_lineno + 1
+            logger.info('abc')
+
+        for stack_capture in sh.stack_capture_list:
+            self.assertEqual(1, len(stack_capture.frame_name_list))
+
+        call_site = sh.stack_capture_list[1].call_site
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}', call_site.path)
+        self.assertEqual('test_span_captures_only_call_site', call_site.method)
+        self.assertEqual(str(line_number), call_site.line_number)
+
+    def test_traced(self):
+        logger, sh = create_span_logger()
+
+        @logger.traced
+        def recursion(level: int) -> int:
+            logger.info(f'level {level}')
+
+            if level > 0:
+                return recursion(level - 1)
+
+            return level
+
+        @logger.traced(msg='traced', log_level=LogLevelEnum.ERROR)
+        def error():
+            logger.info('in traced')
+
+        line_number = sys._getframe().f_lineno + 1
+        self.assertEqual(0, recursion(1))
+        error()
+
+        self.assertEqual(
+            [
+                {'log': 'LoggerSpanTests.test_traced.<locals>.recursion',
+                 'children': [
+                     {'log': 'level 1'},
+                     {'log': 'LoggerSpanTests.test_traced.<locals>.recursion',
+                      'children': [{'log': 'level 0'}]}
+                 ]},
+                {'log': 'traced', 'children': [{'log': 'in traced'}]}
+            ],
+            yaml.safe_load(sh.output))
+        self.assertEqual(
+            str(line_number), sh.stack_capture_list[0].call_site.line_number)
+        self.assertEqual(
+            'test_traced', sh.stack_capture_list[0].call_site.method)
+
+    def test_traced_generator(self):
+        logger, sh = create_span_logger()
+
+        @logger.traced(msg='gen')
+        def gen(amount: int):
+            for i in range(amount):
+                logger.info(f'gen {i}')
+                yield i
+
+            return amount
+
+        def consume():
+            return (yield from gen(2))
+
+        item_list = []
+        consumer = consume()
+
+        with self.assertRaises(StopIteration) as e:
+            while True:
+                item = next(consumer)
+                logger.info(f'consumer {item}')
+                item_list.append(item)
+
+        self.assertEqual(2, e.exception.value)
+        self.assertEqual([0, 1], item_list)
+        self.assertEqual(
+            {'gen': 0, 'gen 0': 1, 'consumer 0': 0,
+             'gen 1': 1, 'consumer 1': 0},
+            get_depth_dict(sh))
+        self.assertEqual(3, len(yaml.safe_load(sh.output)))
+
+    def test_traced_generator_close(self):
+        logger, sh = create_span_logger()
+
+        @logger.traced(msg='gen')
+        def gen():
+            try:
+                yield 1
+            finally:
+                logger.info('closed')
+
+        g = gen()
+        self.assertEqual(1, next(g))
+        g.close()
+        logger.info('root')
+
+        self.assertEqual(
+            {'gen': 0, 'closed': 1, 'root': 0}, get_depth_dict(sh))
+
+    def test_traced_async_generator(self):
+        logger, sh = create_span_logger()
+
+        @logger.traced(msg='gen')
+        async def gen(amount: int):
+            for i in range(amount):
+                await asyncio.sleep(0)
+                logger.info(f'gen {i}')
+                yield i
+
+        async def consume() -> list[int]:
+            item_list = []
+
+            async for item in gen(2):
+                logger.info(f'consumer {item}')
+                item_list.append(item)
+
+            return item_list
+
+        self.assertEqual([0, 1], asyncio.run(consume()))
+        self.assertEqual(
+            {'gen': 0, 'gen 0': 1, 'consumer 0': 0,
+             'gen 1': 1, 'consumer 1': 0},
+            get_depth_dict(sh))
+
+    def test_traced_async_tasks(self):
+        logger, sh = create_span_logger()
+
+        @logger.traced
+        async def task(name: str):
+            logger.info(f'{name} 1')
+            await asyncio.sleep(0)
+
+            with logger.span(f'{name} span'):
+                await asyncio.sleep(0)
+                logger.info(f'{name} 2')
+
+        async def run_tasks():
+            await asyncio.gather(task('a'), task('b'))
+
+        asyncio.run(run_tasks())
+
+        self.assertEqual(
+            {
+                'a 1': 1, 'a span': 1, 'a 2': 2,
+                'b 1': 1, 'b span': 1, 'b 2': 2
+            },
+            {name: depth for name, depth in get_depth_dict(sh).items()
+             if not name.endswith('task')})
+
+    def test_span_with_interleaved_async_tasks(self):
+        logger, sh = create_span_logger()
+
+        async def task_a():
+            with logger.span('a span'):
+                with logger.span('a inner'):
+                    await asyncio.sleep(0)
+                    await asyncio.sleep(0)
+                    logger.info('a child')
+
+            logger.info('a root')
+
+        async def task_b():
+            await asyncio.sleep(0)
+            logger.info('b root')
+
+        async def run_tasks():
+            await asyncio.gather(task_a(), task_b())
+
+        asyncio.run(run_tasks())
+
+        self.assertEqual(
+            {'a span': 0, 'a inner': 1, 'b root': 0, 'a child': 2,
+             'a root': 0},
+            get_depth_dict(sh))
+        self.assertEqual(
+            [
+                {'log': 'a span',
+                 'children': [
+                     {'log': 'a inner',
+                      'children': [{'log': 'a child'}]}
+                 ]},
+                {'log': 'a root'}
+            ],
+            yaml.safe_load(
+                '\n'.join(
+                    line for line in sh.output.split('\n')
+                    if 'b root' not in line)))
+
+    def test_span_without_span_mode(self):
+        logger, sh = create_span_logger(is_span_mode=False)
+
+        logger.info('root')
+
+        with logger.span('span'):
+            logger.info('in span')
+
+        logger.info('after span')
+
+        self.assertEqual(
+            {'root': 0, 'span': 0, 'in span': 1, 'after span': 0},
+            get_depth_dict(sh))
+        self.assertLess(1, len(sh.stack_capture_list[0].frame_name_list))
+        self.assertEqual(1, len(sh.stack_capture_list[2].frame_name_list))
+
+    def test_span_mode_ignores_manual_depth(self):
+        logger, sh = create_span_logger()
+
+        logger.info('a')
+        logger.increase_depth()
+        logger.info('b', ManualDepthEnum.INCREASE)
+        logger.decrease_depth()
+        logger.info('c')
+
+        self.assertEqual({'a': 0, 'b': 0, 'c': 0}, get_depth_dict(sh))
+
+    def test_span_mode_snapshot(self):
+        logger, sh = create_span_logger()
+        logger.log_level = LogLevelEnum.TRACE
+        sh.log_level = LogLevelEnum.TRACE
+
+        with logger.span('span'):
+            logger.snapshot(methods_depth=2)
+
+        log_list = yaml.safe_load(sh.output)
+
+        self.assertEqual(1, len(log_list))
+        self.assertEqual(1, len(log_list[0]['children']))
+        self.assertEqual(
+            2, log_list[0]['children'][0]['log'].count('Frame: '))
+
+
+if __name__ == '__main__':
+    unittest.main()
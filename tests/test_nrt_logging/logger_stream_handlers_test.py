@@ -1,6 +1,6 @@
 import os
 import unittest
-from time import sleep
+from time import localtime, sleep, strftime, time
 
 import yaml
 from parameterized import parameterized
@@ -10,8 +10,8 @@ from nrt_logging.log_format import \
 from nrt_logging.log_level import LogLevelEnum
 from nrt_logging.logger_manager import logger_manager
 from nrt_logging.logger_stream_handlers import \
-    LogStyleEnum, FileStreamHandler, \
-    ManualDepthEnum, FileSizeEnum, ConsoleStreamHandler
+    LogStyleEnum, FileStreamHandler, IndentationTable, \
+    ManualDepthEnum, FileSizeEnum, ConsoleStreamHandler, RotationIntervalEnum
 from tests.test_nrt_logging.test_base import \
     NAME_2, TestBase
 
@@ -226,6 +226,36 @@ class FileStreamHandlerTests(TestBase):
             original_log_yaml_elements.yaml_elements,
             ConsoleStreamHandler().log_yaml_elements.yaml_elements)
 
+    def test_log_yaml_elements_order(self):
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.YAML
+        sh.log_yaml_elements = \
+            [LogElementEnum.MESSAGE, LogElementEnum.LOG_LEVEL]
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+        logger.increase_depth()
+        logger.warn('msg 2\nline 2')
+        sh.log_yaml_elements = [LogElementEnum.METHOD]
+        logger.info('msg 3')
+        logger.decrease_depth()
+
+        with open(self.FILE_PATH) as f:
+            log_str = f.read()
+
+        self.assertEqual(
+            '---\n'
+            'message: msg 1\n'
+            'log_level: INFO\n'
+            'children:\n'
+            '  - message: |-\n'
+            '      msg 2\n'
+            '      line 2\n'
+            '    log_level: WARN\n'
+            '  - method: test_log_yaml_elements_order\n',
+            log_str)
+
     def test_set_log_line_template(self):
         original_log_line_template = ConsoleStreamHandler().log_line_template
         updated_log_line_template = 'test 123 $message$'
@@ -253,6 +283,361 @@ class FileStreamHandlerTests(TestBase):
         with self.assertRaises(ValueError):
             file_stream_handler.files_amount = -1
 
+    def test_log_file_is_kept_open(self):
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+        # skipcq: PYL-W0212
+        stream = sh._stream
+        logger.info('msg 2')
+
+        # skipcq: PYL-W0212
+        self.assertIs(stream, sh._stream)
+        self.assertFalse(stream.closed)
+
+        with open(self.FILE_PATH) as f:
+            self.assertEqual('- log: msg 1\n- log: msg 2\n', f.read())
+
+        sh.close()
+
+        self.assertTrue(stream.closed)
+
+        logger.info('msg 3')
+
+        with open(self.FILE_PATH) as f:
+            self.assertEqual(
+                '- log: msg 1\n- log: msg 2\n- log: msg 3\n',
+                f.read())
+
+    @parameterized.expand([[True], [False]])
+    def test_log_file_is_reopened_after_external_move(self, is_delete: bool):
+        moved_file_path = os.path.join(self.TEMP_PATH, 'moved_log_test.log')
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.file_check_interval = 0
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+        os.replace(self.FILE_PATH, moved_file_path)
+
+        if is_delete:
+            os.remove(moved_file_path)
+
+        logger.info('msg 2')
+
+        with open(self.FILE_PATH) as f:
+            self.assertEqual('- log: msg 2\n', f.read())
+
+        if not is_delete:
+            with open(moved_file_path) as f:
+                self.assertEqual('- log: msg 1\n', f.read())
+
+    def test_write_buffer_flush_log_level(self):
+        sh = self.__create_buffered_file_stream_handler(1000, 0)
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+
+        self.assertEqual('', self.__read_log())
+
+        logger.error('msg 2')
+
+        self.assertEqual('- log: msg 1\n- log: msg 2\n', self.__read_log())
+
+        logger.info('msg 3')
+        logger.flush()
+
+        self.assertEqual(
+            '- log: msg 1\n- log: msg 2\n- log: msg 3\n', self.__read_log())
+
+    def test_write_buffer_is_written_when_full(self):
+        sh = self.__create_buffered_file_stream_handler(1000, 0)
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        for _ in range(9):
+            logger.info(self.MSG_100_BYTES)
+
+        self.assertEqual('', self.__read_log())
+
+        logger.info(self.MSG_100_BYTES)
+
+        self.assertGreater(len(self.__read_log()), 900)
+
+    def test_write_buffer_flush_interval(self):
+        sh = self.__create_buffered_file_stream_handler(1000, 50)
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+        sleep(0.5)
+
+        self.assertEqual('- log: msg 1\n', self.__read_log())
+
+    def test_async_mode_write_buffer(self):
+        sh = self.__create_buffered_file_stream_handler(1000, 0)
+        sh.async_mode = True
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        try:
+            logger.info('msg 1')
+            logger.error('msg 2')
+            logger.info('msg 3')
+            logger.flush()
+        finally:
+            sh.async_mode = False
+
+        self.assertEqual(
+            '- log: msg 1\n- log: msg 2\n- log: msg 3\n', self.__read_log())
+
+    def test_limit_file_size_by_written_size(self):
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.is_limit_file_size = True
+        sh.files_amount = 2
+        sh.max_file_size = 1000
+        sh.file_check_interval = 60 * 1000
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+        stat = os.stat
+        stat_calls = []
+
+        def count_stat(*args, **kwargs):
+            stat_calls.append(args)
+            return stat(*args, **kwargs)
+
+        os.stat = count_stat
+
+        try:
+            for _ in range(11):
+                logger.info(self.MSG_100_BYTES)
+        finally:
+            os.stat = stat
+
+        log_files = os.listdir(self.TEMP_PATH)
+
+        # Log file exists check on archive only
+        self.assertEqual([(self.FILE_PATH,)], stat_calls)
+        self.assertEqual(2, len(log_files))
+        self.assertEqual(
+            len(f'- log: {self.MSG_100_BYTES}\n'),
+            os.path.getsize(self.FILE_PATH))
+
+    def test_limit_file_size_of_multi_byte_messages(self):
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.is_limit_file_size = True
+        sh.files_amount = 10
+        sh.max_file_size = 1000
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+        msg = '\u20ac' * 50
+
+        for _ in range(20):
+            logger.info(msg)
+
+        # skipcq: PYL-W0212
+        record_size = \
+            len(f'- log: {msg}{os.linesep}'.encode(sh._stream.encoding))
+        sh.close()
+        file_size_list = \
+            [os.path.getsize(os.path.join(self.TEMP_PATH, file_name))
+             for file_name in os.listdir(self.TEMP_PATH)]
+
+        self.assertEqual(20 * record_size, sum(file_size_list))
+
+        for file_size in file_size_list:
+            self.assertLess(file_size, sh.max_file_size + record_size)
+
+    def test_rotation_interval(self):
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.rotation_interval = 1
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg 1')
+        sleep(1.1)
+        logger.info('msg 2')
+        sleep(0.1)
+
+        log_files = sorted(os.listdir(self.TEMP_PATH))
+
+        self.assertEqual(2, len(log_files))
+        self.assertEqual(self.FILE_NAME, log_files[0])
+
+        with open(os.path.join(self.TEMP_PATH, log_files[1])) as f:
+            self.assertEqual('- log: msg 1\n', f.read())
+
+        self.assertEqual('- log: msg 2\n', self.__read_log())
+
+    def test_archive_partition_of_previous_rotation_interval(self):
+        partition_format = os.path.join('%Y', '%m', '%d')
+        day_seconds = 24 * 60 * 60
+        log_time_list = [time() - 3 * day_seconds, time() - 2 * day_seconds]
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.rotation_interval = RotationIntervalEnum.DAILY
+        sh.archive_partition_format = partition_format
+        sh.files_amount = 1
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        for i, log_time in enumerate(log_time_list):
+            with open(self.FILE_PATH, 'a') as f:
+                f.write(f'- log: old msg {i}\n')
+
+            os.utime(self.FILE_PATH, (log_time, log_time))
+            logger.info(f'msg {i}')
+            sh.close()
+            # Wait for archive files amount limit
+            sleep(0.2)
+
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(
+                    self.TEMP_PATH,
+                    strftime(partition_format, localtime(log_time_list[0])))))
+
+        partition_path = \
+            os.path.join(
+                self.TEMP_PATH,
+                strftime(partition_format, localtime(log_time_list[1])))
+        archive_files = os.listdir(partition_path)
+
+        self.assertEqual(1, len(archive_files))
+
+        with open(os.path.join(partition_path, archive_files[0])) as f:
+            self.assertEqual('- log: msg 0\n- log: old msg 1\n', f.read())
+
+        self.assertEqual('- log: msg 1\n', self.__read_log())
+
+    @parameterized.expand([
+        [0, 1, 2],
+        [3, 3, 0]
+    ])
+    def test_limit_files_amount_by_partitions(
+            self,
+            newest_archives_amount: int,
+            expected_newest_archives_amount: int,
+            expected_previous_archives_amount: int):
+
+        partition_format = os.path.join('%Y', '%m', '%d', '%H')
+        hour_seconds = 60 * 60
+        archive_time_list = \
+            [time() - i * hour_seconds for i in range(4)]
+        partition_path_list = \
+            [
+                os.path.join(
+                    self.TEMP_PATH,
+                    strftime(partition_format, localtime(archive_time)))
+                for archive_time in archive_time_list
+            ]
+        other_dir_path = os.path.join(self.TEMP_PATH, 'other')
+        os.makedirs(other_dir_path)
+
+        for i, partition_path in enumerate(partition_path_list):
+            os.makedirs(partition_path, exist_ok=True)
+            archives_amount = newest_archives_amount if i == 0 else 2
+
+            for j in range(archives_amount):
+                archive_date = \
+                    strftime(
+                        '%Y_%m_%d_%H_%M_%S',
+                        localtime(archive_time_list[i] - hour_seconds / 2))
+                archive_file_path = \
+                    os.path.join(
+                        partition_path,
+                        f'{self.FILE_NAME_PREFIX}_{archive_date}_00000{j}'
+                        f'.{self.FILE_EXTENSION}')
+
+                with open(archive_file_path, 'w') as f:
+                    f.write(f'- log: archive {i} {j}\n')
+
+        # File of other log file in shared partition
+        other_file_path = \
+            os.path.join(
+                partition_path_list[-1], f'other.{self.FILE_EXTENSION}')
+
+        with open(other_file_path, 'w') as f:
+            f.write('- log: other\n')
+
+        with open(self.FILE_PATH, 'w') as f:
+            f.write('- log: old msg\n')
+
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.is_limit_file_size = True
+        sh.max_file_size = 1
+        sh.files_amount = 3
+        sh.archive_partition_format = partition_format
+        logger = logger_manager.get_logger(NAME_2)
+        logger.add_stream_handler(sh)
+
+        logger.info('msg')
+        # Wait for archive files amount limit
+        sleep(0.2)
+
+        self.assertEqual(
+            expected_newest_archives_amount,
+            len(os.listdir(partition_path_list[0])))
+
+        if expected_previous_archives_amount > 0:
+            self.assertEqual(
+                expected_previous_archives_amount,
+                len(os.listdir(partition_path_list[1])))
+        else:
+            self.assertFalse(os.path.exists(partition_path_list[1]))
+
+        self.assertFalse(os.path.exists(partition_path_list[2]))
+        self.assertEqual(
+            [f'other.{self.FILE_EXTENSION}'],
+            os.listdir(partition_path_list[3]))
+        self.assertTrue(os.path.exists(other_dir_path))
+
+    def test_invalid_write_buffer_negative(self):
+        file_stream_handler = FileStreamHandler('/test.txt')
+
+        with self.assertRaises(ValueError):
+            file_stream_handler.buffer_size = -1
+
+        with self.assertRaises(ValueError):
+            file_stream_handler.flush_interval = -1
+
+        with self.assertRaises(ValueError):
+            file_stream_handler.file_check_interval = -1
+
+        with self.assertRaises(ValueError):
+            file_stream_handler.rotation_interval = 0
+
+    def __create_buffered_file_stream_handler(
+            self, buffer_size: int, flush_interval: int) -> FileStreamHandler:
+
+        sh = FileStreamHandler(self.FILE_PATH)
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = LogElementEnum.MESSAGE.line_format
+        sh.buffer_size = buffer_size
+        sh.flush_interval = flush_interval
+        return sh
+
+    def __read_log(self) -> str:
+        if not os.path.exists(self.FILE_PATH):
+            return ''
+
+        with open(self.FILE_PATH) as f:
+            return f.read()
+
 
 class FileSizeEnumTests(TestBase):
 
@@ -318,5 +703,95 @@ class FileSizeEnumTests(TestBase):
             FileSizeEnum.get_bytes(file_size_str)
 
 
+class RotationIntervalEnumTests(TestBase):
+
+    @parameterized.expand([
+        ['hourly', 60 * 60],
+        ['DAILY', 24 * 60 * 60],
+        ['90', 90],
+        [90, 90]
+    ])
+    def test_get_seconds(self, rotation_interval, expected_seconds: int):
+        self.assertEqual(
+            expected_seconds,
+            RotationIntervalEnum.get_seconds(rotation_interval))
+
+    @parameterized.expand([['weekly'], ['-5'], ['0'], [0], [-5]])
+    def test_get_seconds_negative(self, rotation_interval):
+        with self.assertRaises(ValueError):
+            RotationIntervalEnum.get_seconds(rotation_interval)
+
+
+class IndentationTableTests(unittest.TestCase):
+
+    @parameterized.expand([
+        [LogStyleEnum.YAML, 0, '', 'children:', '\n  ', '- log: '],
+        [
+            LogStyleEnum.YAML,
+            2,
+            ' ' * 8,
+            '    children:',
+            '\n' + ' ' * 10,
+            ' ' * 8 + '- log: '
+        ],
+        [
+            LogStyleEnum.LINE,
+            1,
+            ' ' * 4,
+            '  children:',
+            '\n' + ' ' * 8,
+            ' ' * 4 + '- log: '
+        ],
+        [
+            LogStyleEnum.LINE,
+            3,
+            ' ' * 12,
+            ' ' * 10 + 'children:',
+            '\n' + ' ' * 16,
+            ' ' * 12 + '- log: '
+        ]
+    ])
+    def test_get(
+            self,
+            style: LogStyleEnum,
+            depth: int,
+            expected_spaces: str,
+            expected_children_header: str,
+            expected_multiline_separator: str,
+            expected_line_prefix: str):
+
+        depth_indentation = self.__create_table(style).get(depth)
+
+        self.assertEqual(expected_spaces, depth_indentation.spaces)
+        self.assertEqual(
+            expected_children_header, depth_indentation.children_header)
+        self.assertEqual(
+            expected_multiline_separator,
+            depth_indentation.multiline_separator)
+        self.assertEqual(expected_line_prefix, depth_indentation.line_prefix)
+
+    def test_get_grows_lazily(self):
+        table = self.__create_table(LogStyleEnum.LINE)
+
+        self.assertEqual(0, table.depths_amount)
+
+        depth_indentation = table.get(5)
+
+        self.assertEqual(6, table.depths_amount)
+        self.assertIs(depth_indentation, table.get(5))
+
+        table.get(2)
+
+        self.assertEqual(6, table.depths_amount)
+
+    @classmethod
+    def __create_table(cls, style: LogStyleEnum) -> IndentationTable:
+        return \
+            IndentationTable(
+                style,
+                ConsoleStreamHandler.YAML_SPACES_SEPARATOR,
+                ConsoleStreamHandler.YAML_CHILDREN_SPACES_SEPARATOR)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,399 @@
+import ntpath
+import sys
+import unittest
+from inspect import stack
+
+import yaml
+from parameterized import parameterized
+
+from nrt_logging.log_format import LogElementEnum
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import LogStyleEnum
+from nrt_logging.stack_capture import \
+    CallTreeBackendEnum, FrameNameCache, StackCapture, call_tree_monitor, \
+    frame_name_cache
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase
+
+TEST_FILE_NAME = 'stack_capture_test.py'
+
+
+def capture_in_function(f_locals_depth: int = 0):
+    a = 1
+    return StackCapture.build(0, f_locals_depth), stack(), a
+
+
+# skipcq: PYL-W0613
+def capture_in_nested_function_with_self(self):
+    def nested():
+        return StackCapture.build(0), self
+
+    return nested()
+
+
+class Falsy:
+    def __bool__(self):
+        return False
+
+    def capture(self):
+        return StackCapture.build(0)
+
+
+class StackCaptureTests(TestBase):
+
+    def test_build_same_as_inspect_stack(self):
+        stack_capture, frame_info_list, _ = capture_in_function()
+
+        self.assertEqual(
+            len(frame_info_list), len(stack_capture.frame_name_list))
+
+        for frame_name, frame_info in zip(
+                stack_capture.frame_name_list, frame_info_list):
+            slf = frame_info.frame.f_locals.get('self')
+            path = ntpath.basename(frame_info.filename)
+
+            if slf:
+                path = f'{path}.{slf.__class__.__name__}'
+
+            self.assertEqual(f'{path}.{frame_info.function}', frame_name)
+
+        call_site = stack_capture.call_site
+        self.assertEqual(TEST_FILE_NAME, call_site.path)
+        self.assertEqual('capture_in_function', call_site.method)
+        self.assertEqual(str(frame_info_list[0].lineno), call_site.line_number)
+
+    def test_build_start_depth(self):
+        line_number = str(sys._getframe().f_lineno + 1)
+        stack_capture = StackCapture.build(0)
+        call_site = stack_capture.call_site
+
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}', call_site.path)
+        self.assertEqual('test_build_start_depth', call_site.method)
+        self.assertEqual(line_number, call_site.line_number)
+
+        parent_stack_capture = StackCapture.build(1)
+        self.assertEqual(
+            stack_capture.frame_name_list[1:],
+            parent_stack_capture.frame_name_list)
+
+    def test_build_self_in_closure(self):
+        stack_capture, _ = capture_in_nested_function_with_self(self)
+
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}.nested',
+            stack_capture.frame_name_list[0])
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}'
+            '.capture_in_nested_function_with_self',
+            stack_capture.frame_name_list[1])
+
+    def test_build_falsy_self(self):
+        stack_capture = Falsy().capture()
+
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.capture', stack_capture.frame_name_list[0])
+
+    def test_build_f_locals(self):
+        stack_capture, _, _ = capture_in_function(f_locals_depth=2)
+
+        self.assertEqual(2, len(stack_capture.f_locals_list))
+        self.assertEqual(
+            {'f_locals_depth': 2, 'a': 1}, stack_capture.f_locals_list[0])
+        self.assertIs(self, stack_capture.f_locals_list[1]['self'])
+
+
+class StreamHandlersStackCaptureTests(TestBase):
+
+    def test_log_without_logger(self):
+        sh = StringIOConsoleStreamHandler()
+        sh.style = LogStyleEnum.LINE
+        sh.log_line_template = '$path$.$method$:$line_number$ $message$'
+        line_number = sys._getframe().f_lineno + 1
+        sh.info('abc')
+        sh.warn('def')
+
+        log_list = yaml.safe_load(sh.output)
+        expected_code_location = \
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}' \
+            '.test_log_without_logger'
+
+        self.assertEqual(
+            [{'log': f'{expected_code_location}:{line_number} abc'},
+             {'log': f'{expected_code_location}:{line_number + 1} def'}],
+            log_list)
+
+    def test_stack_capture_shared_by_stream_handlers(self):
+        logger = NrtLogger()
+        sh_1 = StringIOConsoleStreamHandler()
+        sh_2 = StringIOConsoleStreamHandler()
+        sh_3 = StringIOConsoleStreamHandler()
+        sh_3.log_level = LogLevelEnum.ERROR
+        logger.add_stream_handler(sh_1)
+        logger.add_stream_handler(sh_2)
+        logger.add_stream_handler(sh_3)
+
+        line_number = str(sys._getframe().f_lineno + 1)
+        logger.info('abc')
+        logger.error('def')
+
+        self.assertEqual(2, len(sh_1.stack_capture_list))
+        self.assertEqual(2, len(sh_2.stack_capture_list))
+        self.assertEqual(1, len(sh_3.stack_capture_list))
+        self.assertIs(sh_1.stack_capture_list[0], sh_2.stack_capture_list[0])
+        self.assertIs(sh_1.stack_capture_list[1], sh_2.stack_capture_list[1])
+        self.assertIs(sh_1.stack_capture_list[1], sh_3.stack_capture_list[0])
+        self.assertEqual(sh_1.output, sh_2.output)
+
+        call_site = sh_1.stack_capture_list[0].call_site
+        self.assertEqual(
+            'test_stack_capture_shared_by_stream_handlers', call_site.method)
+        self.assertEqual(line_number, call_site.line_number)
+
+    def test_date_captured_only_if_written(self):
+        logger = NrtLogger()
+        sh_1 = StringIOConsoleStreamHandler()
+        sh_1.style = LogStyleEnum.LINE
+        sh_1.log_line_template = '$message$'
+        sh_2 = StringIOConsoleStreamHandler()
+        sh_2.style = LogStyleEnum.LINE
+        sh_2.log_line_template = '$date$ $message$'
+        sh_2.log_level = LogLevelEnum.ERROR
+        logger.add_stream_handler(sh_1)
+        logger.add_stream_handler(sh_2, is_min_sh_logger_level=False)
+
+        logger.info('abc')
+        logger.error('def')
+        sh_1.style = LogStyleEnum.YAML
+        logger.info('ghi')
+        sh_1.log_yaml_elements = [LogElementEnum.MESSAGE]
+        logger.info('jkl')
+
+        self.assertEqual(
+            [False, True, True, False],
+            [stack_capture.date is not None
+             for stack_capture in sh_1.stack_capture_list])
+        self.assertTrue(sh_1.output.endswith('\nmessage: jkl\n'))
+
+
+def get_frame_name_in_function(cache: FrameNameCache) -> str:
+    return cache.get_frame_name(sys._getframe())
+
+
+def get_frame_name_in_nested_function(cache: FrameNameCache) -> str:
+    def nested():
+        return cache.get_frame_name(sys._getframe())
+
+    return nested()
+
+
+class Base:
+    def get_frame_name(self, cache: FrameNameCache) -> str:
+        return cache.get_frame_name(sys._getframe())
+
+
+class Derived(Base):
+    pass
+
+
+class FrameNameCacheTests(TestBase):
+
+    def test_get_frame_name(self):
+        cache = FrameNameCache()
+
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.Base.get_frame_name',
+            Base().get_frame_name(cache))
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.Derived.get_frame_name',
+            Derived().get_frame_name(cache))
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.Derived.get_frame_name',
+            Derived().get_frame_name(cache))
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.size)
+
+    def test_get_frame_name_interned(self):
+        cache = FrameNameCache()
+        frame_name = Base().get_frame_name(cache)
+        cache.clear()
+
+        self.assertIs(frame_name, Base().get_frame_name(cache))
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_eviction(self):
+        cache = FrameNameCache(max_size=1)
+        Base().get_frame_name(cache)
+        Derived().get_frame_name(cache)
+        Base().get_frame_name(cache)
+
+        self.assertEqual(1, cache.size)
+        self.assertEqual(3, cache.misses)
+        self.assertEqual(2, cache.evictions)
+
+        cache.max_size = 2
+        Derived().get_frame_name(cache)
+        Base().get_frame_name(cache)
+
+        self.assertEqual(2, cache.size)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.evictions)
+
+    def test_max_size_not_valid(self):
+        with self.assertRaises(ValueError):
+            FrameNameCache(max_size=0)
+
+    @unittest.skipIf(
+        sys.version_info < (3, 11), 'co_qualname requires Python 3.11')
+    def test_get_frame_name_qualname(self):
+        cache = FrameNameCache()
+        cache.is_qualname = True
+
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.Base.get_frame_name',
+            Derived().get_frame_name(cache))
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.get_frame_name_in_function',
+            get_frame_name_in_function(cache))
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.nested',
+            get_frame_name_in_nested_function(cache))
+
+    def test_stack_capture_uses_frame_name_cache(self):
+        StackCapture.build(0)
+        misses = frame_name_cache.misses
+        stack_capture = StackCapture.build(0)
+
+        self.assertEqual(misses, frame_name_cache.misses)
+        self.assertEqual(
+            f'{TEST_FILE_NAME}.{self.__class__.__name__}'
+            '.test_stack_capture_uses_frame_name_cache',
+            stack_capture.frame_name_list[0])
+
+
+CALL_TREE_BACKENDS = \
+    tuple(CallTreeBackendEnum) if hasattr(sys, 'monitoring') \
+    else (CallTreeBackendEnum.PROFILE,)
+
+
+def capture_in_tracked_function(level: int) -> StackCapture:
+    stack_capture = StackCapture.build(0)
+
+    if level > 0:
+        return call_in_untracked_function(level - 1)
+
+    return stack_capture
+
+
+def call_in_untracked_function(level: int) -> StackCapture:
+    return capture_in_tracked_function(level)
+
+
+def capture_in_generator():
+    yield StackCapture.build(0)
+    yield StackCapture.build(0)
+
+
+def raise_in_tracked_function():
+    StackCapture.build(0)
+    raise ValueError()
+
+
+class CallTreeMonitorTests(TestBase):
+
+    def tearDown(self):
+        if call_tree_monitor.is_running:
+            call_tree_monitor.stop()
+
+    @parameterized.expand([(backend,) for backend in CALL_TREE_BACKENDS])
+    def test_frame_name_list_of_tracked_frames(
+            self, backend: CallTreeBackendEnum):
+
+        call_tree_monitor.start(backend)
+        self.assertEqual(backend, call_tree_monitor.backend)
+
+        capture_in_tracked_function(0)
+        stack_capture = capture_in_tracked_function(2)
+        rebuilds = call_tree_monitor.rebuilds
+
+        self.assertEqual(
+            [f'{TEST_FILE_NAME}.capture_in_tracked_function'] * 3,
+            stack_capture.frame_name_list)
+        self.assertEqual(
+            'capture_in_tracked_function', stack_capture.call_site.method)
+
+        stack_capture = capture_in_tracked_function(1)
+
+        self.assertEqual(2, len(stack_capture.frame_name_list))
+        self.assertEqual(rebuilds, call_tree_monitor.rebuilds)
+        self.assertEqual(1, call_tree_monitor.code_amount)
+
+    @parameterized.expand([(backend,) for backend in CALL_TREE_BACKENDS])
+    def test_generator_and_exception(self, backend: CallTreeBackendEnum):
+        call_tree_monitor.start(backend)
+
+        with self.assertRaises(ValueError):
+            raise_in_tracked_function()
+
+        stack_capture_list = list(capture_in_generator())
+        stack_capture_list.append(capture_in_tracked_function(0))
+        rebuilds = call_tree_monitor.rebuilds
+
+        with self.assertRaises(ValueError):
+            raise_in_tracked_function()
+
+        stack_capture_list.extend(capture_in_generator())
+        stack_capture_list.append(capture_in_tracked_function(0))
+
+        self.assertEqual(rebuilds, call_tree_monitor.rebuilds)
+
+        for stack_capture in stack_capture_list:
+            self.assertEqual(1, len(stack_capture.frame_name_list))
+
+    def test_start_when_running_negative(self):
+        call_tree_monitor.start(CallTreeBackendEnum.PROFILE)
+
+        with self.assertRaises(RuntimeError):
+            call_tree_monitor.start(CallTreeBackendEnum.PROFILE)
+
+    def test_start_profile_when_profile_is_set_negative(self):
+        def profile(frame, event, arg):
+            pass
+
+        sys.setprofile(profile)
+
+        try:
+            with self.assertRaises(RuntimeError):
+                call_tree_monitor.start(CallTreeBackendEnum.PROFILE)
+
+            self.assertFalse(call_tree_monitor.is_running)
+            self.assertIs(profile, sys.getprofile())
+        finally:
+            sys.setprofile(None)
+
+    def test_stop(self):
+        call_tree_monitor.start(CallTreeBackendEnum.PROFILE)
+        capture_in_tracked_function(0)
+        call_tree_monitor.stop()
+
+        stack_capture = capture_in_tracked_function(0)
+
+        self.assertFalse(call_tree_monitor.is_running)
+        self.assertEqual(0, call_tree_monitor.code_amount)
+        self.assertIsNone(sys.getprofile())
+        self.assertLess(1, len(stack_capture.frame_name_list))
+
+    def test_build_backend(self):
+        self.assertEqual(
+            CallTreeBackendEnum.MONITORING,
+            CallTreeBackendEnum.build('monitoring'))
+
+        with self.assertRaises(ValueError):
+            CallTreeBackendEnum.build('trace')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,8 +6,13 @@ from datetime import datetime
 from io import StringIO
 from typing import Optional
 
+from nrt_logging.depth_tracker import DepthPosition
 from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger import NrtLogger
 from nrt_logging.logger_manager import logger_manager
+from nrt_logging.logger_stream_handlers import \
+    ConsoleStreamHandler, LogStyleEnum, ManualDepthEnum
+from nrt_logging.stack_capture import StackCapture
 
 NAME_1 = 'name_1'
 NAME_2 = 'name_2'
@@ -35,6 +40,108 @@ def is_date_in_format(date_str: str, date_format: str):
         return False
 
 
+class StringIOConsoleStreamHandler(ConsoleStreamHandler):
+    """
+    Console stream handler that writes to StringIO,
+    and keeps the arguments of its log calls.
+    """
+
+    msg_list: list[str]
+    manual_depth_list: list[ManualDepthEnum]
+    stack_capture_list: list[Optional[StackCapture]]
+
+    def __init__(
+            self,
+            log_level: Optional[LogLevelEnum] = None,
+            style: LogStyleEnum = LogStyleEnum.LINE):
+        """
+        @param log_level: Log level, None for the log level of the class.
+        @param style: Log style. LINE style writes only the message.
+        """
+
+        super().__init__()
+        self._stream = StringIO()
+        self.style = style
+
+        if style == LogStyleEnum.LINE:
+            self.log_line_template = '$message$'
+
+        if log_level is not None:
+            self.log_level = log_level
+
+        self.msg_list = []
+        self.manual_depth_list = []
+        self.stack_capture_list = []
+
+    def log(
+            self,
+            log_level: LogLevelEnum,
+            msg: str,
+            manual_depth: ManualDepthEnum = ManualDepthEnum.NO_CHANGE,
+            stack_capture: Optional[StackCapture] = None,
+            depth_position: Optional[DepthPosition] = None):
+
+        self.msg_list.append(msg)
+        self.manual_depth_list.append(manual_depth)
+        self.stack_capture_list.append(stack_capture)
+        super().log(
+            log_level, msg, manual_depth, stack_capture, depth_position)
+
+    @property
+    def output(self) -> str:
+        return self._stream.getvalue()
+
+
+def create_logger(
+        logger_log_level: LogLevelEnum = LogLevelEnum.TRACE,
+        *sh_log_levels: LogLevelEnum) \
+        -> tuple[NrtLogger, list[StringIOConsoleStreamHandler]]:
+    """
+    @param logger_log_level: Logger log level.
+    @param sh_log_levels: Log level of each stream handler,
+        one TRACE stream handler if not given.
+    @return: Logger and its stream handlers.
+    """
+
+    logger = NrtLogger()
+    sh_list = [
+        StringIOConsoleStreamHandler(sh_log_level)
+        for sh_log_level in sh_log_levels or [LogLevelEnum.TRACE]
+    ]
+
+    for sh in sh_list:
+        logger.add_stream_handler(sh)
+
+    logger.log_level = logger_log_level
+
+    return logger, sh_list
+
+
+def get_depth_list(sh: StringIOConsoleStreamHandler) -> list[int]:
+    """
+    @return: Depth of each log of LINE style stream handler.
+    """
+
+    return [
+        line.index('- log: ') // len(sh.YAML_CHILDREN_SPACES_SEPARATOR)
+        for line in sh.output.split('\n')
+        if '- log: ' in line
+    ]
+
+
+def get_depth_dict(sh: StringIOConsoleStreamHandler) -> dict[str, int]:
+    """
+    @return: {Message: Depth} of LINE style stream handler.
+    """
+
+    return {
+        line.strip()[len('- log: '):]:
+            line.index('- log: ') // len(sh.YAML_CHILDREN_SPACES_SEPARATOR)
+        for line in sh.output.split('\n')
+        if '- log: ' in line
+    }
+
+
 # skipcq: PTC-W0046
 class TestBase(unittest.TestCase):
     TEMP_PATH = os.path.join(os.getcwd(), 'temp')
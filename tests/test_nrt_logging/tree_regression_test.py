@@ -0,0 +1,153 @@
+import os
+import sys
+import unittest
+from typing import Optional
+
+from parameterized import parameterized
+
+from nrt_logging.log_format import LogElementEnum, LogYamlElements
+from nrt_logging.log_level import LogLevelEnum
+from nrt_logging.logger_manager import logger_manager
+from nrt_logging.logger_stream_handlers import LogStyleEnum
+from nrt_logging.stack_capture import CallTreeBackendEnum, call_tree_monitor
+from tests.test_nrt_logging import tree_scenarios
+from tests.test_nrt_logging.test_base import \
+    StringIOConsoleStreamHandler, TestBase
+
+TREE_NAME = 'tree_regression'
+
+LOG_LINE_TEMPLATE = \
+    f'{LogElementEnum.LOG_LEVEL.line_format}' \
+    f' [{LogElementEnum.PATH.line_format}.' \
+    f'{LogElementEnum.METHOD.line_format}' \
+    f':{LogElementEnum.LINE_NUMBER.line_format}]' \
+    f' {LogElementEnum.MESSAGE.line_format}'
+
+LOG_YAML_ELEMENTS = LogYamlElements(
+    yaml_elements=(
+        LogElementEnum.LOG_LEVEL,
+        LogElementEnum.PATH,
+        LogElementEnum.METHOD,
+        LogElementEnum.LINE_NUMBER,
+        LogElementEnum.MESSAGE
+    ))
+
+SH_LOG_LEVELS = (LogLevelEnum.INFO, LogLevelEnum.TRACE)
+
+CALL_TREE_BACKENDS = \
+    tuple(CallTreeBackendEnum) if hasattr(sys, 'monitoring') \
+    else (CallTreeBackendEnum.PROFILE,)
+
+
+def run_scenario(
+        scenario_name: str,
+        style: LogStyleEnum,
+        is_context_depth: bool = False,
+        call_tree_backend: Optional[CallTreeBackendEnum] = None) \
+        -> list[str]:
+    """
+    Run tree scenario on logger with stream handler per log level.
+
+    @param scenario_name: Scenario name in tree_scenarios.SCENARIOS.
+    @param style: Stream handlers log style.
+    @param is_context_depth: Stream handlers keep depth per context.
+    @param call_tree_backend:
+        Backend of call_tree_monitor.
+        If None then the stack is walked on each log.
+    @return: Output of each stream handler, ordered as SH_LOG_LEVELS.
+    """
+
+    logger_manager.close_logger(TREE_NAME)
+    logger = logger_manager.get_logger(TREE_NAME)
+    logger.update_log_level(LogLevelEnum.TRACE, False)
+    tree_scenarios.SNAPSHOT_LOGGER = logger
+
+    sh_list = []
+
+    for log_level in SH_LOG_LEVELS:
+        sh = StringIOConsoleStreamHandler(log_level, style)
+        sh.is_context_depth = is_context_depth
+        sh.log_line_template = LOG_LINE_TEMPLATE
+        # skipcq: PYL-W0212
+        sh._log_yaml_elements = LOG_YAML_ELEMENTS
+        logger.add_stream_handler(sh, False)
+        sh_list.append(sh)
+
+    if call_tree_backend is not None:
+        call_tree_monitor.start(call_tree_backend)
+
+    try:
+        tree_scenarios.SCENARIOS[scenario_name](logger)
+    finally:
+        if call_tree_backend is not None:
+            call_tree_monitor.stop()
+
+        logger_manager.close_logger(TREE_NAME)
+
+    return [sh.output for sh in sh_list]
+
+
+def get_baseline_file_path(
+        scenario_name: str,
+        style: LogStyleEnum,
+        log_level: LogLevelEnum) -> str:
+
+    return os.path.join(
+        TreeRegressionTests.BASELINE_PATH,
+        f'{scenario_name}_{style.name.lower()}'
+        f'_{log_level.name.lower()}.yaml')
+
+
+class TreeRegressionTests(TestBase):
+    BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'tree_outputs')
+
+    @parameterized.expand([
+        (scenario_name, style, is_context_depth)
+        for scenario_name in tree_scenarios.SCENARIOS
+        for style in LogStyleEnum
+        for is_context_depth in (False, True)
+    ])
+    def test_tree_output_not_changed(
+            self,
+            scenario_name: str,
+            style: LogStyleEnum,
+            is_context_depth: bool):
+
+        output_list = run_scenario(scenario_name, style, is_context_depth)
+        self.__verify_output_list(scenario_name, style, output_list)
+
+    @parameterized.expand([
+        (scenario_name, style, call_tree_backend)
+        for scenario_name in tree_scenarios.SCENARIOS
+        for style in LogStyleEnum
+        for call_tree_backend in CALL_TREE_BACKENDS
+    ])
+    def test_tree_output_with_call_tree_monitor(
+            self,
+            scenario_name: str,
+            style: LogStyleEnum,
+            call_tree_backend: CallTreeBackendEnum):
+
+        output_list = \
+            run_scenario(
+                scenario_name, style, call_tree_backend=call_tree_backend)
+        self.__verify_output_list(scenario_name, style, output_list)
+
+    def __verify_output_list(
+            self,
+            scenario_name: str,
+            style: LogStyleEnum,
+            output_list: list[str]):
+
+        for log_level, output in zip(SH_LOG_LEVELS, output_list):
+            file_path = \
+                get_baseline_file_path(scenario_name, style, log_level)
+
+            with open(file_path) as f:
+                expected_output = f.read()
+
+            self.assertEqual(expected_output, output, file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
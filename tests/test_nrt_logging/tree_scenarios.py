@@ -0,0 +1,238 @@
+from threading import Thread
+
+from nrt_logging.logger import NrtLogger
+from nrt_logging.logger_stream_handlers import ManualDepthEnum
+
+MSG_1 = 'msg 1'
+MSG_2 = 'msg 2'
+MSG_3 = 'msg 3'
+MULTILINE_MSG = 'line 1\nline 2\n  line 3'
+MULTILINE_NEW_LINE_MSG = 'line 1\nline 2\n'
+
+
+class Child:
+    __logger: NrtLogger
+
+    def __init__(self, logger: NrtLogger):
+        self.__logger = logger
+
+    def a(self):
+        self.__logger.info(MSG_1)
+        self.b()
+
+    def b(self):
+        self.__logger.warn(MSG_2)
+
+    def c_manual(self):
+        self.__logger.critical(MSG_1, ManualDepthEnum.INCREASE)
+        self.b()
+        self.__logger.debug(MSG_2, ManualDepthEnum.DECREASE)
+        self.__logger.error(MSG_3, ManualDepthEnum.DECREASE)
+
+    def no_log(self):
+        self.b()
+
+
+class Parent:
+    __child: Child
+    __logger: NrtLogger
+
+    def __init__(self, logger: NrtLogger):
+        self.__logger = logger
+        self.__child = Child(logger)
+
+    def a(self):
+        self.__logger.info(MSG_1)
+        self.__child.a()
+        self.b()
+
+    def b(self):
+        self.__logger.warn(MSG_2)
+        self.__child.b()
+
+    def c_manual(self):
+        self.__logger.critical(MSG_1, ManualDepthEnum.INCREASE)
+        self.b()
+        self.__logger.debug(MSG_2, ManualDepthEnum.INCREASE)
+        self.__logger.error(MSG_2, ManualDepthEnum.INCREASE)
+        self.__logger.info(MSG_3, ManualDepthEnum.DECREASE)
+        self.__logger.info(MSG_3, ManualDepthEnum.DECREASE)
+
+    def d_manual(self):
+        self.__logger.error(MSG_3)
+        self.__child.c_manual()
+        self.__logger.info(MSG_3)
+
+    def e_skip_level(self):
+        self.__logger.info(MSG_1)
+        self.__child.no_log()
+        self.__logger.info(MSG_2)
+
+
+def parent_child(logger: NrtLogger):
+    parent = Parent(logger)
+    parent.a()
+    parent.b()
+    parent.e_skip_level()
+
+
+def manual_depth(logger: NrtLogger):
+    parent = Parent(logger)
+    parent.c_manual()
+    parent.d_manual()
+    parent.b()
+
+
+def increase_and_decrease_depth(logger: NrtLogger):
+    logger.info(MSG_1)
+    logger.increase_depth()
+    logger.error(MSG_2)
+    logger.increase_depth()
+    logger.critical(MSG_1)
+    __increase_and_decrease_depth_child(logger)
+    logger.decrease_depth(2)
+    logger.error(MSG_1)
+    logger.increase_depth()
+    logger.info(MSG_3)
+    logger.decrease_depth()
+    logger.info(MSG_3)
+
+
+def __increase_and_decrease_depth_child(logger: NrtLogger):
+    logger.info(MSG_2)
+    logger.increase_depth()
+    logger.info(MSG_3)
+    logger.decrease_depth()
+    logger.info(MSG_2)
+
+
+def recursion(logger: NrtLogger):
+    __recursion(logger, 4)
+    logger.info(MSG_3)
+
+
+def __recursion(logger: NrtLogger, level: int):
+    logger.info(f'{MSG_1} {level}')
+
+    if level > 0:
+        __recursion(logger, level - 1)
+
+    logger.info(f'{MSG_2} {level}')
+
+
+def loop_manual_depth(logger: NrtLogger):
+    for i in range(3):
+        logger.info(f'{MSG_1} {i}', ManualDepthEnum.INCREASE)
+        logger.increase_depth()
+
+        for j in range(2):
+            logger.info(f'{MSG_2} {j}')
+
+        logger.decrease_depth()
+        logger.info(f'{MSG_3} {i}', ManualDepthEnum.DECREASE)
+
+
+def unbalanced_increase_depth(logger: NrtLogger):
+    for i in range(5):
+        logger.increase_depth()
+        logger.info(f'{MSG_1} {i}')
+
+    Parent(logger).a()
+    logger.info(MSG_2)
+
+
+def go_up_in_stack(logger: NrtLogger):
+    __go_up_1(logger)
+    logger.info(MSG_1)
+    __go_up_1(logger)
+
+
+def __go_up_1(logger: NrtLogger):
+    logger.info(MSG_1)
+    __go_up_2(logger)
+    logger.info(MSG_3)
+
+
+def __go_up_2(logger: NrtLogger):
+    logger.info(MSG_2)
+    __go_up_3(logger)
+    logger.info(MSG_2)
+
+
+def __go_up_3(logger: NrtLogger):
+    logger.info(MSG_3, ManualDepthEnum.INCREASE)
+    logger.info(MSG_3)
+
+
+def multiline(logger: NrtLogger):
+    logger.info(MULTILINE_MSG)
+    __multiline_child(logger)
+    logger.info(MULTILINE_NEW_LINE_MSG)
+
+
+def __multiline_child(logger: NrtLogger):
+    logger.warn(MULTILINE_NEW_LINE_MSG)
+    logger.info(MULTILINE_MSG, ManualDepthEnum.INCREASE)
+    logger.info(MSG_1)
+
+
+def mixed_log_levels(logger: NrtLogger):
+    logger.info(MSG_1)
+    __mixed_log_levels_child(logger)
+    logger.trace(MSG_1)
+    logger.info(MSG_2)
+
+
+def __mixed_log_levels_child(logger: NrtLogger):
+    logger.debug(MSG_2)
+    __mixed_log_levels_grandchild(logger)
+    logger.debug(MSG_3, ManualDepthEnum.INCREASE)
+    logger.info(MSG_3)
+
+
+def __mixed_log_levels_grandchild(logger: NrtLogger):
+    logger.info(MSG_3)
+
+
+def thread(logger: NrtLogger):
+    logger.info(MSG_1)
+    logger.increase_depth()
+    t = Thread(target=__thread_target, args=(logger,))
+    t.start()
+    t.join()
+    logger.info(MSG_2)
+
+
+def __thread_target(logger: NrtLogger):
+    logger.info(MSG_3)
+    logger.increase_depth()
+    __go_up_2(logger)
+
+
+def snapshot(logger: NrtLogger):
+    __snapshot_child(7)
+    logger.info(MSG_1)
+
+
+def __snapshot_child(i: int):
+    j = i + 1
+    SNAPSHOT_LOGGER.info(MSG_2)
+    SNAPSHOT_LOGGER.snapshot(manual_depth=ManualDepthEnum.INCREASE)
+    SNAPSHOT_LOGGER.info(f'{MSG_3} {j}')
+
+
+SNAPSHOT_LOGGER = NrtLogger()
+
+SCENARIOS = {
+    'parent_child': parent_child,
+    'manual_depth': manual_depth,
+    'increase_and_decrease_depth': increase_and_decrease_depth,
+    'recursion': recursion,
+    'loop_manual_depth': loop_manual_depth,
+    'unbalanced_increase_depth': unbalanced_increase_depth,
+    'go_up_in_stack': go_up_in_stack,
+    'multiline': multiline,
+    'mixed_log_levels': mixed_log_levels,
+    'thread': thread,
+    'snapshot': snapshot,
+}